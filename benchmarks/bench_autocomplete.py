@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark top-k autocomplete latency on a 100K-name corpus.
+
+The corpus is the repository's names plus synthetic names built from
+their words and random syllables, spread over the five categories with
+random popularity. Queries are random prefixes (1 to 6 characters) of
+corpus names. Reports build time and per-query latency percentiles, and
+compares with a linear startswith scan.
+
+Run from the repository root:
+    python benchmarks/bench_autocomplete.py
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from troika.autocomplete import Autocomplete, reference_counts  # noqa: E402
+from troika.data import load_category  # noqa: E402
+from troika.search import SEARCH_CATEGORIES, normalize_name  # noqa: E402
+
+CORPUS_SIZE = 100_000
+SYLLABLES = "ka ro mi zan tel ur ob vis qua nel dor fen gri lum sha pey".split()
+
+
+def make_corpus(rng: random.Random):
+    """Return (category, stem, name, popularity) rows."""
+    counts = reference_counts(Path("objects"))
+    rows = [
+        (
+            category,
+            stem,
+            entity["name"],
+            counts[(category, normalize_name(entity["name"]))],
+        )
+        for category in SEARCH_CATEGORIES
+        for stem, entity in sorted(load_category(Path("objects"), category).items())
+    ]
+    words = sorted({w for _, _, name, _ in rows for w in name.split() if w.isalpha()})
+    while len(rows) < CORPUS_SIZE:
+        name = " ".join(
+            (
+                rng.choice(words)
+                if rng.random() < 0.5
+                else "".join(rng.choices(SYLLABLES, k=rng.randint(1, 3))).title()
+            )
+            for _ in range(rng.randint(1, 3))
+        )
+        category = rng.choice(SEARCH_CATEGORIES)
+        rows.append((category, f"synthetic-{len(rows)}", name, rng.randint(0, 50)))
+    return rows
+
+
+def percentile(values, fraction):
+    """Return a percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    """Run the benchmark."""
+    rng = random.Random(42)
+    rows = make_corpus(rng)
+    completer = Autocomplete()
+    for category, stem, name, popularity in rows:
+        completer.add(category, stem, name, popularity=popularity)
+    start = time.perf_counter()
+    completer.complete("")
+    build = time.perf_counter() - start
+
+    prefixes = []
+    for _ in range(2000):
+        name = normalize_name(rng.choice(rows)[2]) or "a"
+        prefixes.append(name[: rng.randint(1, min(6, len(name)))])
+
+    latencies = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        completer.complete(prefix, limit=10)
+        latencies.append(time.perf_counter() - start)
+
+    keys = [(normalize_name(name), -popularity) for _, _, name, popularity in rows]
+    start = time.perf_counter()
+    for prefix in prefixes[:50]:
+        sorted(k for k in keys if k[0].startswith(prefix))[:10]
+    linear = (time.perf_counter() - start) / 50
+
+    print("Autocomplete Benchmark")
+    print("=" * 50)
+    print(f"{len(rows):,} names, index built in {build * 1000:.0f} ms")
+    print(
+        f"top-10 latency: mean {statistics.mean(latencies) * 1e6:.1f} us, "
+        f"p50 {percentile(latencies, 0.5) * 1e6:.1f} us, "
+        f"p99 {percentile(latencies, 0.99) * 1e6:.1f} us"
+    )
+    print(f"linear scan:    mean {linear * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
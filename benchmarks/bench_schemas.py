@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-document validation with source vs flattened schemas.
+
+Both validators are compiled once; the timed loop only runs iter_errors over
+the objects of each category, so the difference is the cost of resolving
+internal $refs while validating. Schema load time is reported separately for
+a cold (flatten and write cache) and warm (read cache) start.
+
+Run from the repository root:
+    python benchmarks/bench_schemas.py
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from jsonschema import Draft7Validator  # noqa: E402
+
+from main import TroikaValidator  # noqa: E402
+from troika import schemas  # noqa: E402
+
+CATEGORIES = {
+    "characters": "troika-character",
+    "items": "troika-item",
+    "enemies": "troika-enemy",
+    "spells": "troika-spell",
+}
+
+
+def per_document(validator: Draft7Validator, documents, rounds: int) -> float:
+    """Return the best time per document in microseconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for document in documents:
+            for _ in validator.iter_errors(document):
+                pass
+        best = min(best, time.perf_counter() - start)
+    return best / len(documents) * 1e6
+
+
+def main():
+    """Run the benchmark."""
+    rounds = 20
+    with tempfile.TemporaryDirectory() as cache_dir:
+        schemas._memory_cache.clear()
+        start = time.perf_counter()
+        TroikaValidator(quiet=True, cache_dir=Path(cache_dir))
+        cold = time.perf_counter() - start
+        schemas._memory_cache.clear()
+        start = time.perf_counter()
+        validator = TroikaValidator(quiet=True, cache_dir=Path(cache_dir))
+        warm = time.perf_counter() - start
+
+    print("Flattened Schema Benchmark")
+    print("=" * 50)
+    print(f"schema load: cold {cold * 1000:.1f} ms, cached {warm * 1000:.1f} ms")
+    print(f"{'category':<12}{'docs':>6}{'source':>12}{'flattened':>12}{'speedup':>9}")
+    for category, schema_id in CATEGORIES.items():
+        documents = [
+            json.loads(path.read_text(encoding="utf-8"))
+            for path in sorted(Path("objects", category).glob("*.json"))
+        ]
+        if not documents:
+            continue
+        source = per_document(
+            Draft7Validator(validator.schemas[schema_id]), documents, rounds
+        )
+        flat = per_document(
+            Draft7Validator(validator.flat_schemas[schema_id]), documents, rounds
+        )
+        print(
+            f"{category:<12}{len(documents):>6}{source:>10.1f}us"
+            f"{flat:>10.1f}us{source / flat:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
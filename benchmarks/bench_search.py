@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark fuzzy name lookups: trigram index vs a linear difflib scan.
+
+Queries are the indexed names with typical damage applied (a dropped
+letter, lowercase, ASCII dashes). Reports the mean time per query and how
+often the intended entity is ranked first.
+
+Run from the repository root:
+    python benchmarks/bench_search.py
+"""
+
+import difflib
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from troika.search import build_index, normalize_name  # noqa: E402
+
+
+def damage(name: str) -> str:
+    """Misspell a name the way users do."""
+    typed = name.lower().replace("–", "-").replace("—", "-")
+    middle = len(typed) // 2
+    return typed[:middle] + typed[middle + 1 :] if len(typed) > 4 else typed
+
+
+def main():
+    """Run the benchmark."""
+    start = time.perf_counter()
+    index = build_index(Path("objects"))
+    build = time.perf_counter() - start
+    queries = [(damage(name), stem) for _, stem, name in index.entries]
+    normalized = [normalize_name(name) for _, _, name in index.entries]
+
+    start = time.perf_counter()
+    hits = sum(index.search(query, limit=5)[0].stem == stem for query, stem in queries)
+    indexed = (time.perf_counter() - start) / len(queries)
+
+    start = time.perf_counter()
+    linear_hits = 0
+    for query, stem in queries:
+        folded = normalize_name(query)
+        best = max(
+            range(len(normalized)),
+            key=lambda i: difflib.SequenceMatcher(None, folded, normalized[i]).ratio(),
+        )
+        linear_hits += index.entries[best][1] == stem
+    linear = (time.perf_counter() - start) / len(queries)
+
+    print("Fuzzy Name Search Benchmark")
+    print("=" * 50)
+    print(f"{len(index)} names indexed in {build * 1000:.1f} ms")
+    print(f"trigram index: {indexed * 1e6:8.1f} us/query, top-1 {hits}/{len(queries)}")
+    print(
+        f"difflib scan:  {linear * 1e6:8.1f} us/query, top-1 {linear_hits}/{len(queries)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
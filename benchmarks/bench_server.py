@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark the asyncio data API against the naive static layout.
+
+The static baseline serves the repository with http.server, the way the
+published site exposes objects/, and a client fetches every entity file. The
+data API serves the same files from memory with keep-alive, and can also hand
+over the whole dataset in one gzip-compressed request.
+
+Run from the repository root:
+    python benchmarks/bench_server.py
+"""
+
+import asyncio
+import functools
+import http.client
+import http.server
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from troika.data import iter_entity_files  # noqa: E402
+from troika.server import DataServer, build_routes  # noqa: E402
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler without request logging."""
+
+    def log_message(self, format, *args):
+        """Suppress per-request logging."""
+
+
+def start_static_server() -> int:
+    """Serve the repository root with http.server and return the port."""
+    handler = functools.partial(QuietHandler, directory=".")
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+
+def start_api_server() -> int:
+    """Run the data API on a background event loop and return the port."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    port = []
+
+    async def run():
+        server = await DataServer(build_routes()).start("127.0.0.1", 0)
+        port.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        await server.serve_forever()
+
+    threading.Thread(target=loop.run_until_complete, args=(run(),), daemon=True).start()
+    ready.wait()
+    return port[0]
+
+
+def fetch_all(port: int, paths, keep_alive: bool, headers=None) -> float:
+    """Fetch every path once and return requests per second."""
+    headers = headers or {}
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    for path in paths:
+        if not keep_alive:
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        if response.status not in (200, 304):
+            raise RuntimeError(f"{path}: HTTP {response.status}")
+    return len(paths) / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark."""
+    paths = [
+        f"/objects/{category}/{path.name}"
+        for category, path in iter_entity_files(Path("objects"))
+    ]
+    static_port = start_static_server()
+    api_port = start_api_server()
+    rounds = 5
+
+    print("Data API Benchmark")
+    print("=" * 50)
+    print(f"{len(paths)} entity files, {rounds} rounds")
+
+    static = max(fetch_all(static_port, paths, keep_alive=False) for _ in range(rounds))
+    api = max(fetch_all(api_port, paths, keep_alive=True) for _ in range(rounds))
+    print(f"static http.server, per file:    {static:10.0f} req/s")
+    print(f"data API, per file (keep-alive): {api:10.0f} req/s")
+
+    bundle = max(
+        fetch_all(api_port, ["/api/all"] * 50, True, {"Accept-Encoding": "gzip"})
+        for _ in range(rounds)
+    )
+    print(f"data API, whole dataset gzip:    {bundle:10.0f} req/s")
+    print(
+        f"  full dataset loads/s: static {static / len(paths):.1f} vs API {bundle:.0f}"
+    )
+
+    etag_connection = http.client.HTTPConnection("127.0.0.1", api_port)
+    etag_connection.request("GET", "/api/all")
+    response = etag_connection.getresponse()
+    response.read()
+    etag = response.getheader("ETag")
+    conditional = max(
+        fetch_all(api_port, ["/api/all"] * 200, True, {"If-None-Match": etag})
+        for _ in range(rounds)
+    )
+    print(f"data API, conditional (304):     {conditional:10.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
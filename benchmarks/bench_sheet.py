@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark single-edit latency of the incremental character sheet.
+
+Builds a large character (many skills and inventory entries), then compares
+recomputing every derived value from scratch against one incremental edit
+followed by a read of the affected value.
+
+Run from the repository root:
+    python benchmarks/bench_sheet.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from troika.data import load_category  # noqa: E402
+from troika.sheet import CharacterSheet, derive  # noqa: E402
+
+
+def build_character(skills: int, items: int) -> dict:
+    """Build a synthetic character with the given number of skills and items."""
+    names = ["Sword", "Lantern", "Rope", "Modest Armour", "Shield", "Provisions"]
+    return {
+        "name": "Benchmark",
+        "background": "Burglar",
+        "attributes": {
+            "skill": 5,
+            "stamina": {"current": 18, "maximum": 20},
+            "luck": {"current": 9, "maximum": 10},
+        },
+        "advancedSkills": [
+            {"name": f"Skill {i}", "rank": 1 + i % 6, "total": 6, "type": "skill"}
+            for i in range(skills)
+        ],
+        "inventory": [
+            {
+                "name": names[i % len(names)],
+                "position": 1 + i % 18,
+                "slots": 1 + i % 2,
+                "readyForUse": i % 7 == 0,
+            }
+            for i in range(items)
+        ],
+        "conditions": [],
+    }
+
+
+def time_per_call(func, repeat: int) -> float:
+    """Average wall time of func() in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    """Run the benchmark."""
+    catalog = load_category(Path("objects"), "items")
+    print("Character Sheet Benchmark")
+    print("=" * 50)
+    for skills, items in [(100, 100), (1_000, 1_000), (10_000, 10_000)]:
+        character = build_character(skills, items)
+        sheet = CharacterSheet(character, catalog)
+        sheet.derived()
+
+        full = time_per_call(lambda: derive(character, catalog), 20)
+
+        def add_and_read():
+            handle = sheet.add_item({"name": "Heavy Armour", "position": 1, "slots": 6})
+            sheet.get("armour")
+            sheet.get("slots")
+            sheet.remove_item(handle)
+
+        def rank_and_read():
+            sheet.set_skill("Skill 0", 3)
+            sheet.skill_total("Skill 0")
+            sheet.set_skill("Skill 0", 1)
+
+        edit = time_per_call(add_and_read, 2_000)
+        rank = time_per_call(rank_and_read, 2_000)
+        print(f"{skills} skills / {items} items:")
+        print(f"  full recompute:          {full:10.1f} us")
+        print(f"  add+remove item, read:   {edit:10.1f} us")
+        print(f"  change rank, read total: {rank:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
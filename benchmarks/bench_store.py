@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark multi-threaded lookups through troika.store.DataStore.
+
+Each thread performs the same mix of lookups by stem and by name against a
+preloaded store, with no locks on the read path. On a GIL build throughput
+stays roughly flat as threads are added. On a free-threaded build
+(python3.13t or later, run with PYTHON_GIL=0) it should grow with the
+number of cores.
+
+Run from the repository root:
+    python benchmarks/bench_store.py
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from troika.store import DataStore  # noqa: E402
+
+
+def worker(store: DataStore, queries, rounds: int, barrier: threading.Barrier):
+    """Run the lookup mix `rounds` times."""
+    barrier.wait()
+    for _ in range(rounds):
+        for category, stem, name in queries:
+            entity = store.get(category, stem)
+            store.find(category, name)
+            entity.get("name")
+
+
+def run(store: DataStore, queries, threads: int, rounds: int) -> float:
+    """Return lookups per second with a given number of threads."""
+    barrier = threading.Barrier(threads + 1)
+    pool = [
+        threading.Thread(target=worker, args=(store, queries, rounds, barrier))
+        for _ in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return threads * rounds * len(queries) * 2 / elapsed
+
+
+def main():
+    """Run the benchmark."""
+    store = DataStore(Path("objects")).preload()
+    queries = [
+        (category, stem, entity["name"])
+        for category in ("enemies", "items", "spells", "skills", "backgrounds")
+        for stem, entity in store.category(category).entities.items()
+        if isinstance(entity.get("name"), str)
+    ]
+    rounds = 200
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+    print("Thread-Safe Store Benchmark")
+    print("=" * 50)
+    print(
+        f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, "
+        f"{os.cpu_count()} CPUs"
+    )
+    print(f"{len(queries)} entities, {rounds} rounds per thread")
+    baseline = None
+    for threads in (1, 2, 4, 8):
+        rate = run(store, queries, threads, rounds)
+        baseline = baseline or rate
+        print(
+            f"{threads:>2} threads: {rate:12,.0f} lookups/s  ({rate / baseline:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
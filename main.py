@@ -3,14 +3,29 @@
 Troika System JSON Schema Validator
 
 This script validates JSON objects against their corresponding schemas in the systems directory.
-It supports validating individual files or entire directories.
+It supports validating individual files or entire directories, as well as
+streams of NDJSON (or concatenated JSON) records read from a file or stdin.
+Large aggregate files can be validated incrementally with --stream, and data
+packs can be validated straight from .zip/.tar.gz/.tar.zst archives.
+
+Directory and archive runs can be split across machines with --shard i/N and
+--report, and the partial reports combined with `main.py merge`.
+
+--daemon keeps the schemas loaded and revalidates files as they change; query
+it with `python -m troika.daemon check FILE`.
+
+--coverage FILE profiles which parts of the schemas a run exercises (see
+troika/coverage.py).
 """
 
 import argparse
+import hashlib
 import json
 import sys
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
 
 from jsonschema import Draft7Validator
 from rich.console import Console
@@ -18,15 +33,52 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from troika.archive import is_archive, iter_json_members
+from troika.coverage import SchemaCoverage
+from troika.daemon import DEFAULT_SOCKET, serve
+from troika.jsonstream import (
+    ARRAY,
+    ELEMENT,
+    MalformedRecord,
+    bounded_map,
+    iter_concatenated,
+    iter_lines,
+    iter_members,
+)
+from troika.schemas import DEFAULT_CACHE_DIR, load_flattened
+
 
 class TroikaValidator:
     """JSON Schema validator for Troika system objects."""
 
-    def __init__(self, schema_dir: Optional[Path] = None):
-        """Initialize validator with schema directory."""
+    def __init__(
+        self,
+        schema_dir: Optional[Path] = None,
+        quiet: bool = False,
+        cache_dir: Optional[Path] = None,
+        coverage: Optional[SchemaCoverage] = None,
+    ):
+        """
+        Initialize validator with schema directory.
+
+        Args:
+            schema_dir: Directory of *.schema.json files (default: systems)
+            quiet: Suppress console output
+            cache_dir: Disk cache for flattened schemas (the command line uses
+                DEFAULT_CACHE_DIR), or None to keep them in memory only
+            coverage: Profile that records which schema keywords run; the
+                source schemas are used instead of the flattened ones
+        """
         self.schema_dir = schema_dir or Path("systems")
+        self.cache_dir = cache_dir
+        self.coverage = coverage
         self.schemas: Dict[str, Any] = {}
-        self.console = Console()
+        # Schemas with internal $refs inlined, used to build the validators
+        self.flat_schemas: Dict[str, Any] = {}
+        self.console = Console(quiet=quiet)
+        # Compiled validators per schema ID, built on first use
+        self._validators: Dict[str, Draft7Validator] = {}
+        self._fallback_validators: Dict[str, Draft7Validator] = {}
         self.load_schemas()
 
     def load_schemas(self) -> None:
@@ -40,13 +92,13 @@ class TroikaValidator:
 
         for schema_file in schema_files:
             try:
-                with open(schema_file, "r", encoding="utf-8") as f:
-                    schema_data = json.load(f)
-                    schema_id = schema_data.get(
-                        "$id", schema_file.stem.replace(".schema", "")
-                    )
-                    self.schemas[schema_id] = schema_data
-                    self.console.print(f"✓ Loaded schema: {schema_id}", style="green")
+                schema_data, flat_schema = load_flattened(schema_file, self.cache_dir)
+                schema_id = schema_data.get(
+                    "$id", schema_file.stem.replace(".schema", "")
+                )
+                self.schemas[schema_id] = schema_data
+                self.flat_schemas[schema_id] = flat_schema
+                self.console.print(f"✓ Loaded schema: {schema_id}", style="green")
             except Exception as e:
                 self.console.print(
                     f"✗ Failed to load schema {schema_file}: {e}", style="red"
@@ -104,24 +156,10 @@ class TroikaValidator:
                 return result
 
             result["schema_used"] = schema_id
-            schema = self.schemas[schema_id]
-
-            # Create validator and validate
-            try:
-                validator = Draft7Validator(schema)
-                errors = list(validator.iter_errors(obj_data))
-            except Exception:
-                # If there's an issue with unresolvable references,
-                # we'll create a temporary schema without references
-                temp_schema = self._create_temp_schema_without_refs(schema)
-                validator = Draft7Validator(temp_schema)
-                errors = list(validator.iter_errors(obj_data))
+            errors = self.validate_data(obj_data, schema_id)
 
             if errors:
-                result["errors"] = [
-                    f"{error.message} at {'.'.join(str(p) for p in error.path)}"
-                    for error in errors
-                ]
+                result["errors"] = errors
             else:
                 result["valid"] = True
 
@@ -132,10 +170,241 @@ class TroikaValidator:
 
         return result
 
+    def validate_data(
+        self, data: Any, schema_id: str, prefix: Tuple[Any, ...] = ()
+    ) -> List[str]:
+        """Validate loaded data against a schema and return error messages."""
+        if self.coverage is not None:
+            return self._check(data, schema_id, self.schemas[schema_id], prefix)
+        return self._check(
+            data,
+            schema_id,
+            self.flat_schemas[schema_id],
+            prefix,
+            fallback=self.schemas[schema_id],
+        )
+
+    def _check(
+        self,
+        data: Any,
+        key: str,
+        schema: Dict[str, Any],
+        prefix: Tuple[Any, ...] = (),
+        fallback: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """
+        Validate data with the cached validator for a schema key.
+
+        `fallback` is the source schema the reference-free fallback is built
+        from when `schema` is a flattened copy of it.
+        """
+        validator = self._validators.get(key)
+        if validator is None:
+            if self.coverage is not None:
+                validator = self.coverage.validator(key, schema)
+            else:
+                validator = Draft7Validator(schema)
+            self._validators[key] = validator
+
+        try:
+            if self.coverage is not None:
+                self.coverage.begin()
+            errors = list(validator.iter_errors(data))
+            if self.coverage is not None:
+                self.coverage.commit()
+        except Exception:
+            # If there's an issue with unresolvable references,
+            # we'll use a temporary schema without references
+            if self.coverage is not None:
+                self.coverage.discard()
+            validator = self._fallback_validators.get(key)
+            if validator is None:
+                temp_schema = self._create_temp_schema_without_refs(
+                    schema if fallback is None else fallback
+                )
+                if self.coverage is not None:
+                    validator = self.coverage.validator(key, temp_schema)
+                else:
+                    validator = Draft7Validator(temp_schema)
+                self._fallback_validators[key] = validator
+            errors = list(validator.iter_errors(data))
+
+        return [
+            f"{error.message} at {'.'.join(str(p) for p in prefix + tuple(error.path))}"
+            for error in errors
+        ]
+
+    def _check_element(
+        self, element: Any, key: str, index: int, schema_id: str
+    ) -> List[str]:
+        """Validate one element of a top-level array of an aggregate file."""
+        array = self.schemas[schema_id].get("properties", {}).get(key, {})
+        items = array.get("items", True)
+        location = f"{schema_id}#/{key}/items"
+        if isinstance(items, list):
+            # Positional item schemas, then additionalItems past the end
+            if index < len(items):
+                items, location = items[index], f"{location}/{index}"
+            else:
+                items = array.get("additionalItems", True)
+                location = f"{schema_id}#/{key}/additionalItems"
+        prefix = (key, index)
+        if not isinstance(items, dict):
+            return self._check(element, location, items, prefix)
+
+        # Elements such as {"$ref": "./spells/affix.json"} are not followed,
+        # as in validate_data: the remote reference cannot be resolved and
+        # the element is checked against the reference-free fallback
+        ref = items.get("$ref")
+        if (
+            set(items) == {"$ref"}
+            and ref in self.schemas
+            and not _is_reference(element)
+        ):
+            return self.validate_data(element, ref, prefix)
+        # Inline item schemas may point into the root schema's definitions
+        sub_schema = dict(items)
+        sub_schema.setdefault(
+            "definitions", self.schemas[schema_id].get("definitions", {})
+        )
+        return self._check(element, location, sub_schema, prefix)
+
+    def validate_object_streaming(
+        self, obj_path: Path, schema_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate a large aggregate file without loading it whole.
+
+        Top-level array members (backgrounds, enemies, characters, ...) are
+        parsed one element at a time and each element is validated against
+        the array's item schema; {"$ref": "./file.json"} elements are not
+        followed, as in validate_data. The remaining members are validated
+        against the root schema with those arrays left empty, so array-level
+        keywords such as minItems are not checked. Peak memory is bounded by
+        the largest single member or element.
+        """
+        result: Dict[str, Any] = {
+            "file": str(obj_path),
+            "valid": False,
+            "errors": [],
+            "schema_used": None,
+            "elements": 0,
+        }
+
+        if not schema_id:
+            schema_id = self.get_schema_for_object(obj_path)
+        if not schema_id or schema_id not in self.schemas:
+            result["errors"].append(f"Schema '{schema_id}' not found")
+            return result
+        result["schema_used"] = schema_id
+
+        skeleton: Dict[str, Any] = {}
+        index = 0
+        try:
+            with open(obj_path, "r", encoding="utf-8") as f:
+                for kind, key, value in iter_members(f):
+                    if kind == ARRAY:
+                        skeleton[key] = []
+                        index = 0
+                    elif kind == ELEMENT:
+                        result["errors"].extend(
+                            self._check_element(value, key, index, schema_id)
+                        )
+                        result["elements"] += 1
+                        index += 1
+                    else:
+                        skeleton[key] = value
+            result["errors"][:0] = self.validate_data(skeleton, schema_id)
+            result["valid"] = not result["errors"]
+        except json.JSONDecodeError as e:
+            result["errors"].append(f"Invalid JSON: {e}")
+        except Exception as e:
+            result["errors"].append(f"Validation error: {e}")
+
+        return result
+
+    def validate_stream(
+        self,
+        stream: TextIO,
+        schema_id: str = "troika-character",
+        workers: int = 1,
+        concatenated: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Validate a stream of JSON records, yielding one result per record.
+
+        Args:
+            stream: Text stream of NDJSON, or of concatenated JSON documents
+            schema_id: Schema every record is validated against
+            workers: Worker processes for parsing and validation
+            concatenated: Read concatenated documents instead of lines
+
+        Yields:
+            Dicts with "record" (the line number for NDJSON), "valid" and "errors"
+        """
+        if schema_id not in self.schemas:
+            raise ValueError(f"Schema '{schema_id}' not found")
+
+        if concatenated:
+            # A malformed document is reported as one invalid record
+            records = iter_concatenated(stream, skip_malformed=True)
+            record_func = _validate_stream_value
+        else:
+            records = iter_lines(stream)
+            record_func = _validate_stream_line
+        func, initializer, initargs = _record_mapper(
+            self, workers, record_func, schema_id
+        )
+        return bounded_map(
+            func, records, workers, initializer=initializer, initargs=initargs
+        )
+
+    def validate_archive(
+        self,
+        archive_path: Path,
+        schema_id: Optional[str] = None,
+        workers: int = 1,
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate every JSON member of an archive without extracting it.
+
+        Members are mapped to schemas by their path inside the archive, the
+        same way as files on disk (see get_schema_for_object), and parsed and
+        validated from memory, in worker processes when workers > 1.
+        Results are reported as "<archive>!<member>". With a shard, only the
+        members assigned to it are parsed.
+        """
+        tasks = (
+            (
+                str(archive_path),
+                name,
+                data,
+                schema_id or self.get_schema_for_object(Path(name)),
+            )
+            for name, data in iter_json_members(archive_path)
+            if in_shard(name, shard)
+        )
+        func, initializer, initargs = _record_mapper(
+            self, workers, _validate_archive_member
+        )
+        return list(
+            bounded_map(
+                func,
+                tasks,
+                workers,
+                initializer=initializer,
+                initargs=initargs,
+            )
+        )
+
     def validate_directory(
-        self, directory: Path, recursive: bool = True
+        self,
+        directory: Path,
+        recursive: bool = True,
+        shard: Optional[Tuple[int, int]] = None,
     ) -> List[Dict[str, Any]]:
-        """Validate all JSON files in a directory."""
+        """Validate all JSON files in a directory (or one shard of them)."""
         results = []
 
         if not directory.exists():
@@ -144,7 +413,7 @@ class TroikaValidator:
 
         # Find all JSON files
         pattern = "**/*.json" if recursive else "*.json"
-        json_files = list(directory.glob(pattern))
+        json_files = sorted(directory.glob(pattern), key=lambda p: p.as_posix())
 
         if not json_files:
             self.console.print(f"No JSON files found in {directory}", style="yellow")
@@ -152,7 +421,11 @@ class TroikaValidator:
 
         # Validate each file
         for json_file in json_files:
+            key = json_file.relative_to(directory).as_posix()
+            if not in_shard(key, shard):
+                continue
             result = self.validate_object(json_file)
+            result["key"] = key
             results.append(result)
 
         return results
@@ -261,8 +534,245 @@ class TroikaValidator:
         return remove_refs(temp_schema)
 
 
+# Validator of a worker process, set once by _init_stream_worker
+_worker_validator: Optional[TroikaValidator] = None
+
+
+def _init_stream_worker(schema_dir: str, cache_dir: Optional[str]) -> None:
+    """Load the schemas once in a worker process."""
+    global _worker_validator
+    _worker_validator = TroikaValidator(
+        Path(schema_dir), quiet=True, cache_dir=Path(cache_dir) if cache_dir else None
+    )
+
+
+def _in_worker(func: Callable[..., Any], *args: Any) -> Any:
+    """Call func with this worker process's validator followed by args."""
+    return func(_worker_validator, *args)
+
+
+def _record_mapper(
+    validator: TroikaValidator, workers: int, func: Callable[..., Any], *args: Any
+) -> Tuple[Callable[[Any], Any], Optional[Callable[..., None]], Tuple[Any, ...]]:
+    """
+    Return (func, initializer, initargs) for bounded_map.
+
+    In this process the validator is bound directly; worker processes load
+    their own and keep it in a module global.
+    """
+    if workers > 1:
+        return (
+            partial(_in_worker, func, *args),
+            _init_stream_worker,
+            (
+                str(validator.schema_dir),
+                str(validator.cache_dir) if validator.cache_dir else None,
+            ),
+        )
+    return partial(func, validator, *args), None, ()
+
+
+def _is_reference(element: Any) -> bool:
+    """Return whether an aggregate element is a {"$ref": ...} placeholder."""
+    return isinstance(element, dict) and set(element) == {"$ref"}
+
+
+def _validate_stream_value(
+    validator: TroikaValidator, schema_id: str, record: Tuple[int, Any]
+) -> Dict[str, Any]:
+    """Validate one parsed stream record."""
+    index, data = record
+    if isinstance(data, MalformedRecord):
+        return {
+            "record": index,
+            "valid": False,
+            "errors": [f"Invalid JSON: {data.message}"],
+        }
+    errors = validator.validate_data(data, schema_id)
+    return {"record": index, "valid": not errors, "errors": errors}
+
+
+def _validate_stream_line(
+    validator: TroikaValidator, schema_id: str, record: Tuple[int, str]
+) -> Dict[str, Any]:
+    """Parse and validate one NDJSON line."""
+    line_no, text = record
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        return {"record": line_no, "valid": False, "errors": [f"Invalid JSON: {e}"]}
+    return _validate_stream_value(validator, schema_id, (line_no, data))
+
+
+def _validate_archive_member(
+    validator: TroikaValidator, task: Tuple[str, str, bytes, str]
+) -> Dict[str, Any]:
+    """Parse and validate one archive member."""
+    archive, name, data, schema_id = task
+    result: Dict[str, Any] = {
+        "file": f"{archive}!{name}",
+        "valid": False,
+        "errors": [],
+        "schema_used": None,
+        "key": name,
+    }
+    if schema_id not in validator.schemas:
+        result["errors"].append(f"Schema '{schema_id}' not found")
+        return result
+
+    result["schema_used"] = schema_id
+    try:
+        errors = validator.validate_data(json.loads(data), schema_id)
+        result["errors"] = errors
+        result["valid"] = not errors
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        result["errors"].append(f"Invalid JSON: {e}")
+    except Exception as e:
+        result["errors"].append(f"Validation error: {e}")
+    return result
+
+
+REPORT_FORMAT = 1
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse an "i/N" shard spec (1-based) into (i, N)."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected i/N") from None
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}', expected 1 <= i <= N")
+    return index, count
+
+
+def in_shard(key: str, shard: Optional[Tuple[int, int]]) -> bool:
+    """
+    Check whether an input belongs to a shard.
+
+    Keys are paths relative to the validated directory (or member names in
+    an archive), hashed with SHA-256 so every machine agrees on the split.
+    """
+    if shard is None:
+        return True
+    index, count = shard
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count == index - 1
+
+
+def build_report(
+    results: List[Dict[str, Any]], target: str, shard: Tuple[int, int]
+) -> Dict[str, Any]:
+    """Build a (partial) validation report, with results sorted by key."""
+    return {
+        "format": REPORT_FORMAT,
+        "target": target,
+        "shard": {"index": shard[0], "count": shard[1]},
+        "results": sorted(results, key=lambda r: r["key"]),
+    }
+
+
+def write_report(path: Path, report: Dict[str, Any]) -> None:
+    """Write a report as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def merge_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the partial reports of every shard into one report.
+
+    The result is the report a single unsharded run would have written.
+
+    Raises:
+        ValueError: If shards are missing, duplicated or inconsistent
+    """
+    if not reports:
+        raise ValueError("No reports to merge")
+    for report in reports:
+        if report.get("format") != REPORT_FORMAT:
+            raise ValueError(f"Unsupported report format: {report.get('format')}")
+
+    count = reports[0]["shard"]["count"]
+    indexes = sorted(report["shard"]["index"] for report in reports)
+    if any(report["shard"]["count"] != count for report in reports):
+        raise ValueError("Reports come from different shard counts")
+    if indexes != list(range(1, count + 1)):
+        missing = sorted(set(range(1, count + 1)) - set(indexes))
+        if missing:
+            raise ValueError(f"Missing shards: {', '.join(map(str, missing))}")
+        raise ValueError("Duplicate shards")
+
+    results = [result for report in reports for result in report["results"]]
+    keys = [result["key"] for result in results]
+    if len(set(keys)) != len(keys):
+        raise ValueError("Reports overlap: the same input appears in two shards")
+    return build_report(results, reports[0]["target"], (1, 1))
+
+
+def merge_main(argv: List[str]) -> None:
+    """Entry point for `main.py merge REPORT... [--report OUT]`."""
+    parser = argparse.ArgumentParser(
+        prog="main.py merge", description="Merge sharded validation reports"
+    )
+    parser.add_argument("reports", nargs="+", help="Partial report files")
+    parser.add_argument("--report", help="Write the merged report to this file")
+    parser.add_argument(
+        "--schema-dir",
+        default="systems",
+        help="Directory containing schema files (default: systems)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        reports = []
+        for path in args.reports:
+            with open(path, "r", encoding="utf-8") as f:
+                reports.append(json.load(f))
+        merged = merge_reports(reports)
+        if args.report:
+            write_report(Path(args.report), merged)
+        validator = TroikaValidator(Path(args.schema_dir), cache_dir=DEFAULT_CACHE_DIR)
+        validator.print_validation_results(merged["results"])
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def validate_ndjson(
+    source: str,
+    schema_id: str,
+    workers: int,
+    concatenated: bool,
+    schema_dir: Path,
+    coverage: Optional[SchemaCoverage] = None,
+) -> None:
+    """Stream per-record results as NDJSON on stdout and a summary on stderr."""
+    validator = TroikaValidator(
+        schema_dir, quiet=True, cache_dir=DEFAULT_CACHE_DIR, coverage=coverage
+    )
+    total = invalid = 0
+    with (
+        nullcontext(sys.stdin) if source == "-" else open(source, "r", encoding="utf-8")
+    ) as stream:
+        for result in validator.validate_stream(
+            stream, schema_id, workers, concatenated
+        ):
+            total += 1
+            invalid += not result["valid"]
+            print(json.dumps(result, ensure_ascii=False))
+    print(
+        f"Records: {total}, valid: {total - invalid}, invalid: {invalid}",
+        file=sys.stderr,
+    )
+
+
 def main():
     """Main CLI entry point."""
+    if sys.argv[1:2] == ["merge"]:
+        merge_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Validate JSON objects against Troika system schemas"
     )
@@ -286,12 +796,97 @@ def main():
     parser.add_argument(
         "--list-schemas", "-l", action="store_true", help="List all available schemas"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse a large aggregate file incrementally, validating each "
+        "top-level array element as it is read",
+    )
+    parser.add_argument(
+        "--ndjson",
+        metavar="FILE",
+        help="Validate an NDJSON stream from FILE ('-' for stdin); "
+        "--schema defaults to troika-character",
+    )
+    parser.add_argument(
+        "--concatenated",
+        action="store_true",
+        help="With --ndjson, read concatenated JSON documents instead of lines",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for --ndjson and archives (default: 1)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run a validation daemon for the path (default: objects/) that "
+        "revalidates changed files; query it with `python -m troika.daemon`",
+    )
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET,
+        help=f"Unix socket for --daemon (default: {DEFAULT_SOCKET})",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --daemon, poll for changes instead of using inotify",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="i/N",
+        help="Validate only shard i of N (1-based) of a directory or archive",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="FILE",
+        help="Write a JSON report of the results; combine shard reports with "
+        "`main.py merge`",
+    )
+    parser.add_argument(
+        "--coverage",
+        metavar="FILE",
+        help="Profile which schema keywords and definitions the run exercises "
+        "and write the coverage map to FILE (runs in a single process)",
+    )
 
     args = parser.parse_args()
+    coverage = SchemaCoverage() if args.coverage else None
+    if coverage is not None:
+        # Worker processes would record into their own profiles
+        args.workers = 1
 
     try:
+        if args.daemon:
+            serve(
+                lambda: TroikaValidator(
+                    Path(args.schema_dir), quiet=True, cache_dir=DEFAULT_CACHE_DIR
+                ),
+                Path(args.path) if args.path else Path("objects"),
+                Path(args.schema_dir),
+                Path(args.socket),
+                args.poll,
+            )
+            return
+
+        if args.ndjson:
+            validate_ndjson(
+                args.ndjson,
+                args.schema or "troika-character",
+                args.workers,
+                args.concatenated,
+                Path(args.schema_dir),
+                coverage,
+            )
+            return
+
         # Initialize validator
-        validator = TroikaValidator(Path(args.schema_dir))
+        validator = TroikaValidator(
+            Path(args.schema_dir), cache_dir=DEFAULT_CACHE_DIR, coverage=coverage
+        )
 
         # List schemas if requested
         if args.list_schemas:
@@ -300,10 +895,43 @@ def main():
 
         # Determine what to validate
         target_path = Path(args.path) if args.path else Path("objects")
+        shard = parse_shard(args.shard) if args.shard else None
+
+        if shard or args.report:
+            if target_path.is_file() and is_archive(target_path):
+                results = validator.validate_archive(
+                    target_path, args.schema, args.workers, shard
+                )
+            elif target_path.is_dir():
+                results = validator.validate_directory(
+                    target_path, args.recursive or not args.path, shard
+                )
+            else:
+                print(
+                    "Error: --shard and --report need a directory or archive",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+            validator.print_validation_results(results)
+            if args.report:
+                write_report(
+                    Path(args.report),
+                    build_report(results, str(target_path), shard or (1, 1)),
+                )
+            return
 
         if target_path.is_file():
             # Validate single file
-            result = validator.validate_object(target_path, args.schema)
+            if is_archive(target_path):
+                results = validator.validate_archive(
+                    target_path, args.schema, args.workers
+                )
+                validator.print_validation_results(results)
+                return
+            if args.stream:
+                result = validator.validate_object_streaming(target_path, args.schema)
+            else:
+                result = validator.validate_object(target_path, args.schema)
             validator.print_validation_results([result])
         elif target_path.is_dir():
             # Validate directory
@@ -320,6 +948,10 @@ def main():
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if coverage is not None and not args.daemon:
+            coverage.write(Path(args.coverage))
+            coverage.print_summary(Console(stderr=True))
 
 
 if __name__ == "__main__":
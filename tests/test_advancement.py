@@ -0,0 +1,114 @@
+"""
+Unit tests for the advancement simulator
+"""
+
+import importlib.util
+import unittest
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+if HAS_NUMPY:
+    import numpy as np
+
+    from troika.advancement import Cohort, cohort_from_characters, simulate
+
+
+def make_character(skill, skills, training=()):
+    """Build a minimal character document"""
+    return {
+        "name": "Test",
+        "background": "Test",
+        "attributes": {
+            "skill": skill,
+            "stamina": {"current": 20, "maximum": 20},
+            "luck": {"current": 9, "maximum": 9},
+        },
+        "advancedSkills": [
+            {"name": name, "rank": rank, "total": skill + rank, "type": "skill"}
+            for name, rank in skills
+        ],
+        "inventory": [],
+        "experience": {
+            "training": [
+                {
+                    "skill": name,
+                    "teacher": "Tutor",
+                    "teacherSkillTotal": total,
+                    "startDate": "2025-01-01",
+                }
+                for name, total in training
+            ]
+        },
+    }
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestAdvancement(unittest.TestCase):
+    """Test batched advancement rolls"""
+
+    def test_cohort_from_characters(self):
+        """Test that ranks and training are read from character documents"""
+        cohort = cohort_from_characters(
+            [
+                make_character(4, [("Sneak", 2)]),
+                make_character(6, [("Locks", 1)], training=[("Climb", 9)]),
+            ]
+        )
+        self.assertEqual(cohort.skill_names, ("Sneak", "Locks", "Climb"))
+        self.assertEqual(cohort.ranks.tolist(), [[2, 0, 0], [0, 1, 0]])
+        self.assertEqual(cohort.teacher_totals[1].tolist(), [0, 0, 9])
+
+    def test_ranks_never_decrease_and_rise_at_most_once(self):
+        """Test that each session raises a rank by at most one"""
+        cohort = Cohort(
+            np.full(500, 4, dtype=np.int16),
+            np.ones((500, 5), dtype=np.int16),
+            tuple(f"S{i}" for i in range(5)),
+        )
+        result = simulate(cohort, sessions=20, tick_probability=1.0, seed=3)
+        self.assertTrue((result.final_ranks >= 1).all())
+        self.assertTrue((result.final_ranks <= 21).all())
+        self.assertTrue((np.diff(result.mean_ranks, axis=0) >= 0).all())
+        self.assertEqual(result.histogram[5].sum(axis=1).tolist(), [500] * 5)
+
+    def test_check_limit(self):
+        """Test that no more than three ticked skills advance per session"""
+        cohort = Cohort(
+            np.zeros(1000, dtype=np.int16),
+            np.ones((1000, 6), dtype=np.int16),
+            tuple(f"S{i}" for i in range(6)),
+        )
+        result = simulate(cohort, sessions=1, tick_probability=1.0, seed=1)
+        gained = (result.final_ranks - 1).sum(axis=1)
+        self.assertLessEqual(int(gained.max()), 3)
+
+    def test_unknown_skills_stay_unknown(self):
+        """Test that skills without a rank or teacher are never learned"""
+        cohort = cohort_from_characters([make_character(4, [("Sneak", 1)])] * 10)
+        cohort = Cohort(
+            cohort.skill,
+            np.hstack([cohort.ranks, np.zeros((10, 1), dtype=np.int16)]),
+            cohort.skill_names + ("Swim",),
+        )
+        result = simulate(cohort, sessions=50, tick_probability=1.0, seed=5)
+        self.assertEqual(result.distribution("Swim"), {0: 10})
+
+    def test_training_is_capped_by_teacher(self):
+        """Test that training stops once the student reaches the teacher's total"""
+        cohort = cohort_from_characters(
+            [make_character(4, [], training=[("Climb", 8)])] * 200
+        )
+        result = simulate(cohort, sessions=200, tick_probability=0.0, seed=2)
+        self.assertEqual(result.distribution("Climb"), {4: 200})
+
+    def test_seed_is_deterministic(self):
+        """Test that the same seed gives the same projection"""
+        cohort = cohort_from_characters([make_character(5, [("Sneak", 2)])] * 50)
+        first = simulate(cohort, sessions=30, seed=9)
+        second = simulate(cohort, sessions=30, seed=9)
+        self.assertTrue((first.histogram == second.histogram).all())
+        self.assertEqual(first.percentiles("Sneak").shape, (31, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
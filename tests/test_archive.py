@@ -0,0 +1,121 @@
+"""
+Unit tests for validating data packs from archives
+"""
+
+import importlib.util
+import io
+import json
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from main import TroikaValidator
+from troika.archive import is_archive, iter_json_members
+
+HAS_ZSTANDARD = importlib.util.find_spec("zstandard") is not None
+
+
+class TestArchiveValidation(unittest.TestCase):
+    """Test reading and validating archive members in memory"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the schemas once"""
+        cls.validator = TroikaValidator(quiet=True)
+
+    def setUp(self):
+        """Build pack contents from the items and one broken enemy"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.members = {
+            f"pack/objects/items/{path.name}": path.read_bytes()
+            for path in sorted(Path("objects/items").glob("*.json"))[:5]
+        }
+        self.members["pack/objects/enemies/broken.json"] = json.dumps(
+            {"name": "Broken"}
+        ).encode("utf-8")
+        self.members["pack/objects/spells/truncated.json"] = b'{"name": '
+        self.members["pack/README.md"] = b"not json"
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp.cleanup()
+
+    def write_zip(self):
+        """Write the members to a zip archive"""
+        path = self.dir / "pack.zip"
+        with zipfile.ZipFile(path, "w") as archive:
+            for name, data in self.members.items():
+                archive.writestr(name, data)
+        return path
+
+    def tar_bytes(self):
+        """Return the members as an uncompressed tar archive"""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as archive:
+            for name, data in self.members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        return buffer.getvalue()
+
+    def write_tar_gz(self):
+        """Write the members to a gzip-compressed tar archive"""
+        path = self.dir / "pack.tar.gz"
+        with tarfile.open(path, mode="w:gz") as archive:
+            for name, data in self.members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        return path
+
+    def check_results(self, path, workers=1):
+        """Validate an archive and check the per-member results"""
+        results = {
+            r["file"].split("!", 1)[1]: r
+            for r in self.validator.validate_archive(path, workers=workers)
+        }
+        self.assertEqual(set(results), set(self.members) - {"pack/README.md"})
+        for name, result in results.items():
+            if "/items/" in name:
+                self.assertTrue(result["valid"], result["errors"])
+                self.assertEqual(result["schema_used"], "troika-item")
+        broken = results["pack/objects/enemies/broken.json"]
+        self.assertEqual(broken["schema_used"], "troika-enemy")
+        self.assertFalse(broken["valid"])
+        truncated = results["pack/objects/spells/truncated.json"]
+        self.assertTrue(truncated["errors"][0].startswith("Invalid JSON"))
+
+    def test_is_archive(self):
+        """Test archive detection by suffix"""
+        for name in ("a.zip", "a.tar.gz", "a.TGZ", "a.tar.zst", "a.tar"):
+            self.assertTrue(is_archive(Path(name)), name)
+        self.assertFalse(is_archive(Path("a.json")))
+
+    def test_zip(self):
+        """Test validating a zip archive"""
+        self.check_results(self.write_zip())
+
+    def test_tar_gz_with_workers(self):
+        """Test validating a tar.gz archive in worker processes"""
+        self.check_results(self.write_tar_gz(), workers=2)
+
+    @unittest.skipUnless(HAS_ZSTANDARD, "zstandard not installed")
+    def test_tar_zst(self):
+        """Test validating a zstandard-compressed tar archive"""
+        import zstandard
+
+        path = self.dir / "pack.tar.zst"
+        path.write_bytes(zstandard.ZstdCompressor().compress(self.tar_bytes()))
+        self.check_results(path)
+
+    def test_members_are_read_in_order(self):
+        """Test that only JSON members are yielded, in archive order"""
+        names = [name for name, _ in iter_json_members(self.write_zip())]
+        self.assertEqual(names, [n for n in self.members if n.endswith(".json")])
+
+
+if __name__ == "__main__":
+    unittest.main()
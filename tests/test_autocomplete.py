@@ -0,0 +1,66 @@
+"""
+Unit tests for prefix autocomplete
+"""
+
+import unittest
+from pathlib import Path
+
+from troika.autocomplete import Autocomplete, build_autocomplete, reference_counts
+
+
+class TestAutocomplete(unittest.TestCase):
+    """Test prefix ranges, ranking and aliases"""
+
+    def setUp(self):
+        """Build a small index"""
+        self.completer = Autocomplete()
+        self.completer.add("skills", "sword-fighting", "Sword Fighting", popularity=6)
+        self.completer.add("skills", "swim", "Swim", popularity=2)
+        self.completer.add("skills", "sneak", "Sneak", ["Stealth", "Skulk"], 9)
+        self.completer.add("items", "sword", "Sword", popularity=3)
+        self.completer.add("items", "lantern", "Lantern", ["Lantern (hooded)"], 0)
+
+    def stems(self, *args, **kwargs):
+        """Return the stems of a completion list."""
+        return [c.stem for c in self.completer.complete(*args, **kwargs)]
+
+    def test_ranked_by_category_then_popularity(self):
+        """Test that category order comes first, then popularity"""
+        self.assertEqual(self.stems("sw"), ["sword-fighting", "swim", "sword"])
+        self.assertEqual(
+            self.stems("sw", categories=["items", "skills"]),
+            ["sword", "sword-fighting", "swim"],
+        )
+
+    def test_aliases_complete_once(self):
+        """Test that aliases match without repeating the entity"""
+        completions = self.completer.complete("s")
+        self.assertEqual([c.stem for c in completions].count("sneak"), 1)
+        self.assertEqual(completions[0].stem, "sneak")
+        stealth = self.completer.complete("stea")
+        self.assertEqual((stealth[0].stem, stealth[0].matched), ("sneak", "Stealth"))
+        self.assertEqual(self.stems("lantern ("), ["lantern"])
+
+    def test_limit_and_normalization(self):
+        """Test the limit, case folding and trailing spaces"""
+        self.assertEqual(self.stems("SW", limit=1), ["sword-fighting"])
+        self.assertEqual(self.stems("sword "), ["sword-fighting"])
+        self.assertEqual(self.stems("zz"), [])
+
+    def test_index_rebuilds_after_add(self):
+        """Test that entries added after a query are found"""
+        self.stems("sw")
+        self.completer.add("spells", "swarm", "Swarm", popularity=0)
+        self.assertIn("swarm", self.stems("swa"))
+
+    def test_repository_popularity(self):
+        """Test that background references drive popularity"""
+        counts = reference_counts(Path("objects"))
+        completer = build_autocomplete(Path("objects"))
+        first = completer.complete("a", categories=["skills"])[0]
+        self.assertEqual(first.popularity, counts[("skills", first.name.lower())])
+        self.assertGreater(first.popularity, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
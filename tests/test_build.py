@@ -0,0 +1,100 @@
+"""
+Unit tests for the static site build
+"""
+
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from troika import build as site_build
+
+
+class TestStaticBuild(unittest.TestCase):
+    """Test bundling, hashing and incremental rebuilds"""
+
+    def setUp(self):
+        """Copy the objects tree so inputs can be modified"""
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.objects = root / "objects"
+        shutil.copytree("objects", self.objects)
+        self.out = root / "site"
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp.cleanup()
+
+    def read_bundle(self, name):
+        """Load a bundle through the manifest"""
+        with open(self.out / "manifest.json", "r", encoding="utf-8") as f:
+            entry = json.load(f)["bundles"][name]
+        return entry, json.loads((self.out / entry["file"]).read_bytes())
+
+    def test_full_bundle_inlines_refs(self):
+        """Test that every $ref is replaced by the referenced document"""
+        site_build.build(self.objects, self.out)
+        entry, data = self.read_bundle("troika-system-data")
+        self.assertEqual(len(data["enemies"]), 36)
+        self.assertEqual(data["possessions"], [])
+        self.assertNotIn("$ref", json.dumps(data))
+        self.assertEqual(data["metadata"]["title"], "Troika!")
+        self.assertIn(entry["hash"], entry["file"])
+
+    def test_category_bundle_is_minified_and_compressed(self):
+        """Test that bundles are minified and have a gzip variant"""
+        site_build.build(self.objects, self.out)
+        _, inputs, _ = site_build.plan_bundles(self.objects)
+        entry, data = self.read_bundle("spells")
+        self.assertEqual(len(data), len(inputs["spells"]))
+        self.assertNotIn("possessions", inputs)
+        raw = (self.out / entry["file"]).read_bytes()
+        self.assertNotIn(b"\n", raw)
+        gz = (self.out / entry["gzip"]["file"]).read_bytes()
+        self.assertEqual(gzip.decompress(gz), raw)
+
+    def test_only_changed_bundles_rebuild(self):
+        """Test that editing one file rebuilds only the bundles using it"""
+        first = site_build.build(self.objects, self.out)
+        self.assertIn("items", first["rebuilt"])
+        second = site_build.build(self.objects, self.out)
+        self.assertEqual(second["rebuilt"], [])
+
+        old_entry, _ = self.read_bundle("items")
+        axe = self.objects / "items" / "axe.json"
+        data = json.loads(axe.read_text(encoding="utf-8"))
+        data["value"] = 16
+        axe.write_text(json.dumps(data), encoding="utf-8")
+
+        third = site_build.build(self.objects, self.out)
+        self.assertEqual(sorted(third["rebuilt"]), ["items", "troika-system-data"])
+        self.assertFalse((self.out / old_entry["file"]).exists())
+
+    def test_missing_output_is_rebuilt(self):
+        """Test that a deleted output triggers a rebuild"""
+        site_build.build(self.objects, self.out)
+        entry, _ = self.read_bundle("tables")
+        (self.out / entry["file"]).unlink()
+        result = site_build.build(self.objects, self.out)
+        self.assertEqual(result["rebuilt"], ["tables"])
+
+    def test_removed_bundle_outputs_are_deleted(self):
+        """Test that a bundle dropped from the aggregate loses its files"""
+        site_build.build(self.objects, self.out)
+        entry, _ = self.read_bundle("tables")
+        aggregate_path = self.objects / "troika-system-data.json"
+        aggregate = json.loads(aggregate_path.read_text(encoding="utf-8"))
+        del aggregate["tables"]
+        aggregate_path.write_text(json.dumps(aggregate), encoding="utf-8")
+
+        result = site_build.build(self.objects, self.out)
+        self.assertNotIn("tables", result["manifest"]["bundles"])
+        for name in site_build._output_files(entry):
+            self.assertFalse((self.out / name).exists())
+        self.assertTrue(list(self.out.glob("spells.*.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
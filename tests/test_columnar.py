@@ -0,0 +1,88 @@
+"""
+Unit tests for the columnar NumPy export
+"""
+
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+if HAS_NUMPY:
+    import numpy as np
+
+    from troika.columnar import MISSING, ColumnarDataset, export
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestColumnarExport(unittest.TestCase):
+    """Test the exported arrays against the JSON data"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Export once into a temporary directory"""
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.out = Path(cls.tmp.name)
+        cls.manifest = export(Path("objects"), cls.out)
+        cls.dataset = ColumnarDataset(cls.out)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary directory"""
+        del cls.dataset
+        cls.tmp.cleanup()
+
+    def test_row_counts(self):
+        """Test that every entity becomes one row"""
+        self.assertEqual(self.manifest["arrays"]["enemies"], 36)
+        self.assertEqual(self.manifest["arrays"]["items"], 50)
+        self.assertEqual(self.manifest["arrays"]["spells"], 74)
+        self.assertEqual(self.manifest["arrays"]["backgrounds"], 36)
+
+    def test_arrays_are_memory_mapped(self):
+        """Test that arrays are opened without copying"""
+        self.assertIsInstance(self.dataset["enemies"], np.memmap)
+
+    def test_enemy_stats(self):
+        """Test that enemy stats and tags survive the round trip"""
+        row = self.dataset.names("enemies").index("Alzabo")
+        record = self.dataset["enemies"][row]
+        self.assertEqual(
+            (
+                record["skill"],
+                record["stamina"],
+                record["initiative"],
+                record["armour"],
+            ),
+            (10, 21, 4, 1),
+        )
+        self.assertEqual(
+            self.dataset.tags("enemies", row), ["beast", "magical", "intelligent"]
+        )
+
+    def test_item_values_in_silver(self):
+        """Test that item values are converted and missing values marked"""
+        names = self.dataset.names("items")
+        items = self.dataset["items"]
+        self.assertEqual(items[names.index("Axe")]["value"], 15)
+        self.assertEqual(items[names.index("Velare")]["value"], 500)
+        self.assertEqual(items[names.index("Blue Star Maps")]["value"], MISSING)
+        self.assertEqual(items[names.index("Epopt Staff")]["encumbrance"], 1)
+
+    def test_background_skill_ranks(self):
+        """Test that background skill ranks are exported"""
+        row = self.dataset.names("backgrounds").index("Burglar")
+        skills = self.dataset.background_skills(row)
+        self.assertEqual(skills["Sneak"], 2)
+        self.assertEqual(skills["Crossbow Fighting"], 1)
+
+    def test_spell_costs(self):
+        """Test that spell costs are numeric with non-numeric costs missing"""
+        costs = dict(zip(self.dataset.names("spells"), self.dataset["spells"]["cost"]))
+        self.assertEqual(costs["Fire Bolt"], 1)
+        self.assertEqual(costs["Zed"], MISSING)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Unit tests for schema coverage profiling
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from main import TroikaValidator
+from troika.coverage import SchemaCoverage, iter_subschemas
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "weapon": {"$ref": "#/definitions/weapon"},
+        "mount": {"$ref": "#/definitions/mount"},
+        "cost": {"oneOf": [{"type": "integer"}, {"type": "string"}]},
+    },
+    "required": ["name"],
+    "definitions": {
+        "weapon": {
+            "type": "object",
+            "properties": {"damageAs": {"type": "string"}},
+        },
+        "mount": {"type": "object", "properties": {"speed": {"type": "integer"}}},
+    },
+}
+
+
+class TestSubschemas(unittest.TestCase):
+    """Test schema location discovery"""
+
+    def test_pointers(self):
+        """Test that nested subschemas are found with their JSON pointers"""
+        pointers = [pointer for pointer, _ in iter_subschemas(SCHEMA)]
+        self.assertEqual(pointers[0], "#")
+        self.assertIn("#/properties/cost/oneOf/1", pointers)
+        self.assertIn("#/definitions/weapon/properties/damageAs", pointers)
+        self.assertNotIn("#/required", pointers)
+
+    def test_escaping(self):
+        """Test that pointer tokens with slashes are escaped"""
+        schema = {"properties": {"a/b": {"type": "string"}}}
+        self.assertIn(
+            "#/properties/a~1b", [pointer for pointer, _ in iter_subschemas(schema)]
+        )
+
+
+class TestSchemaCoverage(unittest.TestCase):
+    """Test hit counting and the coverage map"""
+
+    def setUp(self):
+        """Validate a few documents with a profiled validator"""
+        self.coverage = SchemaCoverage()
+        validator = self.coverage.validator("test", SCHEMA)
+        self.errors = []
+        for document in (
+            {"name": "Sword", "weapon": {"damageAs": "sword"}, "cost": 4},
+            {"name": "Axe", "weapon": {"damageAs": "axe"}},
+            {"name": 3},
+        ):
+            self.errors.extend(validator.iter_errors(document))
+
+    def test_errors_unchanged(self):
+        """Test that profiling does not change validation results"""
+        self.assertEqual(len(self.errors), 1)
+        self.assertEqual(list(self.errors[0].path), ["name"])
+
+    def test_visits(self):
+        """Test that locations are visited once per document that reaches them"""
+        visits = {s.pointer: s.visits for s in self.coverage.locations("test")}
+        self.assertEqual(visits["#"], 3)
+        self.assertEqual(visits["#/properties/name"], 3)
+        self.assertEqual(visits["#/definitions/weapon"], 2)
+        self.assertEqual(visits["#/properties/cost/oneOf/0"], 1)
+        self.assertEqual(visits["#/definitions/mount"], 0)
+
+    def test_keyword_hits(self):
+        """Test that hits are recorded per keyword"""
+        stats = {s.pointer: s for s in self.coverage.locations("test")}
+        self.assertEqual(stats["#"].keywords["required"][0], 3)
+        self.assertEqual(stats["#/properties/weapon"].keywords["$ref"][0], 2)
+        self.assertGreater(stats["#/properties/weapon"].seconds, 0)
+
+    def test_hits_recorded_before_errors_are_consumed(self):
+        """Test that a keyword is recorded as soon as it runs"""
+        coverage = SchemaCoverage()
+        errors = coverage.validator("test", SCHEMA).iter_errors({"name": 3})
+        next(errors)
+        stats = {s.pointer: s for s in coverage.locations("test")}
+        self.assertEqual(stats["#/properties/name"].keywords["type"][0], 1)
+        self.assertEqual(stats["#"].keywords["properties"][0], 1)
+
+    def test_unused_lists_outermost_locations(self):
+        """Test that unused sections are reported once, at their top"""
+        unused = self.coverage.unused("test")
+        self.assertIn("#/properties/mount", unused)
+        self.assertIn("#/definitions/mount", unused)
+        self.assertNotIn("#/definitions/mount/properties/speed", unused)
+        self.assertNotIn("#/definitions/weapon", unused)
+
+    def test_definitions_slowest_first(self):
+        """Test that definitions are ranked by time"""
+        definitions = self.coverage.definitions("test")
+        self.assertEqual(
+            [s.pointer for s in definitions],
+            ["#/definitions/weapon", "#/definitions/mount"],
+        )
+
+    def test_to_json(self):
+        """Test the coverage map layout"""
+        report = self.coverage.to_json()["test"]
+        self.assertEqual(report["documents"], 3)
+        self.assertEqual(report["definitions"]["mount"]["visits"], 0)
+        self.assertEqual(
+            report["locations"]["#/properties/name"]["keywords"]["type"]["hits"], 3
+        )
+        self.assertEqual(report["covered"], len(report["locations"]) - 3)
+
+
+class TestValidatorCoverage(unittest.TestCase):
+    """Test profiling through TroikaValidator"""
+
+    def setUp(self):
+        """Create a temporary output directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_corpus_run(self):
+        """Test that a directory run records coverage and keeps its results"""
+        coverage = SchemaCoverage()
+        validator = TroikaValidator(quiet=True, coverage=coverage)
+        results = validator.validate_directory(Path("objects/items"))
+        plain = TroikaValidator(quiet=True).validate_directory(Path("objects/items"))
+        self.assertEqual([r["valid"] for r in results], [r["valid"] for r in plain])
+
+        report = coverage.to_json()["troika-item"]
+        self.assertEqual(report["documents"], len(results))
+        self.assertGreater(report["definitions"]["weapon"]["visits"], 0)
+        self.assertIn("#/definitions/mount", report["unused"])
+
+        output = self.temp_dir / "coverage.json"
+        coverage.write(output)
+        with open(output, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), json.loads(json.dumps(coverage.to_json())))
+
+    def test_aggregate_with_cross_file_refs(self):
+        """Test that the reference-free fallback pass is what gets profiled"""
+        coverage = SchemaCoverage()
+        validator = TroikaValidator(quiet=True, coverage=coverage)
+        result = validator.validate_object(Path("objects/troika-system-data.json"))
+        self.assertTrue(result["valid"])
+        report = coverage.to_json()["troika-system"]
+        self.assertEqual(report["documents"], 1)
+        for name in ("spells", "items", "enemies", "tables", "rules"):
+            self.assertNotIn(f"#/properties/{name}", report["unused"])
+        self.assertEqual(report["locations"]["#/properties/spells/items"]["visits"], 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
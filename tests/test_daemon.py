@@ -0,0 +1,121 @@
+"""
+Unit tests for the validation daemon
+"""
+
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from main import TroikaValidator
+from troika.daemon import DaemonServer, ValidationDaemon, query
+from troika.watch import PollingWatcher
+
+
+class TestValidationDaemon(unittest.TestCase):
+    """Test caching, revalidation and the socket protocol"""
+
+    def setUp(self):
+        """Copy the items and schemas, and start a daemon on a socket"""
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.objects = root / "objects"
+        shutil.copytree("objects/items", self.objects / "items")
+        self.schemas = root / "systems"
+        shutil.copytree("systems", self.schemas)
+        self.daemon = ValidationDaemon(
+            lambda: TroikaValidator(self.schemas, quiet=True),
+            self.objects,
+            self.schemas,
+        )
+        self.socket = root / "daemon.sock"
+        self.server = DaemonServer(self.socket, self.daemon)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.item = (self.objects / "items" / "lantern.json").resolve()
+
+    def tearDown(self):
+        """Stop the server and remove the directory"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tmp.cleanup()
+
+    def break_item(self):
+        """Remove a required property from the item"""
+        data = json.loads(self.item.read_text(encoding="utf-8"))
+        del data["name"]
+        time.sleep(0.01)
+        self.item.write_text(json.dumps(data), encoding="utf-8")
+
+    def check(self):
+        """Check the item through the socket"""
+        response = query(self.socket, {"cmd": "check", "paths": [str(self.item)]})
+        return response["results"][0]
+
+    def test_initial_validation_and_status(self):
+        """Test that every file is validated once at startup"""
+        status = query(self.socket, {"cmd": "status"})
+        files = len(list(self.objects.rglob("*.json")))
+        self.assertEqual((status["files"], status["invalid"]), (files, 0))
+        self.assertEqual(status["revalidations"], files)
+
+    def test_unchanged_file_is_served_from_cache(self):
+        """Test that checking an unchanged file does not revalidate it"""
+        before = self.daemon.revalidations
+        self.assertTrue(self.check()["valid"])
+        self.assertEqual(self.daemon.revalidations, before)
+
+    def test_changed_file_is_revalidated_on_check(self):
+        """Test that a check right after saving sees the new contents"""
+        self.break_item()
+        result = self.check()
+        self.assertFalse(result["valid"])
+        self.assertIn("'name' is a required property", result["errors"][0])
+        invalid = query(self.socket, {"cmd": "invalid"})["results"]
+        self.assertEqual([r["file"] for r in invalid], [str(self.item)])
+
+    def test_watcher_revalidates_only_changed_files(self):
+        """Test that watcher events revalidate just the changed file"""
+        watcher = PollingWatcher([self.objects], interval=0.01)
+        before = self.daemon.revalidations
+        self.break_item()
+        self.daemon.apply_changes(watcher.wait(timeout=2.0))
+        self.assertEqual(self.daemon.revalidations, before + 1)
+        self.assertEqual(query(self.socket, {"cmd": "status"})["invalid"], 1)
+
+        self.item.unlink()
+        self.daemon.apply_changes(watcher.wait(timeout=2.0))
+        self.assertEqual(query(self.socket, {"cmd": "status"})["invalid"], 0)
+
+    def test_removed_directory_drops_its_results(self):
+        """Test that a deleted directory removes its files from the cache"""
+        self.break_item()
+        self.daemon.apply_changes([self.item])
+        shutil.rmtree(self.objects / "items")
+        self.daemon.apply_changes([self.objects / "items"])
+        status = query(self.socket, {"cmd": "status"})
+        self.assertEqual((status["files"], status["invalid"]), (0, 0))
+
+    def test_schema_change_revalidates_everything(self):
+        """Test that editing a schema reloads it and revalidates all files"""
+        schema_file = self.schemas / "item.schema.json"
+        schema = json.loads(schema_file.read_text(encoding="utf-8"))
+        schema["required"].append("weight")
+        schema_file.write_text(json.dumps(schema), encoding="utf-8")
+        self.daemon.apply_changes([schema_file])
+        status = query(self.socket, {"cmd": "status"})
+        self.assertEqual(status["invalid"], status["files"])
+
+    def test_unknown_command_and_second_daemon(self):
+        """Test error replies and refusing to replace a live socket"""
+        self.assertIn("error", query(self.socket, {"cmd": "nope"}))
+        with self.assertRaises(RuntimeError):
+            DaemonServer(self.socket, self.daemon)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Unit tests for near-duplicate detection
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from troika.data import load_entity
+from troika.dedupe import (
+    DuplicateIndex,
+    build_index,
+    check_files,
+    entity_text,
+    jaccard,
+    shingles,
+)
+
+LOREM = (
+    "the red furred ghoul bear stands as tall as a horse and recalls the exact "
+    "sound of any creature it has ever eaten crying out in the night"
+)
+
+
+class TestShingles(unittest.TestCase):
+    """Test text extraction and shingling"""
+
+    def test_entity_text_includes_nested_descriptions(self):
+        """Test that names and nested descriptions are collected"""
+        text = entity_text(load_entity(Path("objects/enemies/alzabo.json")))
+        self.assertIn("Alzabo", text)
+        self.assertIn("mimic the voice", text)
+
+    def test_shingles_are_normalized_word_trigrams(self):
+        """Test that case and punctuation do not change shingles"""
+        self.assertEqual(shingles("A b, C d"), {"a b c", "b c d"})
+        self.assertEqual(shingles("Two words"), {"two words"})
+        self.assertEqual(shingles(""), set())
+
+
+class TestDuplicateIndex(unittest.TestCase):
+    """Test MinHash/LSH candidate search"""
+
+    def test_near_duplicates_are_found(self):
+        """Test that a lightly edited text is found and unrelated ones are not"""
+        index = DuplicateIndex(threshold=0.5)
+        index.add("alzabo", LOREM)
+        index.add("other", "a small brass key that opens any door in the city")
+        edited = LOREM.replace("as tall as a horse", "as tall as a large horse")
+        matches = index.query(edited)
+        self.assertEqual([m.second for m in matches], ["alzabo"])
+        self.assertAlmostEqual(
+            matches[0].similarity, jaccard(shingles(edited), shingles(LOREM)), 3
+        )
+        self.assertGreater(matches[0].estimate, 0.4)
+
+    def test_pairs_are_reported_once(self):
+        """Test that every similar pair appears once with sorted keys"""
+        index = DuplicateIndex(threshold=0.5)
+        index.add("b", LOREM)
+        index.add("a", LOREM + " again")
+        index.add("c", "completely different words about spells and wizards here")
+        pairs = index.pairs()
+        self.assertEqual([(p.first, p.second) for p in pairs], [("a", "b")])
+        with self.assertRaises(ValueError):
+            index.add("a", LOREM)
+
+    def test_check_new_files_against_corpus(self):
+        """Test that a copied enemy is flagged and the corpus is clean"""
+        index = build_index(Path("objects"), ["enemies"])
+        self.assertEqual(len(index), len(list(Path("objects/enemies").glob("*.json"))))
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            enemy = load_entity(Path("objects/enemies/alzabo.json"))
+            enemy["name"] = "Red Ghoul-Bear"
+            path = tmp / "enemies" / "ghoul-bear.json"
+            path.parent.mkdir()
+            path.write_text(json.dumps(enemy), encoding="utf-8")
+            shutil.copy("objects/enemies/alzabo.json", tmp / "enemies" / "alzabo.json")
+            results = check_files(index, [path, tmp / "enemies" / "alzabo.json"])
+        finally:
+            shutil.rmtree(tmp)
+        matches = results[str(path)]
+        self.assertEqual(matches[0].second, "enemies/alzabo")
+        self.assertEqual(matches[0].first, "enemies/ghoul-bear")
+        # An existing file is not reported as a duplicate of itself
+        self.assertEqual(results[str(tmp / "enemies" / "alzabo.json")], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Unit tests for the delta feed
+"""
+
+import copy
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from troika import delta
+
+
+class TestDocumentDiff(unittest.TestCase):
+    """Test the structural JSON Patch diff"""
+
+    def test_identical_documents_produce_no_operations(self):
+        """Test that equal documents give an empty patch"""
+        doc = {"a": [1, {"b": 2}], "c": "x"}
+        self.assertEqual(delta.diff_documents(doc, copy.deepcopy(doc)), [])
+
+    def test_changed_leaf_is_replaced(self):
+        """Test that only the changed leaf is reported"""
+        old = {"stats": {"skill": 7, "stamina": 10}, "name": "Alzabo"}
+        new = {"stats": {"skill": 8, "stamina": 10}, "name": "Alzabo"}
+        self.assertEqual(
+            delta.diff_documents(old, new),
+            [{"op": "replace", "path": "/stats/skill", "value": 8}],
+        )
+
+    def test_type_change_is_not_equal(self):
+        """Test that 1 and True are treated as different values"""
+        ops = delta.diff_documents({"a": 1}, {"a": True})
+        self.assertEqual(ops, [{"op": "replace", "path": "/a", "value": True}])
+
+    def test_keys_are_escaped(self):
+        """Test that / and ~ in keys are escaped as JSON Pointer tokens"""
+        ops = delta.diff_documents({}, {"a/b~c": 1})
+        self.assertEqual(ops, [{"op": "add", "path": "/a~1b~0c", "value": 1}])
+
+    def test_patches_round_trip(self):
+        """Test that applying a diff to the old document yields the new one"""
+        cases = [
+            ([1, 2, 3, 4], [1, 3, 4]),
+            ([1, 2], [0, 1, 2, 5, 6]),
+            ([{"a": 1}, {"b": 2}, 3], [{"a": 2}, 3]),
+            ({"x": [1, 2], "y": 1}, {"x": [2, 1], "z": {"k": []}}),
+            ({"a": {"b": 1}}, {"a": [1]}),
+            ("text", {"now": "object"}),
+        ]
+        for old, new in cases:
+            with self.subTest(old=old, new=new):
+                ops = delta.diff_documents(old, new)
+                patched = delta.apply_patch(copy.deepcopy(old), ops)
+                self.assertEqual(patched, new)
+
+
+class TestDeltaFeed(unittest.TestCase):
+    """Test directory diffs and the version chain"""
+
+    def setUp(self):
+        """Copy the objects tree so it can be modified"""
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.old = root / "old"
+        self.new = root / "new"
+        shutil.copytree("objects", self.old)
+        shutil.copytree("objects", self.new)
+        self.feed = root / "feed"
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp.cleanup()
+
+    def modify(self):
+        """Edit one enemy, delete one item and add one spell in the new tree"""
+        path = self.new / "enemies" / "alzabo.json"
+        enemy = json.loads(path.read_text(encoding="utf-8"))
+        enemy["stats"]["skill"] += 1
+        path.write_text(json.dumps(enemy, indent=2), encoding="utf-8")
+        removed = sorted((self.new / "items").glob("*.json"))[0]
+        removed.unlink()
+        (self.new / "spells" / "new-spell.json").write_text(
+            json.dumps({"name": "New Spell", "cost": 1}), encoding="utf-8"
+        )
+        return removed.name
+
+    def test_unchanged_trees_produce_no_operations(self):
+        """Test that identical trees give an empty patch"""
+        self.assertEqual(delta.diff_directories(self.old, self.new, workers=1), [])
+
+    def test_directory_diff_is_entity_level(self):
+        """Test that edits, removals and additions map to entity paths"""
+        removed = self.modify()
+        ops = delta.diff_directories(self.old, self.new, workers=2)
+        paths = {op["path"]: op["op"] for op in ops}
+        self.assertEqual(
+            paths,
+            {
+                "/enemies~1alzabo.json/stats/skill": "replace",
+                f"/items~1{removed}": "remove",
+                "/spells~1new-spell.json": "add",
+            },
+        )
+
+    def test_publish_chain_updates_client(self):
+        """Test that a client at v1 reaches v2 by applying the published patches"""
+        first = delta.publish(self.old, self.feed, "v1", workers=1)
+        self.assertIsNone(first["parent"])
+        client = delta.load_dataset(self.old)
+
+        self.modify()
+        second = delta.publish(self.new, self.feed, "v2", workers=1)
+        self.assertEqual(second["parent"], "v1")
+        self.assertEqual(second["operations"], 3)
+
+        for patch in delta.patches_since(self.feed, "v1"):
+            ops = json.loads((self.feed / patch).read_text(encoding="utf-8"))
+            delta.apply_patch(client, ops)
+        self.assertEqual(client, delta.load_dataset(self.new))
+        self.assertEqual(delta.patches_since(self.feed, "v2"), [])
+
+    def test_duplicate_version_is_rejected(self):
+        """Test that publishing the same version twice fails"""
+        delta.publish(self.old, self.feed, "v1", workers=1)
+        with self.assertRaises(ValueError):
+            delta.publish(self.old, self.feed, "v1", workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Unit tests for the encounter generator
+"""
+
+import unittest
+from pathlib import Path
+
+from troika.data import parse_silver
+from troika.dice import parse_chance, parse_dice
+from troika.encounters import EncounterGenerator, compile_mien
+
+
+class TestEncounterGenerator(unittest.TestCase):
+    """Test encounter generation against the enemy and item data"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.generator = EncounterGenerator.from_directory(Path("objects"), seed=7)
+
+    def test_parse_silver_values(self):
+        """Test that item values in every stored form are converted to silver"""
+        self.assertEqual(parse_silver(25), 25)
+        self.assertEqual(parse_silver("25_silver"), 25)
+        self.assertEqual(parse_silver("8 silver pence"), 8)
+        self.assertIsNone(parse_silver("priceless"))
+        self.assertIsNone(parse_silver(None))
+
+    def test_parse_dice_and_chance(self):
+        """Test that dice expressions and loot chances are parsed"""
+        self.assertEqual(parse_dice("2d6+1"), (2, 6, 1))
+        self.assertEqual(parse_dice("d6"), (1, 6, 0))
+        self.assertEqual(parse_dice("3"), (0, 0, 3))
+        self.assertAlmostEqual(parse_chance("1 in 6"), 1 / 6)
+        self.assertAlmostEqual(parse_chance("50%"), 0.5)
+        self.assertEqual(parse_chance(None), 1.0)
+
+    def test_habitat_pools_include_wildcards(self):
+        """Test that creatures found anywhere appear in every habitat pool"""
+        underground = self.generator.candidates("underground")
+        self.assertIn("goblin", underground)
+        self.assertIn("dolm", underground)
+        self.assertIn("cyclops", underground)
+        self.assertNotIn("alzabo", underground)
+
+    def test_tag_filter(self):
+        """Test that tag filters narrow the candidate pool"""
+        pool = self.generator.candidates("cities", tags=["humanoid"])
+        self.assertIn("goblin", pool)
+        self.assertIn("troll", pool)
+        self.assertNotIn("dragon", pool)
+
+    def test_stream_is_deterministic(self):
+        """Test that the same seed produces the same encounters"""
+        first = list(
+            EncounterGenerator.from_directory(Path("objects"), seed=42).stream(
+                "wilderness", limit=50
+            )
+        )
+        second = list(
+            EncounterGenerator.from_directory(Path("objects"), seed=42).stream(
+                "wilderness", limit=50
+            )
+        )
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 50)
+
+    def test_unknown_filter_yields_nothing(self):
+        """Test that a filter with no candidates yields no encounters"""
+        self.assertEqual(list(self.generator.stream(tags=["no-such-tag"], limit=5)), [])
+        self.assertIsNone(self.generator.generate(tags=["no-such-tag"]))
+
+    def test_loot_totals(self):
+        """Test that loot is rolled and valued in silver"""
+        generator = EncounterGenerator(
+            {
+                "hoarder": {
+                    "name": "Hoarder",
+                    "mien": {"diceType": "d6", "entries": []},
+                    "stats": {},
+                    "loot": [
+                        {"item": "Axe", "quantity": 2},
+                        {"item": "Silver Pence", "quantity": "2d6"},
+                        {"item": "Rope", "chance": "0%"},
+                    ],
+                }
+            },
+            {"axe": {"name": "Axe", "value": 15}, "rope": {"name": "Rope", "value": 3}},
+            seed=1,
+        )
+        for encounter in generator.stream(limit=100):
+            items = [drop.item for drop in encounter.loot]
+            self.assertEqual(items, ["Axe", "Silver Pence"])
+            coins = encounter.loot[1].quantity
+            self.assertTrue(2 <= coins <= 12)
+            self.assertEqual(encounter.silver, 30 + coins)
+
+    def test_compile_mien_2d6(self):
+        """Test that 2d6 mien tables are expanded into 36 weighted outcomes"""
+        outcomes = compile_mien(
+            {
+                "diceType": "2d6",
+                "entries": [
+                    {"roll": "2-6", "mood": "Hostile"},
+                    {"roll": 7, "mood": "Wary"},
+                    {"roll": "8-12", "mood": "Friendly"},
+                ],
+            }
+        )
+        self.assertEqual(len(outcomes), 36)
+        self.assertEqual(sum(1 for mood, _ in outcomes if mood == "Wary"), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
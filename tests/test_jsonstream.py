@@ -0,0 +1,311 @@
+"""
+Unit tests for streaming JSON readers and NDJSON validation
+"""
+
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from main import TroikaValidator
+from troika.jsonstream import (
+    ARRAY,
+    ELEMENT,
+    MEMBER,
+    MalformedRecord,
+    bounded_map,
+    iter_concatenated,
+    iter_lines,
+    iter_members,
+)
+
+
+def _square(value):
+    """Module-level function usable in worker processes"""
+    return value * value
+
+
+def make_character(name, skill=5):
+    """Build a minimal troika-character document"""
+    return {
+        "name": name,
+        "background": "Burglar",
+        "attributes": {
+            "skill": skill,
+            "stamina": {"current": 18, "maximum": 18},
+            "luck": {"current": 9, "maximum": 9},
+        },
+        "advancedSkills": [],
+        "inventory": [],
+    }
+
+
+class TestStreamReaders(unittest.TestCase):
+    """Test the NDJSON and concatenated JSON readers"""
+
+    def test_iter_lines_skips_blank_lines(self):
+        """Test that line numbers are kept and blank lines skipped"""
+        stream = io.StringIO('{"a": 1}\n\n  \n{"b": 2}\n')
+        self.assertEqual(
+            [(n, json.loads(t)) for n, t in iter_lines(stream)],
+            [(1, {"a": 1}), (4, {"b": 2})],
+        )
+
+    def test_concatenated_documents_across_chunks(self):
+        """Test that documents split across small reads are reassembled"""
+        docs = [{"name": "x" * 50, "n": i} for i in range(20)] + [12345, "s", [1]]
+        text = " ".join(json.dumps(d) for d in docs) + "\n"
+        for chunk_size in (1, 7, 64, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                values = [
+                    v for _, v in iter_concatenated(io.StringIO(text), chunk_size)
+                ]
+                self.assertEqual(values, docs)
+
+    def test_concatenated_numbers_are_not_truncated(self):
+        """Test that a number cut by a read boundary is read whole"""
+        values = [v for _, v in iter_concatenated(io.StringIO("123456 7"), 3)]
+        self.assertEqual(values, [123456, 7])
+
+    def test_concatenated_rejects_malformed_input(self):
+        """Test that a malformed trailing document raises"""
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_concatenated(io.StringIO('{"a": 1} {"b": '), 4))
+
+    def test_concatenated_skips_malformed_record(self):
+        """Test that a malformed record is reported and reading resumes after it"""
+        text = '{"a": 1}\n{"b": ]\n{"c": 3}\n'
+        for chunk_size in (2, 5, 64):
+            with self.subTest(chunk_size=chunk_size):
+                records = list(
+                    iter_concatenated(
+                        io.StringIO(text), chunk_size, skip_malformed=True
+                    )
+                )
+                self.assertEqual(records[0], (1, {"a": 1}))
+                self.assertIsInstance(records[1][1], MalformedRecord)
+                self.assertEqual(records[2], (3, {"c": 3}))
+
+    def test_concatenated_error_position_is_in_stream(self):
+        """Test that a decode error reports its line and column in the stream"""
+        text = '{"a": 1}\n{"b": 2}\n\n  {"c": ]\n'
+        with self.assertRaises(json.JSONDecodeError) as expected:
+            json.loads(text[text.index("  {") :])
+        for chunk_size in (2, 5, 64):
+            with self.subTest(chunk_size=chunk_size):
+                with self.assertRaises(json.JSONDecodeError) as caught:
+                    list(iter_concatenated(io.StringIO(text), chunk_size))
+                self.assertEqual(
+                    (caught.exception.lineno, caught.exception.colno),
+                    (4, expected.exception.colno),
+                )
+                self.assertEqual(caught.exception.pos, text.index("]"))
+                self.assertIn("line 4 column", str(caught.exception))
+
+    def test_concatenated_malformed_record_does_not_read_ahead(self):
+        """Test that a bad record is reported without buffering to the end"""
+
+        class Endless(io.StringIO):
+            def read(self, size=-1):
+                self.reads = getattr(self, "reads", 0) + 1
+                if self.reads > 100:
+                    raise AssertionError("read too far ahead")
+                return '{"b": ]\n' if self.reads == 1 else " " * size
+
+        records = iter_concatenated(Endless(), 4, skip_malformed=True)
+        self.assertIsInstance(next(records)[1], MalformedRecord)
+
+    def test_bounded_map_keeps_order(self):
+        """Test that results come back in input order with workers"""
+        items = iter(range(1000))
+        self.assertEqual(
+            list(bounded_map(_square, items, workers=2, batch_size=16)),
+            [i * i for i in range(1000)],
+        )
+
+
+class TestIterMembers(unittest.TestCase):
+    """Test incremental parsing of a top-level object"""
+
+    def test_events_for_members_and_arrays(self):
+        """Test that arrays are split into elements and other members kept whole"""
+        doc = {"version": "1", "items": [{"a": 1}, [2], "x"], "empty": [], "m": {}}
+        for chunk_size in (1, 5, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                events = list(iter_members(io.StringIO(json.dumps(doc)), chunk_size))
+                self.assertEqual(
+                    events,
+                    [
+                        (MEMBER, "version", "1"),
+                        (ARRAY, "items", None),
+                        (ELEMENT, "items", {"a": 1}),
+                        (ELEMENT, "items", [2]),
+                        (ELEMENT, "items", "x"),
+                        (ARRAY, "empty", None),
+                        (MEMBER, "m", {}),
+                    ],
+                )
+
+    def test_empty_object(self):
+        """Test that an empty object yields no events"""
+        self.assertEqual(list(iter_members(io.StringIO(" {} "))), [])
+
+    def test_malformed_input_raises(self):
+        """Test that non-objects, bad separators and trailing data are rejected"""
+        for text in ("[1, 2]", '{"a": [1 2]}', '{"a": 1} {}', '{"a": 1'):
+            with self.subTest(text=text):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(iter_members(io.StringIO(text), 2))
+
+
+class TestStreamValidation(unittest.TestCase):
+    """Test validating NDJSON character streams"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the schemas once"""
+        cls.validator = TroikaValidator(quiet=True)
+
+    def stream(self):
+        """Build an NDJSON stream with one invalid record and one bad line"""
+        lines = [
+            json.dumps(make_character("Alice")),
+            json.dumps(make_character("Bob", skill=9)),
+            "{not json",
+            json.dumps(make_character("Carol")),
+        ]
+        return io.StringIO("\n".join(lines) + "\n")
+
+    def test_ndjson_results_per_record(self):
+        """Test that every line gets a result with its line number"""
+        results = list(self.validator.validate_stream(self.stream()))
+        self.assertEqual([r["record"] for r in results], [1, 2, 3, 4])
+        self.assertEqual([r["valid"] for r in results], [True, False, False, True])
+        self.assertIn("attributes.skill", results[1]["errors"][0])
+        self.assertTrue(results[2]["errors"][0].startswith("Invalid JSON"))
+
+    def test_workers_match_serial_results(self):
+        """Test that a worker pool gives the same results as one process"""
+        serial = list(self.validator.validate_stream(self.stream()))
+        parallel = list(self.validator.validate_stream(self.stream(), workers=2))
+        self.assertEqual(parallel, serial)
+
+    def test_concatenated_stream(self):
+        """Test validating pretty-printed documents back to back"""
+        text = "".join(json.dumps(make_character(n), indent=2) for n in ("A", "B", "C"))
+        results = list(
+            self.validator.validate_stream(io.StringIO(text), concatenated=True)
+        )
+        self.assertEqual([r["record"] for r in results], [1, 2, 3])
+        self.assertTrue(all(r["valid"] for r in results))
+
+    def test_concatenated_stream_with_bad_record(self):
+        """Test that a malformed document is one invalid record, not a failed run"""
+        text = "\n".join(
+            [
+                json.dumps(make_character("A")),
+                '{"name": }',
+                json.dumps(make_character("B")),
+            ]
+        )
+        results = list(
+            self.validator.validate_stream(io.StringIO(text), concatenated=True)
+        )
+        self.assertEqual([r["valid"] for r in results], [True, False, True])
+        self.assertTrue(results[1]["errors"][0].startswith("Invalid JSON"))
+
+    def test_interleaved_streams(self):
+        """Test that two streams with different schemas validate independently"""
+        expected_characters = list(self.validator.validate_stream(self.stream()))
+        expected_items = list(
+            self.validator.validate_stream(self.stream(), "troika-item")
+        )
+        characters = self.validator.validate_stream(self.stream())
+        items = self.validator.validate_stream(self.stream(), "troika-item")
+        interleaved = [(next(characters), next(items)) for _ in range(4)]
+        self.assertEqual([c for c, _ in interleaved], expected_characters)
+        self.assertEqual([i for _, i in interleaved], expected_items)
+        self.assertNotEqual(expected_characters, expected_items)
+
+    def test_unknown_schema_is_rejected(self):
+        """Test that an unknown schema ID fails before reading the stream"""
+        with self.assertRaises(ValueError):
+            self.validator.validate_stream(io.StringIO(""), "troika-unknown")
+
+
+class TestStreamingAggregateValidation(unittest.TestCase):
+    """Test incremental validation of aggregate files"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the schemas once"""
+        cls.validator = TroikaValidator(quiet=True)
+
+    def setUp(self):
+        """Create a temporary directory for aggregate files"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp.cleanup()
+
+    def write(self, data):
+        """Write an aggregate file and return its path"""
+        path = self.dir / "campaign.json"
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        return path
+
+    def test_inlined_elements_are_validated(self):
+        """Test that each array element is checked against its item schema"""
+        with open("objects/enemies/alzabo.json", "r", encoding="utf-8") as f:
+            enemy = json.load(f)
+        path = self.write(
+            {
+                "version": "1.0",
+                "characters": [make_character("A"), make_character("B", skill=2)],
+                "enemies": [enemy],
+            }
+        )
+        result = self.validator.validate_object_streaming(path, "troika-system")
+        self.assertFalse(result["valid"])
+        self.assertEqual(result["elements"], 3)
+        self.assertEqual(len(result["errors"]), 1)
+        self.assertTrue(
+            result["errors"][0].endswith("at characters.1.attributes.skill")
+        )
+
+    def test_root_members_are_validated(self):
+        """Test that required and non-array members are checked"""
+        path = self.write({"characters": [make_character("A")]})
+        result = self.validator.validate_object_streaming(path, "troika-system")
+        self.assertEqual(len(result["errors"]), 1)
+        self.assertIn("'version' is a required property", result["errors"][0])
+
+    def test_file_references_match_plain_validation(self):
+        """Test that $ref elements are handled as the whole-file validator does"""
+        path = Path("objects/troika-system-data.json")
+        result = self.validator.validate_object_streaming(path)
+        self.assertEqual(result["schema_used"], "troika-system")
+        self.assertGreater(result["elements"], 150)
+        self.assertEqual(result["errors"], [])
+        self.assertEqual(result["valid"], self.validator.validate_object(path)["valid"])
+
+    def test_non_object_elements_are_reported(self):
+        """Test that scalars in an array of objects are errors"""
+        path = self.write({"version": "1.0", "spells": [{"$ref": "./x.json"}, 5]})
+        result = self.validator.validate_object_streaming(path, "troika-system")
+        self.assertEqual(result["errors"], ["5 is not of type 'object' at spells.1"])
+
+    def test_truncated_file_is_reported(self):
+        """Test that malformed JSON is reported as an error"""
+        path = self.dir / "broken.json"
+        path.write_text('{"version": "1", "enemies": [{}', encoding="utf-8")
+        result = self.validator.validate_object_streaming(path, "troika-system")
+        self.assertFalse(result["valid"])
+        self.assertTrue(result["errors"][-1].startswith("Invalid JSON"))
+
+
+if __name__ == "__main__":
+    unittest.main()
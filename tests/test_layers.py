@@ -0,0 +1,150 @@
+"""
+Unit tests for layered overlay data
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from troika.data import load_entity
+from troika.layers import LayeredData, merge_patch
+
+
+class TestMergePatch(unittest.TestCase):
+    """Test JSON Merge Patch application"""
+
+    def test_merge_replace_and_delete(self):
+        """Test that objects merge, other values replace and null deletes"""
+        target = {"a": {"b": 1, "c": 2}, "d": [1, 2], "e": "x"}
+        patch = {"a": {"b": 5}, "d": [3], "e": None}
+        self.assertEqual(merge_patch(target, patch), {"a": {"b": 5, "c": 2}, "d": [3]})
+        self.assertEqual(target["a"], {"b": 1, "c": 2})
+
+    def test_unchanged_values_are_shared(self):
+        """Test that untouched subtrees are not copied"""
+        target = {"stats": {"skill": 7}, "attacks": [{"damage": 1}]}
+        merged = merge_patch(target, {"stats": {"skill": 8}})
+        self.assertIs(merged["attacks"], target["attacks"])
+        self.assertIsNot(merged["stats"], target["stats"])
+
+
+class TestLayeredData(unittest.TestCase):
+    """Test overlays over the core objects/ tree"""
+
+    def setUp(self):
+        """Create two overlay packs"""
+        self.tmp = Path(tempfile.mkdtemp())
+        self.write("pack-a", "spells/affix.json", {"cost": 4, "tags": ["homebrew"]})
+        self.write("pack-a", "spells/blink.json", {"name": "Blink", "cost": 1})
+        self.write("pack-b", "spells/affix.json", {"cost": 5, "range": None})
+
+    def tearDown(self):
+        """Remove temporary files"""
+        shutil.rmtree(self.tmp)
+
+    def write(self, pack, relative, data):
+        """Write one overlay file."""
+        path = self.tmp / pack / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data), encoding="utf-8")
+
+    def test_base_entities_are_shared_until_patched(self):
+        """Test that an entity without overlays is the parsed base file"""
+        data = LayeredData(Path("objects"), [self.tmp / "pack-a"])
+        alzabo = data.get("enemies", "alzabo")
+        self.assertEqual(alzabo, load_entity(Path("objects/enemies/alzabo.json")))
+        self.assertIs(data.get("enemies", "alzabo"), alzabo)
+
+    def test_overlays_apply_in_order(self):
+        """Test that the last layer wins and null deletes a field"""
+        data = LayeredData(Path("objects"), [self.tmp / "pack-a", self.tmp / "pack-b"])
+        affix = data.get("spells", "affix")
+        self.assertEqual(affix["cost"], 5)
+        self.assertEqual(affix["tags"], ["homebrew"])
+        self.assertNotIn("range", affix)
+        self.assertEqual(affix["name"], "Affix")
+        self.assertEqual(
+            data.providers("spells", "affix"), ["base", "pack-a", "pack-b"]
+        )
+
+    def test_added_and_removed_layers_update_indexes(self):
+        """Test that adding and removing a layer updates keys and names"""
+        data = LayeredData(Path("objects"))
+        before = data.keys("spells")
+        self.assertIsNone(data.find("spells", "blink"))
+        data.add_layer(self.tmp / "pack-a")
+        self.assertEqual(data.find("spells", "BLINK"), "blink")
+        self.assertEqual(len(data.keys("spells")), len(before) + 1)
+        self.assertEqual(data.get("spells", "affix")["cost"], 4)
+        data.remove_layer("pack-a")
+        self.assertIsNone(data.find("spells", "blink"))
+        self.assertIsNone(data.get("spells", "blink"))
+        self.assertEqual(data.keys("spells"), before)
+        self.assertEqual(data.get("spells", "affix")["cost"], 3)
+
+    def test_removed_layer_restores_shadowed_names(self):
+        """Test that a name falls back to the entity it was shadowing"""
+        self.write("pack-c", "spells/aaa.json", {"name": "Affix"})
+        self.write("pack-d", "spells/affix.json", {"name": "Blink"})
+        data = LayeredData(Path("objects"), [self.tmp / "pack-a"])
+        self.assertEqual(data.find("spells", "affix"), "affix")
+        data.add_layer(self.tmp / "pack-c")
+        data.add_layer(self.tmp / "pack-d")
+        self.assertEqual(data.find("spells", "affix"), "aaa")
+        self.assertEqual(data.find("spells", "blink"), "affix")
+        data.remove_layer("pack-c")
+        self.assertIsNone(data.find("spells", "affix"))
+        data.remove_layer("pack-d")
+        self.assertEqual(data.find("spells", "affix"), "affix")
+        self.assertEqual(data.find("spells", "blink"), "blink")
+
+    def test_layer_position(self):
+        """Test that a layer inserted lower has lower priority"""
+        data = LayeredData(Path("objects"), [self.tmp / "pack-b"])
+        data.add_layer(self.tmp / "pack-a", position=1)
+        self.assertEqual(data.get("spells", "affix")["cost"], 5)
+        with self.assertRaises(ValueError):
+            data.add_layer(self.tmp / "pack-a")
+
+    def test_layer_names_are_unique(self):
+        """Test that same-named directories get distinct default names"""
+        self.write("one/objects", "spells/affix.json", {"cost": 1})
+        self.write("two/objects", "spells/affix.json", {"cost": 2})
+        self.write("base", "spells/affix.json", {"cost": 3})
+        data = LayeredData(
+            Path("objects"),
+            [self.tmp / "one/objects", self.tmp / "two/objects", self.tmp / "base"],
+        )
+        self.assertEqual(
+            data.providers("spells", "affix"),
+            ["base", "objects", "two/objects", f"{self.tmp.name}/base"],
+        )
+        data.add_layer(self.tmp / "pack-a", name="homebrew")
+        self.assertEqual(data.providers("spells", "blink"), ["homebrew"])
+        with self.assertRaises(ValueError):
+            data.add_layer(self.tmp / "pack-b", name="homebrew")
+
+    def test_conflicts_between_overlays(self):
+        """Test that overlays disagreeing on a field are reported"""
+        self.write("pack-b", "spells/blink.json", {"cost": 1})
+        data = LayeredData(Path("objects"), [self.tmp / "pack-a", self.tmp / "pack-b"])
+        conflicts = data.conflicts()
+        self.assertEqual(len(conflicts), 1)
+        conflict = conflicts[0]
+        self.assertEqual((conflict.stem, conflict.path), ("affix", "cost"))
+        self.assertEqual(conflict.values, (("pack-a", 4), ("pack-b", 5)))
+        self.assertEqual(conflict.winner, "pack-b")
+
+    def test_parent_replacement_conflicts_with_child_patch(self):
+        """Test that replacing an object conflicts with patching inside it"""
+        self.write("pack-a", "enemies/alzabo.json", {"stats": {"skill": 9}})
+        self.write("pack-b", "enemies/alzabo.json", {"stats": "see errata"})
+        data = LayeredData(Path("objects"), [self.tmp / "pack-a", self.tmp / "pack-b"])
+        paths = [c.path for c in data.conflicts() if c.stem == "alzabo"]
+        self.assertEqual(paths, ["stats.skill"])
+
+
+if __name__ == "__main__":
+    unittest.main()
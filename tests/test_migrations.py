@@ -0,0 +1,144 @@
+"""
+Unit tests for the migration engine
+"""
+
+import json
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+
+from troika import migrations
+
+
+class TestApplyMigrations(unittest.TestCase):
+    """Test the single-pass, copy-on-write traversal"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.dispatch = migrations._build_dispatch(
+            [migrations.MIGRATIONS["0001-silver-values"]]
+        )
+
+    def test_unchanged_document_is_returned_as_is(self):
+        """Test that a document without matches is not copied"""
+        doc = {"name": "Lantern", "value": 5, "tags": [{"value": "priceless"}]}
+        changes = []
+        self.assertIs(migrations.apply_migrations(doc, self.dispatch, changes), doc)
+        self.assertEqual(changes, [])
+
+    def test_only_changed_paths_are_copied(self):
+        """Test that unchanged subtrees are shared with the original"""
+        doc = {"a": {"value": "25_silver"}, "b": {"value": 3}, "c": [{"x": 1}]}
+        changes = []
+        result = migrations.apply_migrations(doc, self.dispatch, changes)
+        self.assertEqual(result["a"], {"value": 25})
+        self.assertEqual(doc["a"], {"value": "25_silver"})
+        self.assertIs(result["b"], doc["b"])
+        self.assertIs(result["c"], doc["c"])
+        self.assertEqual(changes[0].path, "/a/value")
+        self.assertEqual((changes[0].old, changes[0].new), ("25_silver", 25))
+
+    def test_rules_run_in_one_traversal(self):
+        """Test that several migrations apply in id order to the same value"""
+        upper = migrations.Migration(
+            "9000-test", "test", frozenset(["value"]), lambda k, v: v * 2
+        )
+        dispatch = migrations._build_dispatch(
+            [migrations.MIGRATIONS["0001-silver-values"], upper]
+        )
+        changes = []
+        result = migrations.apply_migrations([{"value": "4_silver"}], dispatch, changes)
+        self.assertEqual(result, [{"value": 8}])
+        self.assertEqual(
+            [c.migration for c in changes], ["0001-silver-values", "9000-test"]
+        )
+
+
+class TestMigrate(unittest.TestCase):
+    """Test migrating a directory tree"""
+
+    def setUp(self):
+        """Copy the objects tree and plant a legacy silver value"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.objects = Path(self.tmp.name) / "objects"
+        shutil.copytree("objects", self.objects)
+        aggregate = self.objects / "troika-system-data.json"
+        data = json.loads(aggregate.read_text(encoding="utf-8"))
+        data["metadata"].pop("migrations", None)
+        aggregate.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+        self.target = self.objects / "items" / "lantern.json"
+        item = json.loads(self.target.read_text(encoding="utf-8"))
+        item["value"] = "12_silver"
+        self.target.write_text(json.dumps(item, indent=2) + "\n", encoding="utf-8")
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.tmp.cleanup()
+
+    def snapshot(self):
+        """Return the modification time of every file"""
+        return {p: p.stat().st_mtime_ns for p in self.objects.rglob("*.json")}
+
+    def test_dry_run_reports_diff_without_writing(self):
+        """Test that --dry-run leaves files untouched"""
+        before = self.snapshot()
+        ran, results = migrations.migrate(self.objects, dry_run=True, workers=1)
+        self.assertEqual([m.id for m in ran], ["0001-silver-values"])
+        self.assertEqual([Path(r.path) for r in results], [self.target])
+        self.assertIn('-  "value": "12_silver"', results[0].diff)
+        self.assertIn('+  "value": 12\n', results[0].diff)
+        self.assertEqual(self.snapshot(), before)
+
+    def test_migrate_rewrites_only_changed_files_and_records_history(self):
+        """Test that one file is rewritten and the migration is recorded once"""
+        before = self.snapshot()
+        migrations.migrate(self.objects, workers=2)
+        after = self.snapshot()
+        changed = {p for p in after if after[p] != before[p]}
+        aggregate = self.objects / "troika-system-data.json"
+        self.assertEqual(changed, {self.target, aggregate})
+
+        text = self.target.read_text(encoding="utf-8")
+        self.assertEqual(json.loads(text)["value"], 12)
+        self.assertTrue(text.endswith("\n"))
+        history = migrations.load_history(self.objects)
+        self.assertEqual(history[0]["id"], "0001-silver-values")
+        self.assertEqual((history[0]["files"], history[0]["changes"]), (1, 1))
+
+        ran, results = migrations.migrate(self.objects, workers=1)
+        self.assertEqual((ran, results), ([], []))
+        self.assertEqual(len(migrations.load_history(self.objects)), 1)
+
+    def test_rewritten_files_keep_their_mode(self):
+        """Test that atomic replacement keeps the original permissions"""
+        os.chmod(self.target, 0o644)
+        migrations.migrate(self.objects, workers=1)
+        self.assertEqual(json.loads(self.target.read_text())["value"], 12)
+        self.assertEqual(stat.S_IMODE(self.target.stat().st_mode), 0o644)
+
+    def test_failed_file_is_not_recorded_as_applied(self):
+        """Test that history is not recorded when a file fails to migrate"""
+        (self.objects / "items" / "broken.json").write_text("{", encoding="utf-8")
+        ran, results = migrations.migrate(self.objects, workers=1)
+        self.assertEqual([m.id for m in ran], ["0001-silver-values"])
+        self.assertTrue(any(r.error for r in results))
+        self.assertEqual(migrations.load_history(self.objects), [])
+        self.assertEqual(json.loads(self.target.read_text())["value"], 12)
+
+        with self.assertRaises(SystemExit) as raised:
+            migrations.main(["--objects", str(self.objects), "--workers", "1"])
+        self.assertEqual(raised.exception.code, 1)
+        self.assertEqual(migrations.load_history(self.objects), [])
+
+    def test_unknown_migration_is_rejected(self):
+        """Test that --only with an unknown id fails"""
+        with self.assertRaises(ValueError):
+            migrations.migrate(self.objects, only=["9999-missing"], dry_run=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
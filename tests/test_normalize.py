@@ -0,0 +1,102 @@
+"""
+Unit tests for duration and range normalization
+"""
+
+import math
+import unittest
+from pathlib import Path
+
+from troika.normalize import (
+    NormalizedData,
+    SortedIndex,
+    band_rank,
+    parse_duration,
+    parse_range,
+)
+
+
+class TestParsing(unittest.TestCase):
+    """Test parsing of free-form values"""
+
+    def test_timed_durations(self):
+        """Test that spellings of the same duration parse alike"""
+        for text in ("3 minutes", "3_minutes", "3 Minutes"):
+            duration = parse_duration(text)
+            self.assertEqual((duration.kind, duration.seconds), ("timed", 180))
+        self.assertEqual(parse_duration("1_hour").seconds, 3600)
+        self.assertEqual(parse_duration("1d6_minutes").seconds, 210)
+        self.assertEqual(parse_duration("1_day_or_until_ended").seconds, 86400)
+
+    def test_duration_kinds(self):
+        """Test the enum categories of untimed durations"""
+        self.assertEqual(parse_duration("Instantaneous").kind, "instant")
+        self.assertEqual(parse_duration("Instantaneous").seconds, 0)
+        self.assertEqual(parse_duration("permanent").seconds, math.inf)
+        self.assertEqual(parse_duration("while_concentrating").kind, "concentration")
+        self.assertEqual(parse_duration("until_attacked").kind, "conditional")
+        self.assertIsNone(parse_duration("Until woken").seconds)
+        self.assertEqual(parse_duration("variable").kind, "variable")
+
+    def test_ranges(self):
+        """Test distances, bands and alternatives"""
+        self.assertEqual(parse_range("20_metres").metres, 20)
+        self.assertEqual(parse_range("Up to 5 metres").band, "short")
+        self.assertEqual(parse_range("Touch").band, "touch")
+        self.assertEqual(parse_range("Touch/Close").band, "close")
+        self.assertEqual(parse_range("Touch or line of sight").band, "sight")
+        self.assertIsNone(parse_range("Between mirrors").band)
+
+
+class TestNormalizedData(unittest.TestCase):
+    """Test the sorted indexes over the repository's data"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Parse the data once"""
+        cls.data = NormalizedData(Path("objects"))
+
+    def test_spells_lasting_at_least_an_hour(self):
+        """Test that a range query matches a scan of the parsed values"""
+        found = set(self.data.query("spells", "duration.seconds", lo=3600))
+        expected = {
+            stem
+            for stem, fields in self.data.fields["spells"].items()
+            if "duration" in fields
+            and fields["duration"].seconds is not None
+            and fields["duration"].seconds >= 3600
+        }
+        self.assertEqual(found, expected)
+        self.assertIn("affix", self.data.query("spells", "duration.seconds", 180, 180))
+        permanent = self.data.with_kind("spells", "duration", "permanent")
+        self.assertTrue(permanent)
+        self.assertTrue(set(permanent) <= found)
+
+    def test_band_query(self):
+        """Test that band ranks give touch-or-closer spells"""
+        close = self.data.query("spells", "range.band", hi=band_rank("touch"))
+        for stem in close:
+            band = self.data.get("spells", stem)["range"].band
+            self.assertIn(band, ("self", "touch"))
+
+    def test_item_setup_time(self):
+        """Test that item setup times are indexed"""
+        stems = self.data.query("items", "setupTime.seconds", lo=60)
+        self.assertTrue(stems)
+        self.assertEqual(self.data.get("items", stems[0])["setupTime"].seconds, 1200)
+
+    def test_sorted_index_bounds(self):
+        """Test inclusive bounds of a sorted index"""
+        index = SortedIndex([(5.0, "b"), (1.0, "a"), (9.0, "c")])
+        self.assertEqual(index.between(1, 5), ["a", "b"])
+        self.assertEqual(index.between(lo=6), ["c"])
+        self.assertEqual(index.between(hi=0), [])
+
+    def test_json_output(self):
+        """Test that permanent durations serialize without infinity"""
+        output = self.data.to_json()
+        stem = self.data.with_kind("spells", "duration", "permanent")[0]
+        self.assertIsNone(output["spells"][stem]["duration"]["seconds"])
+
+
+if __name__ == "__main__":
+    unittest.main()
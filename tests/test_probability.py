@@ -0,0 +1,99 @@
+"""
+Unit tests for exact test and damage probabilities
+"""
+
+import json
+import unittest
+from fractions import Fraction
+
+from troika.probability import (
+    TWO_D6,
+    consecutive_luck_tests,
+    damage_distribution,
+    damage_over_hits,
+    damage_row,
+    damage_row_from_table,
+    expected_value,
+    roll_under,
+    roll_under_many,
+    roll_versus,
+    roll_versus_many,
+)
+
+
+class TestProbability(unittest.TestCase):
+    """Test probability tables against hand-computed values"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        with open("objects/tables/melee-damage-table.json", "r", encoding="utf-8") as f:
+            self.melee = json.load(f)
+
+    def test_two_d6_distribution(self):
+        """Test that 2d6 sums to one with the familiar triangle"""
+        self.assertEqual(sum(TWO_D6.values()), 1)
+        self.assertEqual(TWO_D6[7], Fraction(6, 36))
+        self.assertEqual(TWO_D6[2], Fraction(1, 36))
+
+    def test_roll_under_extremes(self):
+        """Test that double 1 always succeeds and double 6 always fails"""
+        self.assertEqual(roll_under(0), Fraction(1, 36))
+        self.assertEqual(roll_under(2), Fraction(1, 36))
+        self.assertEqual(roll_under(7), Fraction(21, 36))
+        self.assertEqual(roll_under(12), Fraction(35, 36))
+        self.assertEqual(roll_under(99), Fraction(35, 36))
+
+    def test_roll_versus_is_symmetric(self):
+        """Test that opposed odds mirror when the sides swap"""
+        for ours, theirs in [(7, 7), (10, 6), (4, 15)]:
+            win, tie, lose = roll_versus(ours, theirs)
+            self.assertEqual(win + tie + lose, 1)
+            self.assertEqual(roll_versus(theirs, ours), (lose, tie, win))
+        win, tie, lose = roll_versus(8, 8)
+        self.assertEqual(win, lose)
+        self.assertEqual(tie, Fraction(146, 1296))
+
+    def test_batch_queries_match_exact(self):
+        """Test that batch float queries agree with exact values"""
+        targets = list(range(-3, 35))
+        for target, value in zip(targets, roll_under_many(targets)):
+            self.assertAlmostEqual(value, float(roll_under(target)))
+        pairs = [(5, 9), (12, 3), (6, 6)]
+        for pair, odds in zip(pairs, roll_versus_many(pairs)):
+            self.assertEqual(odds, tuple(float(p) for p in roll_versus(*pair)))
+
+    def test_consecutive_luck_tests(self):
+        """Test that repeated luck tests use the reduced luck score"""
+        self.assertEqual(consecutive_luck_tests(9, 2), roll_under(9) * roll_under(8))
+
+    def test_damage_distribution_with_armour(self):
+        """Test that armour shifts damage rolls down with a floor of 1"""
+        sword = damage_row_from_table(self.melee, "Sword")
+        self.assertEqual(sword, (4, 6, 6, 6, 6, 8, 10))
+        unarmoured = damage_distribution(sword)
+        self.assertEqual(unarmoured[4], Fraction(1, 6))
+        heavy = damage_distribution(sword, armour=3)
+        self.assertEqual(heavy[4], Fraction(4, 6))
+        bonus = damage_distribution(sword, modifier=1)
+        self.assertEqual(bonus[10], Fraction(1, 6))
+
+    def test_damage_convolution(self):
+        """Test that damage over several hits is a convolution"""
+        row = damage_row({"1": 1, "2": 1, "3": 1, "4": 2, "5": 2, "6": 2, "7+": 2})
+        two_hits = damage_over_hits(row, 2)
+        self.assertEqual(
+            two_hits, {2: Fraction(1, 4), 3: Fraction(1, 2), 4: Fraction(1, 4)}
+        )
+        self.assertEqual(expected_value(damage_over_hits(row, 3)), Fraction(9, 2))
+
+    def test_cached_distributions_cannot_be_corrupted(self):
+        """Test that modifying a returned distribution leaves the cache intact"""
+        row = (1, 2, 3, 4, 5, 6, 7)
+        for dist in (damage_distribution(row), damage_over_hits(row, 2)):
+            dist.clear()
+        self.assertEqual(damage_distribution(row)[1], Fraction(1, 6))
+        self.assertEqual(sum(damage_over_hits(row, 2).values()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Unit tests for the hot-reloadable dataset
+"""
+
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from troika.reload import ReloadableDataset
+
+
+class TestReloadableDataset(unittest.TestCase):
+    """Test incremental snapshot rebuilds and swaps"""
+
+    def setUp(self):
+        """Copy part of objects/ to a temporary directory"""
+        self.tmp = Path(tempfile.mkdtemp())
+        self.objects = self.tmp / "objects"
+        for category in ("spells", "enemies"):
+            shutil.copytree(Path("objects") / category, self.objects / category)
+        self.dataset = ReloadableDataset(self.objects)
+
+    def tearDown(self):
+        """Stop watching and remove temporary files"""
+        self.dataset.stop()
+        shutil.rmtree(self.tmp)
+
+    def edit(self, relative, **changes):
+        """Change fields of one entity file and return its path."""
+        path = self.objects / relative
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data.update(changes)
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return path
+
+    def test_changed_entity_is_swapped_in(self):
+        """Test that only the changed entity is rebuilt"""
+        old = self.dataset.snapshot
+        path = self.edit("spells/affix.json", cost=9)
+        new = self.dataset.apply_changes([path])
+        self.assertIs(self.dataset.snapshot, new)
+        self.assertEqual(new.version, old.version + 1)
+        self.assertEqual(new.get("spells", "affix")["cost"], 9)
+        # The old snapshot is untouched and unchanged data is shared
+        self.assertEqual(old.get("spells", "affix")["cost"], 3)
+        self.assertIs(new.category("enemies"), old.category("enemies"))
+        self.assertIs(new.get("spells", "amity"), old.get("spells", "amity"))
+
+    def test_rename_and_delete_update_name_index(self):
+        """Test that the name index follows renamed and deleted entities"""
+        path = self.edit("spells/affix.json", name="Fixate")
+        snap = self.dataset.apply_changes([path])
+        self.assertEqual(snap.find("spells", "fixate"), "affix")
+        self.assertIsNone(snap.find("spells", "Affix"))
+        path.unlink()
+        snap = self.dataset.apply_changes([path])
+        self.assertIsNone(snap.get("spells", "affix"))
+        self.assertIsNone(snap.find("spells", "Fixate"))
+
+    def test_removed_category_directory(self):
+        """Test that deleting a category directory removes its entities"""
+        shutil.rmtree(self.objects / "spells")
+        snap = self.dataset.apply_changes([self.objects / "spells"])
+        self.assertEqual(dict(snap.category("spells")), {})
+        self.assertIsNone(snap.find("spells", "Affix"))
+        self.assertIsNotNone(snap.get("enemies", "alzabo"))
+
+    def test_broken_file_keeps_previous_version(self):
+        """Test that a file that fails to parse keeps its last good version"""
+        path = self.objects / "spells/affix.json"
+        path.write_text("{", encoding="utf-8")
+        snap = self.dataset.apply_changes([path])
+        self.assertEqual(snap.get("spells", "affix")["name"], "Affix")
+        self.assertIn(("spells", "affix"), snap.errors)
+        path.write_text('{"name": "Affix", "cost": 1}', encoding="utf-8")
+        snap = self.dataset.apply_changes([path])
+        self.assertEqual(snap.get("spells", "affix")["cost"], 1)
+        self.assertEqual(dict(snap.errors), {})
+
+    def test_snapshots_are_read_only(self):
+        """Test that snapshot mappings cannot be modified"""
+        with self.assertRaises(TypeError):
+            self.dataset.snapshot.entities["spells"]["x"] = {}
+
+    def test_watcher_reloads_in_background(self):
+        """Test that saving a file publishes a new snapshot"""
+        reloaded = []
+        self.dataset.on_reload = reloaded.append
+        self.dataset.start()
+        self.edit("enemies/alzabo.json", name="Great Alzabo")
+        deadline = time.monotonic() + 5
+        while not reloaded and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertTrue(reloaded)
+        self.assertEqual(
+            self.dataset.snapshot.find("enemies", "great alzabo"), "alzabo"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
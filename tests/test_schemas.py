@@ -0,0 +1,184 @@
+"""
+Unit tests for flattened schemas
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from main import TroikaValidator
+from troika import schemas
+
+
+class TestFlatten(unittest.TestCase):
+    """Test inlining of internal references"""
+
+    def test_internal_refs_are_inlined(self):
+        """Test that a $ref is replaced by its definition"""
+        schema = {
+            "type": "object",
+            "properties": {"a": {"$ref": "#/definitions/num"}},
+            "definitions": {"num": {"type": "number", "minimum": 0}},
+        }
+        flat = schemas.flatten(schema)
+        self.assertEqual(
+            flat,
+            {
+                "type": "object",
+                "properties": {"a": {"type": "number", "minimum": 0}},
+            },
+        )
+        self.assertIn("definitions", schema)
+
+    def test_recursive_refs_are_kept(self):
+        """Test that a self-referencing definition stays a $ref"""
+        schema = {
+            "$ref": "#/definitions/node",
+            "definitions": {
+                "node": {
+                    "type": "object",
+                    "properties": {
+                        "children": {"items": {"$ref": "#/definitions/node"}}
+                    },
+                }
+            },
+        }
+        flat = schemas.flatten(schema)
+        self.assertEqual(flat["$ref"], "#/definitions/node")
+        self.assertIn("node", flat["definitions"])
+        self.assertEqual(
+            flat["definitions"]["node"]["properties"]["children"]["items"][
+                "properties"
+            ]["children"]["items"],
+            {"$ref": "#/definitions/node"},
+        )
+
+    def test_unresolvable_and_external_refs_are_kept(self):
+        """Test that missing and external references are left alone"""
+        schema = {
+            "properties": {
+                "a": {"$ref": "#/definitions/missing"},
+                "b": {"$ref": "troika-item"},
+            },
+            "definitions": {},
+        }
+        flat = schemas.flatten(schema)
+        self.assertEqual(flat["properties"]["a"], {"$ref": "#/definitions/missing"})
+        self.assertEqual(flat["properties"]["b"], {"$ref": "troika-item"})
+        self.assertIn("definitions", flat)
+
+    def test_data_keywords_are_not_rewritten(self):
+        """Test that $ref inside enum or const values is data, not a reference"""
+        schema = {
+            "enum": [{"$ref": "#/definitions/x"}],
+            "definitions": {"x": {"type": "string"}},
+        }
+        self.assertEqual(schema["enum"], schemas.flatten(schema)["enum"])
+
+    def test_identical_subschemas_are_shared(self):
+        """Test that dedupe interns equal subtrees without merging 1 and True"""
+        flat = schemas.dedupe(
+            {"a": {"type": "string"}, "b": {"type": "string"}, "c": [1, True]}
+        )
+        self.assertIs(flat["a"], flat["b"])
+        self.assertIs(flat["c"][1], True)
+
+
+class TestFlattenedValidation(unittest.TestCase):
+    """Test that flattened schemas validate exactly like the source schemas"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the schemas once"""
+        cls.validator = TroikaValidator(quiet=True)
+
+    def source_errors(self, data, schema_id):
+        """Validate against the unflattened schema."""
+        raw = self.validator.schemas[schema_id]
+        return self.validator._check(data, f"raw:{schema_id}", raw)
+
+    def test_all_objects_match_source_schema(self):
+        """Test that every object gets the same errors either way"""
+        for path in sorted(Path("objects").rglob("*.json")):
+            schema_id = self.validator.get_schema_for_object(path)
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self.subTest(path=str(path)):
+                self.assertEqual(
+                    self.validator.validate_data(data, schema_id),
+                    self.source_errors(data, schema_id),
+                )
+
+    def test_invalid_document_errors_match(self):
+        """Test that errors inside inlined definitions are reported identically"""
+        with open("objects/enemies/alzabo.json", "r", encoding="utf-8") as f:
+            enemy = json.load(f)
+        enemy["stats"]["skill"] = "high"
+        enemy.pop("name")
+        errors = self.validator.validate_data(enemy, "troika-enemy")
+        self.assertTrue(errors)
+        self.assertEqual(errors, self.source_errors(enemy, "troika-enemy"))
+
+
+class TestSchemaCache(unittest.TestCase):
+    """Test the flattened schema cache"""
+
+    def setUp(self):
+        """Create a schema file and cache directory"""
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cache = self.tmp / "cache"
+        self.schema_file = self.tmp / "x.schema.json"
+        self.write(
+            {
+                "items": {"$ref": "#/definitions/a"},
+                "definitions": {"a": {"type": "string"}},
+            }
+        )
+        schemas._memory_cache.clear()
+
+    def tearDown(self):
+        """Remove temporary files"""
+        shutil.rmtree(self.tmp)
+        schemas._memory_cache.clear()
+
+    def write(self, schema):
+        """Write the schema file."""
+        self.schema_file.write_text(json.dumps(schema), encoding="utf-8")
+
+    def test_cache_file_is_reused(self):
+        """Test that a second load reads the cached flat schema"""
+        _, flat = schemas.load_flattened(self.schema_file, self.cache)
+        cached = list(self.cache.glob("x.schema.json.*.json"))
+        self.assertEqual(len(cached), 1)
+        cached[0].write_text(json.dumps({"marker": True}), encoding="utf-8")
+        schemas._memory_cache.clear()
+        _, again = schemas.load_flattened(self.schema_file, self.cache)
+        self.assertEqual(flat, {"items": {"type": "string"}})
+        self.assertEqual(again, {"marker": True})
+
+    def test_changed_source_replaces_cache(self):
+        """Test that editing the schema invalidates its cache entry"""
+        schemas.load_flattened(self.schema_file, self.cache)
+        self.write({"type": "number"})
+        _, flat = schemas.load_flattened(self.schema_file, self.cache)
+        self.assertEqual(flat, {"type": "number"})
+        self.assertEqual(len(list(self.cache.glob("x.schema.json.*.json"))), 1)
+
+    def test_disk_cache_is_opt_in(self):
+        """Test that nothing is written to disk without a cache directory"""
+        cwd = os.getcwd()
+        os.chdir(self.tmp)
+        try:
+            before = set(Path(".").rglob("*"))
+            _, flat = schemas.load_flattened(self.schema_file)
+            self.assertEqual(set(Path(".").rglob("*")), before)
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(flat, {"items": {"type": "string"}})
+
+
+if __name__ == "__main__":
+    unittest.main()
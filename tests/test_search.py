@@ -0,0 +1,70 @@
+"""
+Unit tests for fuzzy name search
+"""
+
+import unittest
+from pathlib import Path
+
+from troika.search import NameIndex, build_index, normalize_name
+
+
+class TestNormalizeName(unittest.TestCase):
+    """Test name normalization"""
+
+    def test_dashes_case_and_accents_fold(self):
+        """Test that typed and typeset forms of a name normalize alike"""
+        self.assertEqual(
+            normalize_name("Language – Kurgan"), normalize_name("language - kurgan")
+        )
+        self.assertEqual(normalize_name("Wings — able"), "wings able")
+        self.assertEqual(normalize_name("Knight’s  Café"), "knights cafe")
+
+
+class TestNameIndex(unittest.TestCase):
+    """Test exact and typo-tolerant lookups"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Index the repository's names once"""
+        cls.index = build_index(Path("objects"))
+
+    def test_exact_match_scores_one(self):
+        """Test that a normalized exact match ranks first with score 1"""
+        match = self.index.search("AFFIX")[0]
+        self.assertEqual(
+            (match.category, match.stem, match.score), ("spells", "affix", 1.0)
+        )
+
+    def test_typo_finds_entity(self):
+        """Test that a misspelled name still ranks the right entity first"""
+        match = self.index.search("Alzbo")[0]
+        self.assertEqual((match.category, match.stem), ("enemies", "alzabo"))
+        self.assertLess(match.score, 1.0)
+
+    def test_category_filter_and_limit(self):
+        """Test that results respect the category and limit"""
+        matches = self.index.search("knight", category="enemies", limit=2)
+        self.assertLessEqual(len(matches), 2)
+        self.assertTrue(all(m.category == "enemies" for m in matches))
+        scores = [m.score for m in matches]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_unrelated_query_returns_nothing(self):
+        """Test that nothing below the similarity threshold is returned"""
+        self.assertEqual(self.index.search("zzzzqqqq"), [])
+        self.assertEqual(self.index.search("--"), [])
+
+    def test_dashed_names(self):
+        """Test that names with typographic dashes match typed dashes"""
+        index = NameIndex(
+            [
+                ("skills", "kurgan", "Language – Kurgan"),
+                ("skills", "abyssal", "Language – Abyssal"),
+            ]
+        )
+        self.assertEqual(index.search("language - kurgan")[0].stem, "kurgan")
+        self.assertEqual(index.search("langauge kurgan")[0].stem, "kurgan")
+
+
+if __name__ == "__main__":
+    unittest.main()
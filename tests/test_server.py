@@ -0,0 +1,134 @@
+"""
+Unit tests for the asyncio HTTP data API
+"""
+
+import asyncio
+import gzip
+import json
+import unittest
+from pathlib import Path
+
+from troika.server import DataServer, build_routes
+
+
+class TestDataServer(unittest.TestCase):
+    """Test routing, ETags and compression"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the routes once"""
+        cls.server = DataServer(build_routes(Path("objects"), Path("systems")))
+
+    def test_entity_route(self):
+        """Test that a single entity is served as compact JSON"""
+        status, headers, body = self.server.respond("GET", "/api/enemies/alzabo", {})
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["name"], "Alzabo")
+        self.assertTrue(headers["ETag"].startswith('"'))
+
+    def test_category_and_index_routes(self):
+        """Test that category bundles and the index cover every entity"""
+        _, _, body = self.server.respond("GET", "/api/spells", {})
+        self.assertEqual(len(json.loads(body)), 74)
+        _, _, body = self.server.respond("GET", "/api", {})
+        self.assertEqual(json.loads(body)["items"], 50)
+
+    def test_static_layout_route(self):
+        """Test that raw files are served byte for byte"""
+        _, _, body = self.server.respond("GET", "/objects/items/axe.json", {})
+        self.assertEqual(body, Path("objects/items/axe.json").read_bytes())
+
+    def test_conditional_request(self):
+        """Test that a matching If-None-Match yields 304"""
+        _, headers, _ = self.server.respond("GET", "/api/items", {})
+        status, _, body = self.server.respond(
+            "GET", "/api/items", {"if-none-match": headers["ETag"]}
+        )
+        self.assertEqual(status, 304)
+        self.assertEqual(body, b"")
+        status, _, _ = self.server.respond(
+            "GET", "/api/items", {"if-none-match": '"stale"'}
+        )
+        self.assertEqual(status, 200)
+
+    def test_gzip_variant(self):
+        """Test that gzip bodies are precompressed with their own ETag"""
+        _, plain_headers, plain = self.server.respond("GET", "/api/all", {})
+        status, headers, body = self.server.respond(
+            "GET", "/api/all", {"accept-encoding": "gzip, deflate"}
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(body), plain)
+        self.assertNotEqual(headers["ETag"], plain_headers["ETag"])
+        _, headers, _ = self.server.respond(
+            "GET", "/api/all", {"accept-encoding": "gzip;q=0"}
+        )
+        self.assertNotIn("Content-Encoding", headers)
+
+    def test_explicit_gzip_overrides_wildcard(self):
+        """Test that gzip;q=0 refuses gzip even when * is accepted"""
+        for header, gzipped in (
+            ("gzip;q=0, *", False),
+            ("*, gzip;q=0", False),
+            ("*", True),
+            ("br, *;q=0.5", True),
+            ("*;q=0, gzip", True),
+        ):
+            with self.subTest(header=header):
+                _, headers, _ = self.server.respond(
+                    "GET", "/api/all", {"accept-encoding": header}
+                )
+                self.assertEqual("Content-Encoding" in headers, gzipped)
+
+    def test_errors(self):
+        """Test unknown routes and methods"""
+        self.assertEqual(self.server.respond("GET", "/api/nope", {})[0], 404)
+        self.assertEqual(self.server.respond("POST", "/api/items", {})[0], 405)
+
+    def test_keep_alive_over_socket(self):
+        """Test two requests on one connection"""
+
+        async def run():
+            server = await self.server.start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            statuses = []
+            for path in ("/api/enemies/goblin", "/api/schemas/troika-enemy"):
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode().split("\r\n")
+                statuses.append(lines[0])
+                length = next(
+                    int(line.split(":")[1])
+                    for line in lines
+                    if line.startswith("Content-Length")
+                )
+                await reader.readexactly(length)
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return statuses
+
+        statuses = asyncio.run(run())
+        self.assertEqual(statuses, ["HTTP/1.1 200 OK", "HTTP/1.1 200 OK"])
+
+    def test_negative_content_length(self):
+        """Test that a negative Content-Length is answered with 400"""
+
+        async def run():
+            server = await self.server.start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /api HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+            status = (await reader.readuntil(b"\r\n")).decode().strip()
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return status
+
+        self.assertEqual(asyncio.run(run()), "HTTP/1.1 400 Bad Request")
+
+
+if __name__ == "__main__":
+    unittest.main()
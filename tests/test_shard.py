@@ -0,0 +1,89 @@
+"""
+Unit tests for sharded validation and report merging
+"""
+
+import unittest
+from pathlib import Path
+
+from main import (
+    TroikaValidator,
+    build_report,
+    in_shard,
+    merge_reports,
+    parse_shard,
+)
+
+
+class TestShardAssignment(unittest.TestCase):
+    """Test parsing shard specs and assigning inputs"""
+
+    def test_parse_shard(self):
+        """Test that i/N specs are 1-based and checked"""
+        self.assertEqual(parse_shard("2/5"), (2, 5))
+        for spec in ("0/3", "4/3", "x/3", "1", "1/2/3"):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    parse_shard(spec)
+
+    def test_every_key_is_in_exactly_one_shard(self):
+        """Test that shards partition the inputs"""
+        keys = [f"items/item-{i}.json" for i in range(500)]
+        for count in (1, 2, 7):
+            for key in keys:
+                owners = [i for i in range(1, count + 1) if in_shard(key, (i, count))]
+                self.assertEqual(len(owners), 1)
+        sizes = [sum(in_shard(k, (i, 4)) for k in keys) for i in range(1, 5)]
+        self.assertTrue(all(80 < size < 170 for size in sizes), sizes)
+
+
+class TestShardedValidation(unittest.TestCase):
+    """Test that merged shard reports match a single run"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Validate the objects tree once unsharded and once in three shards"""
+        validator = TroikaValidator(quiet=True)
+        cls.target = Path("objects")
+        cls.full = build_report(
+            validator.validate_directory(cls.target), str(cls.target), (1, 1)
+        )
+        cls.shards = [
+            build_report(
+                validator.validate_directory(cls.target, shard=(i, 3)),
+                str(cls.target),
+                (i, 3),
+            )
+            for i in (1, 2, 3)
+        ]
+
+    def test_shards_are_disjoint_and_complete(self):
+        """Test that every file is validated by exactly one shard"""
+        keys = [r["key"] for shard in self.shards for r in shard["results"]]
+        self.assertEqual(sorted(keys), [r["key"] for r in self.full["results"]])
+        self.assertTrue(all(shard["results"] for shard in self.shards))
+
+    def test_merge_matches_single_run(self):
+        """Test that merging in any order gives the unsharded report"""
+        self.assertEqual(merge_reports(self.shards[::-1]), self.full)
+
+    def test_merge_rejects_missing_and_duplicate_shards(self):
+        """Test that incomplete or repeated shard sets are refused"""
+        with self.assertRaisesRegex(ValueError, "Missing shards: 2"):
+            merge_reports([self.shards[0], self.shards[2]])
+        with self.assertRaises(ValueError):
+            merge_reports([self.shards[0], self.shards[0], self.shards[2]])
+        with self.assertRaises(ValueError):
+            merge_reports([self.shards[0], self.full])
+
+    def test_merge_rejects_overlapping_results(self):
+        """Test that the same input in two shards is refused"""
+        overlapping = dict(self.shards[1])
+        overlapping["results"] = self.shards[1]["results"] + [
+            self.shards[0]["results"][0]
+        ]
+        with self.assertRaisesRegex(ValueError, "overlap"):
+            merge_reports([self.shards[0], overlapping, self.shards[2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Unit tests for the incremental character sheet engine
+"""
+
+import unittest
+from pathlib import Path
+
+from troika.data import load_category
+from troika.sheet import CharacterSheet, DependencyGraph, derive
+
+
+def make_character():
+    """Build a small character document"""
+    return {
+        "name": "Test",
+        "background": "Burglar",
+        "attributes": {
+            "skill": 5,
+            "stamina": {"current": 16, "maximum": 20, "temporary": 2},
+            "luck": {"current": 8, "maximum": 10},
+        },
+        "advancedSkills": [
+            {"name": "Sneak", "rank": 2, "total": 7, "type": "skill"},
+            {"name": "Locks", "rank": 1, "total": 6, "type": "skill"},
+        ],
+        "inventory": [
+            {"name": "Knife", "position": 1, "slots": 1},
+            {"name": "Light Armour", "position": 2, "slots": 2},
+            {"name": "Shield", "position": 3, "slots": 2, "readyForUse": True},
+        ],
+        "conditions": [
+            {"name": "Bruised", "description": "Sore", "severity": "minor"},
+        ],
+    }
+
+
+class TestCharacterSheet(unittest.TestCase):
+    """Test incremental derived values against a full recompute"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.catalog = load_category(Path("objects"), "items")
+        self.character = make_character()
+        self.sheet = CharacterSheet(self.character, self.catalog)
+
+    def test_initial_values_match_full_recompute(self):
+        """Test that the graph agrees with derive() on a fresh sheet"""
+        self.assertEqual(self.sheet.derived(), derive(self.character, self.catalog))
+        self.assertEqual(self.sheet.skill_total("Sneak"), 7)
+        self.assertEqual(self.sheet.get("armour"), 2)
+        self.assertEqual(self.sheet.get("stamina"), 18)
+
+    def test_adding_item_recomputes_only_affected_nodes(self):
+        """Test that an inventory edit does not touch skill totals"""
+        self.sheet.derived()
+        before = self.sheet.graph.recomputations
+        self.sheet.add_item({"name": "Heavy Armour", "position": 4, "slots": 6})
+        self.assertEqual(self.sheet.get("armour"), 4)
+        self.assertEqual(self.sheet.skill_total("Sneak"), 7)
+        self.assertEqual(self.sheet.graph.recomputations - before, 1)
+
+    def test_edits_match_full_recompute(self):
+        """Test that a series of edits stays consistent with derive()"""
+        handle = self.sheet.add_item({"name": "Rope", "position": 5, "slots": 1})
+        self.sheet.set_skill("Climb", 3)
+        self.sheet.set_attribute("skill", 6)
+        self.sheet.update_item(2, readyForUse=False)
+        self.sheet.remove_item(handle)
+        self.sheet.remove_skill("Locks")
+        self.sheet.add_condition(
+            {"name": "Poisoned", "description": "Ill", "severity": "severe"}
+        )
+
+        character = make_character()
+        character["attributes"]["skill"] = 6
+        character["advancedSkills"] = [
+            {"name": "Sneak", "rank": 2, "total": 8, "type": "skill"},
+            {"name": "Climb", "rank": 3, "total": 9, "type": "skill"},
+        ]
+        character["inventory"][2]["readyForUse"] = False
+        character["conditions"].append(
+            {"name": "Poisoned", "description": "Ill", "severity": "severe"}
+        )
+        self.assertEqual(self.sheet.derived(), derive(character, self.catalog))
+
+    def test_over_encumbered(self):
+        """Test that exceeding the inventory limit is flagged"""
+        self.assertFalse(self.sheet.get("overEncumbered"))
+        self.sheet.add_item({"name": "Crate", "position": 6, "slots": 14})
+        self.assertTrue(self.sheet.get("overEncumbered"))
+
+    def test_removing_input_removes_dependents(self):
+        """Test that removing a node removes everything derived from it"""
+        graph = DependencyGraph()
+        graph.add_input("a", 1)
+        graph.add_derived("b", ("a",), lambda a: a + 1)
+        graph.add_derived("c", ("b",), lambda b: b * 2)
+        self.assertEqual(graph.get("c"), 4)
+        graph.remove("a")
+        self.assertNotIn("b", graph)
+        self.assertNotIn("c", graph)
+
+
+if __name__ == "__main__":
+    unittest.main()
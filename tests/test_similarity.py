@@ -0,0 +1,178 @@
+"""
+Unit tests for similar-entity recommendations
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from array import array
+from pathlib import Path
+
+from troika.data import load_category
+from troika.similarity import (
+    NO_NEIGHBOUR,
+    SimilarityIndex,
+    entity_terms,
+    tfidf_vectors,
+    top_neighbours,
+)
+
+
+class TestVectors(unittest.TestCase):
+    """Test term extraction and TF-IDF weighting"""
+
+    def test_entity_terms_include_fields_and_tags(self):
+        """Test that structured fields and tags become weighted terms"""
+        terms = entity_terms(
+            "spells",
+            {
+                "description": "The caster summons a storm of the sea",
+                "cost": 4,
+                "testType": "None",
+                "tags": ["Elemental"],
+            },
+        )
+        self.assertIn("storm", terms)
+        self.assertNotIn("the", terms)
+        self.assertIn("cost:4", terms)
+        self.assertIn("tag:elemental", terms)
+        self.assertNotIn("test:none", terms)
+
+    def test_enemy_stats_are_banded(self):
+        """Test that close stamina values share a term"""
+        first = entity_terms("enemies", {"stats": {"stamina": 21, "skill": 7}})
+        second = entity_terms("enemies", {"stats": {"stamina": 28, "skill": 6}})
+        self.assertIn("stamina:20 29", first)
+        self.assertIn("stamina:20 29", second)
+        self.assertIn("skill:6 7", first)
+
+    def test_vectors_are_normalized(self):
+        """Test that each vector has unit length"""
+        vectors = tfidf_vectors(
+            [
+                entity_terms("spells", {"description": "fire burns bright"}),
+                entity_terms("spells", {"description": "ice freezes water"}),
+            ]
+        )
+        for vector in vectors:
+            self.assertAlmostEqual(sum(w * w for w in vector.values()), 1.0)
+
+    def test_top_neighbours_ranks_overlap(self):
+        """Test that the document sharing most terms ranks first"""
+        vectors = tfidf_vectors(
+            [
+                entity_terms("spells", {"description": "fire burns bright red"}),
+                entity_terms("spells", {"description": "fire burns red"}),
+                entity_terms("spells", {"description": "fire glows"}),
+                entity_terms("spells", {"description": "ice freezes water"}),
+            ]
+        )
+        neighbours = top_neighbours(vectors, 3)
+        self.assertEqual(neighbours[0][0][0], 1)
+        self.assertNotIn(3, [row for row, _ in neighbours[0]])
+        self.assertEqual(neighbours[3], [])
+
+
+class TestSimilarityIndex(unittest.TestCase):
+    """Test the precomputed neighbour index"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the index once"""
+        cls.index = SimilarityIndex.build(Path("objects"), k=5)
+
+    def setUp(self):
+        """Create a temporary output directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_similar_within_category(self):
+        """Test that neighbours come from the same category, best first"""
+        spells = load_category(Path("objects"), "spells")
+        neighbours = self.index.similar("spells", "affix")
+        self.assertTrue(neighbours)
+        self.assertLessEqual(len(neighbours), 5)
+        for stem, _ in neighbours:
+            self.assertIn(stem, spells)
+            self.assertNotEqual(stem, "affix")
+        scores = [score for _, score in neighbours]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_similar_weapons(self):
+        """Test that a sword's nearest item is another sword"""
+        self.assertEqual(
+            self.index.similar("items", "sword", limit=1)[0][0], "longsword"
+        )
+
+    def test_limit_zero(self):
+        """Test that limit=0 returns no neighbours rather than all of them"""
+        self.assertEqual(self.index.similar("items", "sword", limit=0), [])
+
+    def test_unknown_entity(self):
+        """Test that unknown stems have no neighbours"""
+        self.assertEqual(self.index.similar("spells", "no-such-spell"), [])
+        self.assertEqual(self.index.similar("tables", "affix"), [])
+
+    def test_arrays_are_flat(self):
+        """Test that each category stores k slots per entity"""
+        for category, stems in self.index.stems.items():
+            self.assertEqual(self.index.neighbours[category].typecode, "I")
+            self.assertEqual(len(self.index.neighbours[category]), len(stems) * 5)
+            self.assertEqual(len(self.index.scores[category]), len(stems) * 5)
+
+    def test_save_and_load_round_trip(self):
+        """Test that a loaded index returns the same neighbours"""
+        self.index.save(self.temp_dir)
+        loaded = SimilarityIndex.load(self.temp_dir)
+        self.assertEqual(loaded.k, 5)
+        for stem in ("affix", "animate"):
+            self.assertEqual(
+                loaded.similar("spells", stem), self.index.similar("spells", stem)
+            )
+
+    def test_load_swaps_foreign_byte_order(self):
+        """Test that buffers written on another platform are byte-swapped"""
+        self.index.save(self.temp_dir)
+        manifest_path = self.temp_dir / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest["byteorder"] = "big" if sys.byteorder == "little" else "little"
+        manifest_path.write_text(json.dumps(manifest))
+        for category in manifest["stems"]:
+            for suffix in ("neighbours", "scores"):
+                values = getattr(self.index, suffix)[category][:]
+                values.byteswap()
+                with open(self.temp_dir / f"{category}.{suffix}", "wb") as f:
+                    values.tofile(f)
+        loaded = SimilarityIndex.load(self.temp_dir)
+        self.assertEqual(
+            loaded.similar("enemies", "alzabo"), self.index.similar("enemies", "alzabo")
+        )
+
+    def test_load_rejects_unknown_format(self):
+        """Test that an unsupported format version raises ValueError"""
+        self.index.save(self.temp_dir)
+        (self.temp_dir / "manifest.json").write_text(json.dumps({"format": 99}))
+        with self.assertRaises(ValueError):
+            SimilarityIndex.load(self.temp_dir)
+
+    def test_unused_slots_are_marked(self):
+        """Test that entities with few neighbours pad with NO_NEIGHBOUR"""
+        index = SimilarityIndex(k=3)
+        vectors = tfidf_vectors([entity_terms("spells", {"description": "alone"})])
+        self.assertEqual(top_neighbours(vectors, 3), [[]])
+        index._add(
+            "spells",
+            ["alone"],
+            array("I", [NO_NEIGHBOUR] * 3),
+            array("f", [0.0] * 3),
+        )
+        self.assertEqual(index.similar("spells", "alone"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
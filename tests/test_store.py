@@ -0,0 +1,103 @@
+"""
+Unit tests for the thread-safe data store
+"""
+
+import json
+import threading
+import unittest
+from pathlib import Path
+
+from troika.data import CATEGORIES, load_category, name_index
+from troika.store import DataStore, freeze, thaw
+
+
+class TestFreeze(unittest.TestCase):
+    """Test deep freezing of JSON values"""
+
+    def test_frozen_values_are_immutable(self):
+        """Test that nested objects and arrays cannot be modified"""
+        frozen = freeze({"stats": {"skill": 7}, "tags": ["a", {"b": 1}]})
+        with self.assertRaises(TypeError):
+            frozen["stats"]["skill"] = 8
+        with self.assertRaises(TypeError):
+            frozen["tags"][1]["b"] = 2
+        self.assertIsInstance(frozen["tags"], tuple)
+
+    def test_thaw_round_trip(self):
+        """Test that thaw gives back the original JSON value"""
+        value = {"a": [1, {"b": [True, None]}], "c": "x"}
+        self.assertEqual(json.dumps(thaw(freeze(value))), json.dumps(value))
+
+
+class TestDataStore(unittest.TestCase):
+    """Test lazy, thread-safe category loading"""
+
+    def test_lookups_match_loaded_data(self):
+        """Test that get and find return the data on disk"""
+        store = DataStore(Path("objects"))
+        enemies = load_category(Path("objects"), "enemies")
+        self.assertEqual(thaw(store.get("enemies", "alzabo")), enemies["alzabo"])
+        name = enemies["alzabo"]["name"]
+        self.assertIs(
+            store.find("enemies", name.upper()), store.get("enemies", "alzabo")
+        )
+        self.assertIsNone(store.get("enemies", "missing"))
+        with self.assertRaises(KeyError):
+            store.category("vehicles")
+
+    def test_categories_load_lazily(self):
+        """Test that only requested categories are loaded"""
+        store = DataStore(Path("objects"))
+        store.get("spells", "affix")
+        self.assertEqual(store.loads, 1)
+        store.get("spells", "amity")
+        self.assertEqual(store.loads, 1)
+
+    def test_concurrent_first_access_loads_once(self):
+        """Test that racing threads load each category exactly once"""
+        store = DataStore(Path("objects"))
+        barrier = threading.Barrier(16)
+        seen = []
+
+        def reader(category):
+            barrier.wait()
+            seen.append(store.category(category))
+
+        threads = [
+            threading.Thread(target=reader, args=(("items", "enemies")[i % 2],))
+            for i in range(16)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(store.loads, 2)
+        self.assertEqual(len({id(category) for category in seen}), 2)
+
+    def test_parallel_loads_are_all_counted(self):
+        """Test that loads of different categories in parallel are all counted"""
+        store = DataStore(Path("objects"))
+        barrier = threading.Barrier(len(CATEGORIES))
+
+        def reader(category):
+            barrier.wait()
+            store.category(category)
+
+        threads = [threading.Thread(target=reader, args=(c,)) for c in CATEGORIES]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(store.loads, len(CATEGORIES))
+
+    def test_name_index_matches_plain_data(self):
+        """Test that frozen entities are indexed like plain ones"""
+        store = DataStore(Path("objects"))
+        self.assertEqual(
+            dict(store.category("spells").names),
+            name_index(load_category(Path("objects"), "spells")),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
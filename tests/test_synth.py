@@ -0,0 +1,166 @@
+"""
+Unit tests for schema-driven synthetic data
+"""
+
+import json
+import random
+import re
+import unittest
+
+from jsonschema import Draft7Validator
+
+from troika.synth import (
+    KINDS,
+    SchemaGenerator,
+    Vocabulary,
+    _pattern_string,
+    generate,
+    load_schema,
+)
+
+
+class TestPatterns(unittest.TestCase):
+    """Test strings built from regular expressions"""
+
+    def test_generated_strings_match(self):
+        """Test that generated strings match their pattern"""
+        rng = random.Random(1)
+        for pattern in (r"^d\d+$", r"^[A-Z][a-z]{2,5}-\d{3}$", r"^x?y*z+$"):
+            for _ in range(20):
+                self.assertRegex(_pattern_string(pattern, rng), pattern)
+
+    def test_unsupported_pattern(self):
+        """Test that groups and alternation are rejected"""
+        with self.assertRaises(ValueError):
+            _pattern_string(r"^(a|b)$", random.Random(1))
+
+
+class TestSchemaGenerator(unittest.TestCase):
+    """Test document generation against the real schemas"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Collect the vocabulary once"""
+        cls.vocabulary = Vocabulary.from_objects()
+
+    def test_every_kind_validates(self):
+        """Test that documents of every kind validate on the first try"""
+        for kind, category in KINDS.items():
+            with self.subTest(kind=kind):
+                schema = load_schema(kind)
+                generator = SchemaGenerator(schema, self.vocabulary, category=category)
+                validator = Draft7Validator(schema)
+                for seed in range(25):
+                    document = generator.generate(random.Random(seed))
+                    self.assertTrue(validator.is_valid(document))
+                self.assertEqual(generator.retries, 0)
+
+    def test_same_seed_same_document(self):
+        """Test that generation is deterministic for a seed"""
+        generator = SchemaGenerator(load_schema("enemy"), self.vocabulary)
+        self.assertEqual(
+            generator.generate(random.Random(3)), generator.generate(random.Random(3))
+        )
+
+    def test_values_come_from_real_data(self):
+        """Test that short strings are drawn from the vocabulary"""
+        generator = SchemaGenerator(
+            load_schema("spell"), self.vocabulary, category="spells"
+        )
+        names = set(self.vocabulary.strings["spells.name"])
+        for seed in range(10):
+            self.assertIn(generator.generate(random.Random(seed))["name"], names)
+
+    def test_schema_keywords(self):
+        """Test enums, consts, bounds, array sizes and oneOf branches"""
+        schema = {
+            "type": "object",
+            "properties": {
+                "kind": {"enum": ["a", "b"]},
+                "fixed": {"const": 7},
+                "level": {"type": "integer", "minimum": 3, "maximum": 5},
+                "code": {"type": "string", "pattern": "^d\\d+$"},
+                "list": {"type": "array", "items": {"type": "boolean"}, "minItems": 2},
+                "either": {"oneOf": [{"type": "integer"}, {"type": "string"}]},
+                "ref": {"$ref": "#/definitions/leaf"},
+            },
+            "required": ["kind", "fixed", "level", "code", "list", "either", "ref"],
+            "definitions": {
+                "leaf": {"type": "object", "properties": {"x": {"type": "number"}}}
+            },
+        }
+        generator = SchemaGenerator(schema)
+        for seed in range(20):
+            document = generator.generate(random.Random(seed))
+            self.assertIn(document["kind"], ("a", "b"))
+            self.assertEqual(document["fixed"], 7)
+            self.assertTrue(3 <= document["level"] <= 5)
+            self.assertRegex(document["code"], r"^d\d+$")
+            self.assertGreaterEqual(len(document["list"]), 2)
+            self.assertIsInstance(document["ref"], dict)
+
+    def test_recursion_stops(self):
+        """Test that recursive definitions end at the depth limit"""
+        schema = {
+            "type": "object",
+            "properties": {
+                "children": {"type": "array", "items": {"$ref": "#"}},
+            },
+        }
+        generator = SchemaGenerator(schema, optional_rate=1.0, max_depth=4)
+        document = generator.generate(random.Random(1))
+        self.assertLess(json.dumps(document).count("children"), 200)
+
+    def test_unresolvable_optional_ref_is_omitted(self):
+        """Test that an optional property with a dangling $ref is left out"""
+        schema = {
+            "type": "object",
+            "properties": {
+                "single": {"$ref": "#/definitions/missing"},
+                "many": {"type": "array", "items": {"$ref": "#/definitions/missing"}},
+            },
+        }
+        generator = SchemaGenerator(schema, optional_rate=1.0)
+        document = generator.generate(random.Random(1))
+        self.assertNotIn("single", document)
+        self.assertEqual(document.get("many", []), [])
+
+
+class TestGenerate(unittest.TestCase):
+    """Test the streaming, multi-process front end"""
+
+    def test_counts_and_order(self):
+        """Test that each kind gets `count` documents in order"""
+        documents = list(generate(["spell", "item"], 5, seed=2))
+        self.assertEqual(
+            [(kind, index) for kind, index, _ in documents],
+            [("spell", i) for i in range(5)] + [("item", i) for i in range(5)],
+        )
+        for _, _, text in documents:
+            self.assertIsInstance(json.loads(text), dict)
+
+    def test_workers_match_serial_output(self):
+        """Test that worker processes produce the same documents"""
+        serial = list(generate(["enemy"], 20, seed=4))
+        parallel = list(generate(["enemy"], 20, seed=4, workers=2, batch_size=4))
+        self.assertEqual(serial, parallel)
+
+    def test_seed_changes_output(self):
+        """Test that different seeds give different documents"""
+        first = [text for _, _, text in generate(["skill"], 5, seed=1)]
+        second = [text for _, _, text in generate(["skill"], 5, seed=2)]
+        self.assertNotEqual(first, second)
+
+    def test_unknown_kind(self):
+        """Test that unknown kinds raise ValueError"""
+        with self.assertRaises(ValueError):
+            generate(["dragon"], 1)
+
+    def test_ndjson_lines(self):
+        """Test that serialized documents fit on one line"""
+        for _, _, text in generate(["background"], 10):
+            self.assertIsNone(re.search(r"\n", text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Unit tests for the file watchers
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from troika.watch import InotifyWatcher, PollingWatcher, create_watcher
+
+
+class WatcherTests:
+    """Behaviour shared by every watcher implementation"""
+
+    def make_watcher(self, root):
+        """Create the watcher under test"""
+        raise NotImplementedError
+
+    def setUp(self):
+        """Create a directory tree to watch"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "items").mkdir()
+        self.existing = self.root / "items" / "lantern.json"
+        self.existing.write_text("{}", encoding="utf-8")
+        self.watcher = self.make_watcher(self.root)
+
+    def tearDown(self):
+        """Stop watching and remove the tree"""
+        self.watcher.close()
+        self.tmp.cleanup()
+
+    def wait_for(self, expected, timeout=5.0):
+        """Collect changes until the expected paths were all reported"""
+        seen = set()
+        deadline = time.monotonic() + timeout
+        while not expected <= seen and time.monotonic() < deadline:
+            seen |= self.watcher.wait(timeout=0.2)
+        return seen
+
+    def test_modified_file_is_reported(self):
+        """Test that writing a file reports it"""
+        time.sleep(0.01)
+        self.existing.write_text('{"name": "Lantern"}', encoding="utf-8")
+        self.assertIn(self.existing, self.wait_for({self.existing}))
+
+    def test_created_renamed_and_deleted_files_are_reported(self):
+        """Test that atomic saves and deletions are reported"""
+        tmp = self.root / "items" / ".rope.json.tmp"
+        tmp.write_text("{}", encoding="utf-8")
+        target = self.root / "items" / "rope.json"
+        os.replace(tmp, target)
+        self.existing.unlink()
+        seen = self.wait_for({target, self.existing})
+        self.assertIn(target, seen)
+        self.assertIn(self.existing, seen)
+
+    def test_files_in_new_directories_are_reported(self):
+        """Test that new subdirectories are watched too"""
+        new_dir = self.root / "spells"
+        new_dir.mkdir()
+        first = new_dir / "a.json"
+        first.write_text("{}", encoding="utf-8")
+        self.wait_for({first})
+        second = new_dir / "b.json"
+        second.write_text("{}", encoding="utf-8")
+        self.assertIn(second, self.wait_for({second}))
+
+    def test_removed_directories_are_reported(self):
+        """Test that deleting or moving away a directory covers its files"""
+        (self.root / "spells").mkdir()
+        spell = self.root / "spells" / "affix.json"
+        spell.write_text("{}", encoding="utf-8")
+        self.wait_for({spell})
+        shutil.rmtree(self.root / "items")
+        os.rename(self.root / "spells", Path(self.tmp.name + "-moved"))
+        try:
+            deadline = time.monotonic() + 5.0
+            seen = set()
+            while time.monotonic() < deadline and not all(
+                path in seen or path.parent in seen for path in (self.existing, spell)
+            ):
+                seen |= self.watcher.wait(timeout=0.2)
+            for path in (self.existing, spell):
+                self.assertTrue(path in seen or path.parent in seen)
+        finally:
+            shutil.rmtree(self.tmp.name + "-moved")
+
+    def test_timeout_without_changes(self):
+        """Test that wait returns nothing when nothing changed"""
+        self.assertEqual(self.watcher.wait(timeout=0.05), set())
+
+
+class TestPollingWatcher(WatcherTests, unittest.TestCase):
+    """Test the polling watcher"""
+
+    def make_watcher(self, root):
+        """Poll quickly"""
+        return PollingWatcher([root], interval=0.01)
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+class TestInotifyWatcher(WatcherTests, unittest.TestCase):
+    """Test the inotify watcher"""
+
+    def make_watcher(self, root):
+        """Watch with inotify"""
+        return InotifyWatcher([root])
+
+
+class TestCreateWatcher(unittest.TestCase):
+    """Test watcher selection"""
+
+    def test_poll_forces_polling(self):
+        """Test that poll=True always gives a polling watcher"""
+        with tempfile.TemporaryDirectory() as tmp:
+            watcher = create_watcher([Path(tmp)], poll=True)
+            self.assertIsInstance(watcher, PollingWatcher)
+            watcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,6 @@
+"""
+Troika! System JSON tooling
+
+Helpers for loading, querying and simulating the Troika! game data stored in
+the objects/ directory.
+"""
@@ -0,0 +1,211 @@
+"""
+Character advancement simulator.
+
+Projects skill growth for many characters over many sessions at once. Each
+session, every known Advanced Skill may earn a tick; up to three ticked skills
+are checked, and a check succeeds when 2d6 rolls over the skill's current
+total (Skill + Rank), raising the Rank by one. Skills being trained with a
+teacher (character.schema.json `experience.training`) are checked every
+session until the student's total reaches the teacher's.
+
+All characters are advanced together with NumPy arrays of shape
+(characters, skills). Requires the `analytics` extra (numpy).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Ticked skills checked per advancement (experience.skillsToCheck maxItems).
+MAX_CHECKS = 3
+
+
+@dataclass
+class Cohort:
+    """Starting state for a batch of characters."""
+
+    skill: np.ndarray  # (characters,) Skill attribute
+    ranks: np.ndarray  # (characters, skills) Rank, 0 when the skill is unknown
+    skill_names: Tuple[str, ...]
+    teacher_totals: Optional[np.ndarray] = None  # (characters, skills), 0 = none
+
+    def __post_init__(self):
+        """Validate array shapes."""
+        if self.ranks.shape != (len(self.skill), len(self.skill_names)):
+            raise ValueError("ranks must have shape (characters, skills)")
+        if self.teacher_totals is None:
+            self.teacher_totals = np.zeros_like(self.ranks)
+
+
+@dataclass
+class AdvancementResult:
+    """Rank distributions recorded after every session."""
+
+    skill_names: Tuple[str, ...]
+    final_ranks: np.ndarray  # (characters, skills)
+    histogram: np.ndarray  # (sessions + 1, skills, max rank + 1) character counts
+    mean_ranks: np.ndarray  # (sessions + 1, skills), over characters knowing the skill
+
+    def distribution(self, skill: str, session: int = -1) -> Dict[int, int]:
+        """Number of characters at each rank of a skill after a session."""
+        column = self.skill_names.index(skill)
+        counts = self.histogram[session, column]
+        return {rank: int(count) for rank, count in enumerate(counts) if count}
+
+    def percentiles(
+        self, skill: str, quantiles: Sequence[float] = (10, 50, 90)
+    ) -> np.ndarray:
+        """Rank percentiles per session (shape: sessions + 1, len(quantiles))."""
+        column = self.skill_names.index(skill)
+        counts = self.histogram[:, column, :]
+        cumulative = np.cumsum(counts, axis=1)
+        totals = cumulative[:, -1:]
+        totals = np.where(totals == 0, 1, totals)
+        fractions = cumulative / totals
+        return np.stack(
+            [np.argmax(fractions >= q / 100.0, axis=1) for q in quantiles], axis=1
+        )
+
+
+def cohort_from_characters(
+    characters: Iterable[Dict[str, Any]], skill_names: Optional[Sequence[str]] = None
+) -> Cohort:
+    """
+    Build a cohort from character documents.
+
+    Args:
+        characters: Character documents (troika-character)
+        skill_names: Columns to track; defaults to every skill seen
+
+    Returns:
+        Cohort with ranks and teacher totals taken from the documents
+    """
+    characters = list(characters)
+    if skill_names is None:
+        seen: Dict[str, None] = {}
+        for character in characters:
+            for skill in character.get("advancedSkills", []):
+                seen.setdefault(skill["name"], None)
+            for entry in character.get("experience", {}).get("training", []):
+                seen.setdefault(entry["skill"], None)
+        skill_names = list(seen)
+    columns = {name: i for i, name in enumerate(skill_names)}
+
+    skill = np.zeros(len(characters), dtype=np.int16)
+    ranks = np.zeros((len(characters), len(columns)), dtype=np.int16)
+    teachers = np.zeros_like(ranks)
+    for row, character in enumerate(characters):
+        skill[row] = character.get("attributes", {}).get("skill", 0)
+        for entry in character.get("advancedSkills", []):
+            column = columns.get(entry["name"])
+            if column is not None:
+                ranks[row, column] = entry.get("rank", 0)
+        for entry in character.get("experience", {}).get("training", []):
+            column = columns.get(entry["skill"])
+            if column is not None:
+                teachers[row, column] = entry.get("teacherSkillTotal", 0)
+    return Cohort(skill, ranks, tuple(skill_names), teachers)
+
+
+def _histogram(ranks: np.ndarray, width: int) -> np.ndarray:
+    """Count characters at each rank, per skill (shape: skills, width)."""
+    skills = ranks.shape[1]
+    offsets = (
+        ranks.astype(np.int64) + np.arange(skills, dtype=np.int64)[None, :] * width
+    )
+    counts = np.bincount(offsets.ravel(), minlength=skills * width)
+    return counts.reshape(skills, width)
+
+
+def _mean_known(ranks: np.ndarray) -> np.ndarray:
+    """Mean rank per skill among characters who know it."""
+    known = ranks > 0
+    totals = ranks.sum(axis=0, dtype=np.float64)
+    counts = known.sum(axis=0)
+    return np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+
+
+def simulate(
+    cohort: Cohort,
+    sessions: int,
+    tick_probability: Union[float, Sequence[float]] = 0.5,
+    max_checks: int = MAX_CHECKS,
+    seed: Optional[int] = None,
+) -> AdvancementResult:
+    """
+    Advance a cohort over a number of sessions.
+
+    Args:
+        cohort: Starting state
+        sessions: Number of sessions to simulate
+        tick_probability: Chance a known skill earns a tick in a session,
+            either one value or one per skill column
+        max_checks: Ticked skills checked per session
+        seed: Seed for the random generator
+
+    Returns:
+        AdvancementResult with final ranks and per-session distributions
+    """
+    rng = np.random.default_rng(seed)
+    ranks = cohort.ranks.astype(np.int16, copy=True)
+    characters, skills = ranks.shape
+    skill = cohort.skill.astype(np.int16)[:, None]
+    teachers = cohort.teacher_totals.astype(np.int16)
+    probability = np.broadcast_to(
+        np.asarray(tick_probability, dtype=np.float64), (skills,)
+    )
+
+    # A rank can rise at most once per session, so this bounds the histogram.
+    width = int(ranks.max(initial=0)) + sessions + 1
+    histogram = np.zeros((sessions + 1, skills, width), dtype=np.int64)
+    mean_ranks = np.zeros((sessions + 1, skills), dtype=np.float64)
+    histogram[0] = _histogram(ranks, width)
+    mean_ranks[0] = _mean_known(ranks)
+
+    for session in range(1, sessions + 1):
+        known = ranks > 0
+        ticked = known & (rng.random((characters, skills)) < probability)
+
+        if skills > max_checks:
+            # Keep at most max_checks ticked skills per character, chosen at random.
+            keys = np.where(ticked, rng.random((characters, skills)), -1.0)
+            chosen = np.argpartition(-keys, max_checks - 1, axis=1)[:, :max_checks]
+            checked = np.zeros_like(ticked)
+            np.put_along_axis(checked, chosen, True, axis=1)
+            checked &= ticked
+        else:
+            checked = ticked
+
+        training = (teachers > 0) & (skill + ranks < teachers)
+        checked |= training
+
+        rolls = rng.integers(1, 7, size=(characters, skills), dtype=np.int16)
+        rolls += rng.integers(1, 7, size=(characters, skills), dtype=np.int16)
+        advanced = checked & (rolls > skill + ranks)
+        # Training a new skill grants Rank 1 on a successful check.
+        ranks += advanced
+
+        histogram[session] = _histogram(ranks, width)
+        mean_ranks[session] = _mean_known(ranks)
+
+    used = int(ranks.max(initial=0)) + 1
+    return AdvancementResult(
+        cohort.skill_names, ranks, histogram[:, :, :used], mean_ranks
+    )
+
+
+def summarize(result: AdvancementResult, every: int = 10) -> List[Dict[str, Any]]:
+    """Mean rank per skill every `every` sessions, for printing or JSON export."""
+    rows = []
+    for session in range(0, result.mean_ranks.shape[0], every):
+        rows.append(
+            {
+                "session": session,
+                "meanRanks": {
+                    name: round(float(result.mean_ranks[session, i]), 3)
+                    for i, name in enumerate(result.skill_names)
+                },
+            }
+        )
+    return rows
@@ -0,0 +1,78 @@
+"""
+Read JSON members straight out of data pack archives.
+
+Supports .zip, .tar, .tar.gz/.tgz and .tar.zst/.tzst. Tar archives are read
+as a stream (members in archive order, nothing extracted to disk), so only
+one member is held in memory at a time. Zstandard needs the `archives` extra
+(zstandard).
+"""
+
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import Iterator, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional (the `archives` extra)
+    zstandard = None
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.zst", ".tzst")
+
+
+def is_archive(path: Path) -> bool:
+    """Check whether a path names a supported archive."""
+    return Path(path).name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _is_json_member(name: str) -> bool:
+    """Skip non-JSON files and macOS resource forks."""
+    base = name.rsplit("/", 1)[-1]
+    return (
+        name.lower().endswith(".json")
+        and not base.startswith("._")
+        and not name.startswith("__MACOSX/")
+    )
+
+
+def _iter_tar(archive: tarfile.TarFile) -> Iterator[Tuple[str, bytes]]:
+    """Yield the JSON members of a tar stream."""
+    for member in archive:
+        if member.isfile() and _is_json_member(member.name):
+            with archive.extractfile(member) as f:
+                yield member.name, f.read()
+
+
+def iter_json_members(path: Path) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (member name, raw bytes) for every JSON file in an archive.
+
+    Raises:
+        ValueError: If the archive type is not supported
+        RuntimeError: If a .tar.zst archive is given without zstandard
+    """
+    path = Path(path)
+    name = path.name.lower()
+    if name.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _is_json_member(info.filename):
+                    yield info.filename, archive.read(info)
+    elif name.endswith((".tar.zst", ".tzst")):
+        if zstandard is None:
+            raise RuntimeError(
+                "Reading .tar.zst archives requires zstandard "
+                "(uv sync --extra archives)"
+            )
+        with open(path, "rb") as raw:
+            with zstandard.ZstdDecompressor().stream_reader(raw) as stream:
+                with tarfile.open(fileobj=stream, mode="r|") as archive:
+                    yield from _iter_tar(archive)
+    elif name.endswith((".tar.gz", ".tgz")):
+        with tarfile.open(path, mode="r|gz") as archive:
+            yield from _iter_tar(archive)
+    elif name.endswith(".tar"):
+        with tarfile.open(path, mode="r|") as archive:
+            yield from _iter_tar(archive)
+    else:
+        raise ValueError(f"Unsupported archive type: {path}")
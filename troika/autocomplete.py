@@ -0,0 +1,267 @@
+"""
+Prefix autocomplete for entity names.
+
+Each category keeps a sorted array of normalized keys (names and aliases,
+folded with troika.search.normalize_name). A prefix query is two binary
+searches giving the range of keys that start with it. The top k entries in
+that range are picked by a precomputed rank: popularity first, then name.
+Results follow the requested category order, e.g. skills before spells
+while the user fills in advancedSkills.
+
+Aliases come from skill `alternatives` (alternative names) and item
+`alternatives` (the description of each alternative version).
+Popularity is the number of backgrounds whose advancedSkills, spells or
+possessions list the entity by name.
+
+    completer = build_autocomplete(Path("objects"))
+    completer.complete("sw", categories=["skills", "items"])
+
+Short prefixes match large ranges, so their results are memoized; longer
+prefixes match few keys and are cheap to rank directly.
+"""
+
+import argparse
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .data import load_category
+from .search import SEARCH_CATEGORIES, normalize_name
+
+# Prefixes up to this length have their results memoized
+MEMO_PREFIX_LENGTH = 2
+
+# Background fields that reference entities by name, and their category
+_REFERENCE_FIELDS = {
+    "advancedSkills": "skills",
+    "spells": "spells",
+    "possessions": "items",
+}
+
+
+@dataclass(frozen=True)
+class Completion:
+    """One autocomplete suggestion."""
+
+    category: str
+    stem: str
+    name: str
+    matched: str  # the name or alias the prefix matched
+    popularity: int
+
+
+class _CategoryIndex:
+    """Sorted keys of one category with their entries and ranks."""
+
+    def __init__(self, rows: List[Tuple[str, str, int]], ranks: Dict[int, int]):
+        """Build from (key, matched text, entry id) rows."""
+        rows.sort()
+        self.keys = [key for key, _, _ in rows]
+        self.matched = [text for _, text, _ in rows]
+        self.entries = array("l", (entry_id for _, _, entry_id in rows))
+        self.ranks = array("l", (ranks[entry_id] for _, _, entry_id in rows))
+        self._memo: Dict[Tuple[str, int], List[Tuple[int, int]]] = {}
+
+    def top(self, prefix: str, limit: int) -> List[Tuple[int, int]]:
+        """Return up to `limit` (rank, position) pairs for a prefix, best first."""
+        memo_key = (prefix, limit)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+        lo = bisect_left(self.keys, prefix)
+        # Every key starting with prefix sorts below prefix + U+10FFFF
+        hi = bisect_left(self.keys, prefix + "\U0010ffff", lo)
+        best: List[Tuple[int, int]] = []
+        seen = set()
+        # Aliases can repeat an entry, so take extra candidates and dedupe
+        for rank, position in heapq.nsmallest(
+            limit * 2, zip(self.ranks[lo:hi], range(lo, hi))
+        ):
+            if self.entries[position] not in seen:
+                seen.add(self.entries[position])
+                best.append((rank, position))
+                if len(best) == limit:
+                    break
+        if len(best) < limit and hi - lo > limit * 2:
+            best = self._top_slow(lo, hi, limit)
+        if len(prefix) <= MEMO_PREFIX_LENGTH:
+            self._memo[memo_key] = best
+        return best
+
+    def _top_slow(self, lo: int, hi: int, limit: int) -> List[Tuple[int, int]]:
+        """Rank a whole range when aliases crowded out distinct entries."""
+        best: Dict[int, Tuple[int, int]] = {}
+        for position in range(lo, hi):
+            entry_id = self.entries[position]
+            candidate = (self.ranks[position], position)
+            if entry_id not in best or candidate < best[entry_id]:
+                best[entry_id] = candidate
+        return heapq.nsmallest(limit, best.values())
+
+
+class Autocomplete:
+    """Prefix index over entity names and aliases."""
+
+    def __init__(self):
+        """Create an empty index; add entries, then query."""
+        self._entries: List[Tuple[str, str, str, int]] = []
+        self._aliases: List[Tuple[str, ...]] = []
+        self._indexes: Optional[Dict[str, _CategoryIndex]] = None
+
+    def add(
+        self,
+        category: str,
+        stem: str,
+        name: str,
+        aliases: Iterable[str] = (),
+        popularity: int = 0,
+    ) -> None:
+        """Add an entity; the index is rebuilt on the next query."""
+        self._entries.append((category, stem, name, popularity))
+        self._aliases.append(tuple(aliases))
+        self._indexes = None
+
+    def __len__(self) -> int:
+        """Number of indexed entities."""
+        return len(self._entries)
+
+    def _build(self) -> Dict[str, _CategoryIndex]:
+        """Sort the keys of every category."""
+        order = sorted(
+            range(len(self._entries)),
+            key=lambda i: (-self._entries[i][3], normalize_name(self._entries[i][2])),
+        )
+        ranks = {entry_id: rank for rank, entry_id in enumerate(order)}
+        rows: Dict[str, List[Tuple[str, str, int]]] = {}
+        for entry_id, (category, _, name, _) in enumerate(self._entries):
+            texts = dict.fromkeys((name,) + self._aliases[entry_id])
+            for text in texts:
+                key = normalize_name(text)
+                if key:
+                    rows.setdefault(category, []).append((key, text, entry_id))
+        return {
+            category: _CategoryIndex(category_rows, ranks)
+            for category, category_rows in rows.items()
+        }
+
+    def complete(
+        self,
+        prefix: str,
+        categories: Optional[Sequence[str]] = None,
+        limit: int = 10,
+    ) -> List[Completion]:
+        """
+        Return completions for a typed prefix.
+
+        Args:
+            prefix: Text typed so far
+            categories: Categories to search, in order of preference
+                (default: every indexed category, in SEARCH_CATEGORIES order)
+            limit: Maximum number of completions
+        """
+        if self._indexes is None:
+            self._indexes = self._build()
+        key = normalize_name(prefix)
+        # Keep a trailing space so "language " only matches further words
+        if prefix[-1:].isspace() and key:
+            key += " "
+        if categories is None:
+            categories = [c for c in SEARCH_CATEGORIES if c in self._indexes]
+            categories += sorted(set(self._indexes) - set(categories))
+        results: List[Completion] = []
+        for category in categories:
+            index = self._indexes.get(category)
+            if index is None:
+                continue
+            for _, position in index.top(key, limit - len(results)):
+                _, stem, name, popularity = self._entries[index.entries[position]]
+                results.append(
+                    Completion(
+                        category, stem, name, index.matched[position], popularity
+                    )
+                )
+            if len(results) >= limit:
+                break
+        return results
+
+
+def reference_counts(objects_dir: Path = Path("objects")) -> Counter:
+    """Count how many backgrounds reference each (category, normalized name)."""
+    counts: Counter = Counter()
+    for background in load_category(objects_dir, "backgrounds").values():
+        for field, category in _REFERENCE_FIELDS.items():
+            names = {
+                normalize_name(entry["name"])
+                for entry in background.get(field, [])
+                if isinstance(entry, dict) and isinstance(entry.get("name"), str)
+            }
+            counts.update((category, name) for name in names)
+    return counts
+
+
+def _aliases(category: str, entity: Dict) -> List[str]:
+    """Return the alias texts of an entity."""
+    aliases = []
+    for alternative in entity.get("alternatives", []):
+        if category == "skills" and isinstance(alternative, str):
+            aliases.append(alternative)
+        elif isinstance(alternative, dict) and isinstance(
+            alternative.get("description"), str
+        ):
+            aliases.append(alternative["description"])
+    return aliases
+
+
+def build_autocomplete(
+    objects_dir: Path = Path("objects"), categories: Iterable[str] = SEARCH_CATEGORIES
+) -> Autocomplete:
+    """Index every entity name and alias in the given categories."""
+    counts = reference_counts(objects_dir)
+    completer = Autocomplete()
+    for category in categories:
+        for stem, entity in sorted(load_category(objects_dir, category).items()):
+            name = entity.get("name")
+            if not isinstance(name, str):
+                continue
+            completer.add(
+                category,
+                stem,
+                name,
+                _aliases(category, entity),
+                counts[(category, normalize_name(name))],
+            )
+    return completer
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Autocomplete entity names")
+    parser.add_argument("prefix", help="Text typed so far")
+    parser.add_argument(
+        "--category",
+        action="append",
+        choices=SEARCH_CATEGORIES,
+        help="Category to search (repeat to set the order)",
+    )
+    parser.add_argument("--limit", type=int, default=10, help="Maximum results")
+    parser.add_argument("--objects", default="objects", help="Objects directory")
+    args = parser.parse_args()
+
+    completer = build_autocomplete(Path(args.objects))
+    for completion in completer.complete(args.prefix, args.category, args.limit):
+        alias = (
+            f" (as {completion.matched})"
+            if completion.matched != completion.name
+            else ""
+        )
+        print(
+            f"{completion.category}/{completion.stem}  {completion.name}{alias}"
+            f"  [{completion.popularity}]"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Static site build for the Troika! data.
+
+Resolves every $ref in objects/troika-system-data.json and writes:
+
+    <category>.<hash>.json       one minified bundle per category
+    troika-system-data.<hash>.json   the full aggregate with refs inlined
+    *.gz / *.br                  precompressed variants (brotli if installed)
+    manifest.json                logical name -> hashed files, sizes, input hash
+
+Each bundle records a fingerprint of its input files in the manifest, and a
+bundle is only rebuilt when that fingerprint changes or its outputs are gone.
+Files from the previous build that the new manifest does not list are removed.
+
+Usage:
+    python -m troika.build [--objects objects] [--out dist/site] [--force]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional (the `site` extra)
+    brotli = None
+
+AGGREGATE_FILE = "troika-system-data.json"
+FULL_BUNDLE = "troika-system-data"
+MANIFEST_FILE = "manifest.json"
+HASH_LENGTH = 12
+
+
+def minify(data: Any) -> bytes:
+    """Serialize JSON without insignificant whitespace."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _ref_path(objects_dir: Path, value: Any) -> Optional[Path]:
+    """Return the file a {"$ref": "./x.json"} object points to, if any."""
+    if isinstance(value, dict) and len(value) == 1 and "$ref" in value:
+        ref = value["$ref"]
+        if isinstance(ref, str) and not ref.startswith("#"):
+            return objects_dir / ref
+    return None
+
+
+def plan_bundles(
+    objects_dir: Path,
+) -> Tuple[Dict[str, Any], Dict[str, List[Path]], List[str]]:
+    """
+    Read the aggregate file and list the input files of every bundle.
+
+    Returns:
+        Tuple of (aggregate document, {bundle: input paths}, missing refs)
+    """
+    with open(objects_dir / AGGREGATE_FILE, "r", encoding="utf-8") as f:
+        aggregate = json.load(f)
+
+    inputs: Dict[str, List[Path]] = {}
+    missing: List[str] = []
+    for key, value in aggregate.items():
+        if not isinstance(value, list):
+            continue
+        paths = [_ref_path(objects_dir, entry) for entry in value]
+        if not any(paths):
+            continue
+        inputs[key] = []
+        for entry, path in zip(value, paths):
+            if path is None:
+                continue
+            if path.exists():
+                inputs[key].append(path)
+            else:
+                missing.append(entry["$ref"])
+    inputs[FULL_BUNDLE] = [objects_dir / AGGREGATE_FILE] + [
+        path for key in list(inputs) for path in inputs[key]
+    ]
+    return aggregate, inputs, missing
+
+
+def fingerprint(paths: List[Path]) -> str:
+    """Hash the names and contents of a bundle's input files."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def _resolve_list(
+    objects_dir: Path, values: List[Any], cache: Dict[Path, Any]
+) -> List[Any]:
+    """Inline the $ref entries of a list, loading each file once and dropping missing refs."""
+    resolved = []
+    for value in values:
+        path = _ref_path(objects_dir, value)
+        if path is None:
+            resolved.append(value)
+            continue
+        if path not in cache:
+            if not path.exists():
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                cache[path] = json.load(f)
+        resolved.append(cache[path])
+    return resolved
+
+
+def _write_variants(out_dir: Path, name: str, body: bytes) -> Dict[str, Any]:
+    """Write a bundle and its compressed variants under a content-hashed name."""
+    digest = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+    filename = f"{name}.{digest}.json"
+    (out_dir / filename).write_bytes(body)
+    entry: Dict[str, Any] = {"file": filename, "size": len(body), "hash": digest}
+
+    compressed = gzip.compress(body, compresslevel=9, mtime=0)
+    (out_dir / f"{filename}.gz").write_bytes(compressed)
+    entry["gzip"] = {"file": f"{filename}.gz", "size": len(compressed)}
+    if brotli is not None:
+        compressed = brotli.compress(body, quality=11)
+        (out_dir / f"{filename}.br").write_bytes(compressed)
+        entry["brotli"] = {"file": f"{filename}.br", "size": len(compressed)}
+    return entry
+
+
+def _output_files(entry: Dict[str, Any]) -> List[str]:
+    """List every file written for a manifest entry."""
+    files = [entry["file"]]
+    for variant in ("gzip", "brotli"):
+        if variant in entry:
+            files.append(entry[variant]["file"])
+    return files
+
+
+def _is_current(old: Optional[Dict[str, Any]], inputs_hash: str, out_dir: Path) -> bool:
+    """Check whether a previous build of a bundle can be kept."""
+    if old is None or old.get("inputs") != inputs_hash:
+        return False
+    if ("brotli" in old) != (brotli is not None):
+        return False
+    return all((out_dir / f).exists() for f in _output_files(old))
+
+
+def load_manifest(out_dir: Path) -> Dict[str, Any]:
+    """Load the manifest of a previous build, or an empty one."""
+    path = out_dir / MANIFEST_FILE
+    if not path.exists():
+        return {"bundles": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build(objects_dir: Path, out_dir: Path, force: bool = False) -> Dict[str, Any]:
+    """
+    Build the bundles, skipping those whose inputs have not changed.
+
+    Args:
+        objects_dir: Directory containing troika-system-data.json
+        out_dir: Output directory
+        force: Rebuild every bundle
+
+    Returns:
+        Dict with the new manifest and the names of the rebuilt bundles
+
+    Refs to files that do not exist are left out of the bundles and listed
+    under "missingRefs" in the manifest.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    aggregate, inputs, missing = plan_bundles(objects_dir)
+    previous = load_manifest(out_dir)["bundles"]
+    bundles: Dict[str, Any] = {}
+    rebuilt: List[str] = []
+    cache: Dict[Path, Any] = {}
+
+    for name, paths in inputs.items():
+        inputs_hash = fingerprint(paths)
+        old = previous.get(name)
+        if not force and _is_current(old, inputs_hash, out_dir):
+            bundles[name] = old
+            continue
+
+        if name == FULL_BUNDLE:
+            data = {
+                key: (
+                    _resolve_list(objects_dir, value, cache) if key in inputs else value
+                )
+                for key, value in aggregate.items()
+            }
+        else:
+            data = _resolve_list(objects_dir, aggregate[name], cache)
+
+        entry = _write_variants(out_dir, name, minify(data))
+        entry["inputs"] = inputs_hash
+        bundles[name] = entry
+        rebuilt.append(name)
+
+    manifest = {"bundles": bundles, "missingRefs": missing}
+    with open(out_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Remove outputs of the previous build that the new manifest no longer
+    # lists: old hashes of rebuilt bundles and bundles that no longer exist
+    current = {f for entry in bundles.values() for f in _output_files(entry)}
+    for entry in previous.values():
+        for stale in set(_output_files(entry)) - current:
+            (out_dir / stale).unlink(missing_ok=True)
+    return {"manifest": manifest, "rebuilt": rebuilt}
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Build bundled, minified and precompressed Troika! data files"
+    )
+    parser.add_argument("--objects", default="objects", help="Objects directory")
+    parser.add_argument(
+        "--out", default="dist/site", help="Output directory (default: dist/site)"
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild every bundle")
+    args = parser.parse_args()
+
+    result = build(Path(args.objects), Path(args.out), force=args.force)
+    for name, entry in result["manifest"]["bundles"].items():
+        status = "built" if name in result["rebuilt"] else "unchanged"
+        sizes = f"{entry['size']} B"
+        if "gzip" in entry:
+            sizes += f", gzip {entry['gzip']['size']} B"
+        if "brotli" in entry:
+            sizes += f", brotli {entry['brotli']['size']} B"
+        print(f"{status:9} {entry['file']} ({sizes})")
+    for ref in result["manifest"]["missingRefs"]:
+        print(f"warning: {AGGREGATE_FILE} references missing file {ref}")
+    if brotli is None:
+        print("brotli not installed: skipped .br variants")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Columnar NumPy export of the numeric game statistics.
+
+Numeric fields are gathered into one structured array per category, with
+names and tags replaced by ids into a shared string dictionary. Every array is
+written as a .npy file so it can be opened with np.load(..., mmap_mode="r")
+and read zero-copy:
+
+    enemies.npy             name, skill, stamina, initiative, armour, tag range
+    items.npy               name, value, slots, encumbrance, tag range
+    spells.npy              name, cost, tag range
+    backgrounds.npy         name, id, skill range
+    background_skills.npy   background row, skill name, rank
+    <category>_tags.npy     string ids referenced by the tag ranges
+    strings.npy             UTF-8 bytes of every string, back to back
+    string_offsets.npy      start offset of each string (plus a final end)
+    manifest.json           row counts and format version
+
+Missing numbers are stored as -1. Requires the `analytics` extra (numpy).
+
+Usage:
+    python -m troika.columnar [--objects objects] [--out dist/columnar]
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .data import load_category, parse_silver
+
+FORMAT_VERSION = 1
+MISSING = -1
+
+ENEMY_DTYPE = np.dtype(
+    [
+        ("name", np.int32),
+        ("skill", np.int16),
+        ("stamina", np.int16),
+        ("initiative", np.int16),
+        ("armour", np.int16),
+        ("tag_start", np.int32),
+        ("tag_count", np.int16),
+    ]
+)
+ITEM_DTYPE = np.dtype(
+    [
+        ("name", np.int32),
+        ("value", np.int32),
+        ("slots", np.int16),
+        ("encumbrance", np.int16),
+        ("tag_start", np.int32),
+        ("tag_count", np.int16),
+    ]
+)
+SPELL_DTYPE = np.dtype(
+    [
+        ("name", np.int32),
+        ("cost", np.int16),
+        ("tag_start", np.int32),
+        ("tag_count", np.int16),
+    ]
+)
+BACKGROUND_DTYPE = np.dtype(
+    [
+        ("name", np.int32),
+        ("id", np.int16),
+        ("skill_start", np.int32),
+        ("skill_count", np.int16),
+    ]
+)
+BACKGROUND_SKILL_DTYPE = np.dtype(
+    [("background", np.int32), ("skill", np.int32), ("rank", np.int16)]
+)
+
+
+class StringTable:
+    """Interned strings, stored as one UTF-8 blob plus offsets."""
+
+    def __init__(self, blob: Optional[np.ndarray] = None, offsets=None):
+        """Wrap an existing blob/offsets pair, or start an empty table."""
+        self._ids: Dict[str, int] = {}
+        self._pending: List[str] = []
+        self.blob = blob
+        self.offsets = offsets
+
+    def intern(self, text: str) -> int:
+        """Return the id of a string, adding it if needed."""
+        string_id = self._ids.get(text)
+        if string_id is None:
+            string_id = len(self._pending)
+            self._ids[text] = string_id
+            self._pending.append(text)
+        return string_id
+
+    def freeze(self) -> None:
+        """Encode the interned strings into the blob/offsets arrays."""
+        encoded = [text.encode("utf-8") for text in self._pending]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        self.blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        """Number of strings."""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, string_id: int) -> str:
+        """Decode a string by id."""
+        start, end = self.offsets[string_id], self.offsets[string_id + 1]
+        return bytes(self.blob[start:end]).decode("utf-8")
+
+
+def _int_or_missing(value: Any) -> int:
+    """Return an integer field, or MISSING for anything else."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return MISSING
+
+
+def _tag_range(
+    tags: List[int], strings: StringTable, values: Optional[List[str]]
+) -> Tuple[int, int]:
+    """Append tag ids and return (start, count)."""
+    start = len(tags)
+    for tag in values or []:
+        tags.append(strings.intern(tag))
+    return start, len(tags) - start
+
+
+def build_tables(
+    objects_dir: Path = Path("objects"),
+) -> Tuple[Dict[str, np.ndarray], StringTable]:
+    """Build the columnar arrays for every category."""
+    strings = StringTable()
+    arrays: Dict[str, np.ndarray] = {}
+
+    rows, tags = [], []
+    for stem, enemy in load_category(objects_dir, "enemies").items():
+        stats = enemy.get("stats", {})
+        rows.append(
+            (
+                strings.intern(enemy.get("name", stem)),
+                _int_or_missing(stats.get("skill")),
+                _int_or_missing(stats.get("stamina")),
+                _int_or_missing(stats.get("initiative")),
+                _int_or_missing(stats.get("armor", stats.get("armour"))),
+                *_tag_range(tags, strings, enemy.get("tags")),
+            )
+        )
+    arrays["enemies"] = np.array(rows, dtype=ENEMY_DTYPE)
+    arrays["enemies_tags"] = np.array(tags, dtype=np.int32)
+
+    rows, tags = [], []
+    for stem, item in load_category(objects_dir, "items").items():
+        value = parse_silver(item.get("value"))
+        rows.append(
+            (
+                strings.intern(item.get("name", stem)),
+                MISSING if value is None else value,
+                _int_or_missing(item.get("slots")),
+                _int_or_missing(item.get("encumbrance")),
+                *_tag_range(tags, strings, item.get("tags")),
+            )
+        )
+    arrays["items"] = np.array(rows, dtype=ITEM_DTYPE)
+    arrays["items_tags"] = np.array(tags, dtype=np.int32)
+
+    rows, tags = [], []
+    for stem, spell in load_category(objects_dir, "spells").items():
+        rows.append(
+            (
+                strings.intern(spell.get("name", stem)),
+                _int_or_missing(spell.get("cost")),
+                *_tag_range(tags, strings, spell.get("tags")),
+            )
+        )
+    arrays["spells"] = np.array(rows, dtype=SPELL_DTYPE)
+    arrays["spells_tags"] = np.array(tags, dtype=np.int32)
+
+    rows, skills = [], []
+    for row, (stem, background) in enumerate(
+        load_category(objects_dir, "backgrounds").items()
+    ):
+        start = len(skills)
+        for skill in background.get("advancedSkills", []):
+            skills.append(
+                (row, strings.intern(skill["name"]), _int_or_missing(skill.get("rank")))
+            )
+        rows.append(
+            (
+                strings.intern(background.get("name", stem)),
+                _int_or_missing(background.get("id")),
+                start,
+                len(skills) - start,
+            )
+        )
+    arrays["backgrounds"] = np.array(rows, dtype=BACKGROUND_DTYPE)
+    arrays["background_skills"] = np.array(skills, dtype=BACKGROUND_SKILL_DTYPE)
+
+    strings.freeze()
+    return arrays, strings
+
+
+def export(objects_dir: Path, out_dir: Path) -> Dict[str, Any]:
+    """Write the columnar arrays and manifest to out_dir."""
+    arrays, strings = build_tables(objects_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(out_dir / f"{name}.npy", array)
+    np.save(out_dir / "strings.npy", strings.blob)
+    np.save(out_dir / "string_offsets.npy", strings.offsets)
+
+    manifest = {
+        "version": FORMAT_VERSION,
+        "arrays": {name: len(array) for name, array in arrays.items()},
+        "strings": len(strings),
+    }
+    with open(out_dir / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class ColumnarDataset:
+    """Memory-mapped view over an exported columnar directory."""
+
+    def __init__(self, directory: Path):
+        """Open every array in a directory written by export()."""
+        with open(directory / "manifest.json", "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported columnar format version: {self.manifest.get('version')}"
+            )
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in self.manifest["arrays"]
+        }
+        self.strings = StringTable(
+            np.load(directory / "strings.npy", mmap_mode="r"),
+            np.load(directory / "string_offsets.npy", mmap_mode="r"),
+        )
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Return an array by name (e.g. "enemies")."""
+        return self.arrays[name]
+
+    def names(self, category: str) -> List[str]:
+        """Decode the name column of a category."""
+        return [self.strings[int(i)] for i in self.arrays[category]["name"]]
+
+    def tags(self, category: str, row: int) -> List[str]:
+        """Decode the tags of one row."""
+        record = self.arrays[category][row]
+        start, count = int(record["tag_start"]), int(record["tag_count"])
+        ids = self.arrays[f"{category}_tags"][start : start + count]
+        return [self.strings[int(i)] for i in ids]
+
+    def background_skills(self, row: int) -> Dict[str, int]:
+        """Decode the skill ranks of one background."""
+        record = self.arrays["backgrounds"][row]
+        start, count = int(record["skill_start"]), int(record["skill_count"])
+        skills = self.arrays["background_skills"][start : start + count]
+        return {self.strings[int(s["skill"])]: int(s["rank"]) for s in skills}
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Export numeric Troika! stats as memory-mappable NumPy arrays"
+    )
+    parser.add_argument("--objects", default="objects", help="Objects directory")
+    parser.add_argument(
+        "--out",
+        default="dist/columnar",
+        help="Output directory (default: dist/columnar)",
+    )
+    args = parser.parse_args()
+
+    manifest = export(Path(args.objects), Path(args.out))
+    for name, count in manifest["arrays"].items():
+        print(f"{name}: {count} rows")
+    print(f"strings: {manifest['strings']}")
+
+
+if __name__ == "__main__":
+    main()
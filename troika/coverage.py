@@ -0,0 +1,272 @@
+"""
+Schema coverage profiling for the validator.
+
+SchemaCoverage builds validators whose keyword functions (type, properties,
+oneOf, $ref, ...) are wrapped with jsonschema.validators.extend. Every call
+is recorded against the subschema it ran in, identified by its JSON pointer
+into the source schema file:
+
+    hits      how many times the keyword ran at that location
+    seconds   time spent in it, including the subschemas it descended into
+
+After a corpus run the profile gives a coverage map of each schema: which
+locations were visited, the definitions where validation spends most of its
+time (candidates for optimization), and the unused parts, listed at their
+outermost unvisited location (candidates for pruning). An optional property
+counts as visited only when some document has it.
+
+    python main.py objects --recursive --coverage dist/coverage.json
+
+Profiling validates against the source schemas rather than the flattened
+copies, so definitions keep their identity, and runs in a single process.
+When a document reaches a reference to another schema file, the validator
+falls back to a copy of the schema without references (see main.py); the
+aborted pass is dropped and the fallback pass is profiled instead.
+"""
+
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from jsonschema import Draft7Validator, validators
+from rich.console import Console
+from rich.table import Table
+
+# Keywords whose values are a subschema, a list of them or a map of them
+_SCHEMA_KEYWORDS = frozenset(
+    ["additionalItems", "additionalProperties", "contains", "else", "if"]
+    + ["items", "not", "propertyNames", "then"]
+)
+_SCHEMA_LIST_KEYWORDS = frozenset(["allOf", "anyOf", "oneOf", "items"])
+_SCHEMA_MAP_KEYWORDS = frozenset(
+    ["definitions", "dependencies", "patternProperties", "properties"]
+)
+
+
+def _escape(token: str) -> str:
+    """Escape a JSON pointer token."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def iter_subschemas(schema: Any, pointer: str = "#") -> Iterator[Tuple[str, Dict]]:
+    """Yield (JSON pointer, subschema) for a schema and everything nested in it."""
+    if not isinstance(schema, dict):
+        return
+    yield pointer, schema
+    for keyword, value in schema.items():
+        base = f"{pointer}/{_escape(keyword)}"
+        if keyword in _SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+            for name, child in value.items():
+                yield from iter_subschemas(child, f"{base}/{_escape(name)}")
+        elif keyword in _SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+            for position, child in enumerate(value):
+                yield from iter_subschemas(child, f"{base}/{position}")
+        elif keyword in _SCHEMA_KEYWORDS:
+            yield from iter_subschemas(value, base)
+
+
+def _label(pointer: str) -> str:
+    """Shorten a pointer for display: "#/properties/weapon" -> "weapon"."""
+    return pointer[2:].replace("properties/", "") or "#"
+
+
+def _parent(pointer: str, locations: Dict[str, Any]) -> Optional[str]:
+    """Return the nearest enclosing location of a pointer."""
+    while "/" in pointer:
+        pointer = pointer.rsplit("/", 1)[0]
+        if pointer in locations:
+            return pointer
+    return None
+
+
+@dataclass(frozen=True)
+class LocationStats:
+    """Coverage of one subschema."""
+
+    pointer: str
+    visits: int
+    seconds: float  # inclusive of nested subschemas
+    keywords: Dict[str, Tuple[int, float]]  # keyword -> (hits, seconds)
+
+
+class SchemaCoverage:
+    """Keyword hit counts and timings, per schema location."""
+
+    def __init__(self):
+        """Create an empty profile."""
+        self.hits: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self.seconds: Dict[Tuple[str, str, str], float] = defaultdict(float)
+        # Schema key -> pointers in document order, and id(subschema) -> pointer
+        self.pointers: Dict[str, List[str]] = {}
+        self._locations: Dict[str, Dict[int, str]] = {}
+        # Profiled schemas are kept alive so their ids stay unique
+        self._schemas: Dict[str, List[Any]] = defaultdict(list)
+        # Keyword calls held back between begin() and commit()
+        self._pending: Optional[List[Tuple[Tuple[str, str, str], float]]] = None
+
+    def validator(self, key: str, schema: Dict[str, Any]) -> Draft7Validator:
+        """
+        Return a Draft 7 validator for a schema that records into this profile.
+
+        Another schema with the same layout can be added under an existing key,
+        such as a copy with its references removed; calls are then recorded
+        against the matching locations of the first one.
+        """
+        located = list(iter_subschemas(schema))
+        self._schemas[key].append(schema)
+        pointers = self.pointers.setdefault(key, [])
+        known = set(pointers)
+        pointers.extend(pointer for pointer, _ in located if pointer not in known)
+        locations = self._locations.setdefault(key, {})
+        for pointer, node in located:
+            locations.setdefault(id(node), pointer)
+        profiled = validators.extend(
+            Draft7Validator,
+            {
+                keyword: self._wrap(key, keyword, function)
+                for keyword, function in Draft7Validator.VALIDATORS.items()
+            },
+        )
+        return profiled(schema)
+
+    def begin(self) -> None:
+        """Hold back keyword calls until commit(), so a failed pass can be dropped."""
+        self._pending = []
+
+    def commit(self) -> None:
+        """Record the calls held back since begin()."""
+        pending, self._pending = self._pending or [], None
+        for entry, seconds in pending:
+            self.hits[entry] += 1
+            self.seconds[entry] += seconds
+
+    def discard(self) -> None:
+        """Drop the calls held back since begin()."""
+        self._pending = None
+
+    def _wrap(self, key: str, keyword: str, function: Callable) -> Callable:
+        """Wrap a keyword function to count and time its calls."""
+        locations = self._locations[key]
+
+        def profiled(validator, value, instance, schema):
+            entry = (key, locations.get(id(schema), "?"), keyword)
+            start = time.perf_counter()
+            # Keyword functions are usually generators; run them to the end
+            # here so the time is recorded even if the caller stops early
+            errors = list(function(validator, value, instance, schema) or ())
+            seconds = time.perf_counter() - start
+            if self._pending is not None:
+                self._pending.append((entry, seconds))
+            else:
+                self.hits[entry] += 1
+                self.seconds[entry] += seconds
+            yield from errors
+
+        return profiled
+
+    def locations(self, key: str) -> List[LocationStats]:
+        """Return the stats of every location of a schema, in document order."""
+        keywords: Dict[str, Dict[str, Tuple[int, float]]] = defaultdict(dict)
+        for (schema_key, pointer, keyword), hits in self.hits.items():
+            if schema_key == key:
+                keywords[pointer][keyword] = (
+                    hits,
+                    self.seconds[(schema_key, pointer, keyword)],
+                )
+        return [
+            LocationStats(
+                pointer,
+                max((hits for hits, _ in keywords[pointer].values()), default=0),
+                sum(seconds for _, seconds in keywords[pointer].values()),
+                dict(sorted(keywords[pointer].items())),
+            )
+            for pointer in self.pointers.get(key, [])
+        ]
+
+    def definitions(self, key: str) -> List[LocationStats]:
+        """Return the top-level definitions of a schema, slowest first."""
+        found = [
+            stats
+            for stats in self.locations(key)
+            if stats.pointer.count("/") == 2
+            and stats.pointer.startswith("#/definitions/")
+        ]
+        return sorted(found, key=lambda s: (-s.seconds, s.pointer))
+
+    def unused(self, key: str) -> List[str]:
+        """Return the outermost locations no document reached."""
+        visits = {stats.pointer: stats.visits for stats in self.locations(key)}
+        return [
+            pointer
+            for pointer, count in visits.items()
+            if count == 0
+            and (parent := _parent(pointer, visits)) is not None
+            and visits[parent] > 0
+        ]
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the coverage map of every profiled schema."""
+        report = {}
+        for key in sorted(self.pointers):
+            stats = self.locations(key)
+            report[key] = {
+                "documents": stats[0].visits if stats else 0,
+                "covered": sum(1 for s in stats if s.visits),
+                "locations": {
+                    s.pointer: {
+                        "visits": s.visits,
+                        "seconds": round(s.seconds, 6),
+                        "keywords": {
+                            keyword: {"hits": hits, "seconds": round(seconds, 6)}
+                            for keyword, (hits, seconds) in s.keywords.items()
+                        },
+                    }
+                    for s in stats
+                },
+                "definitions": {
+                    s.pointer.rsplit("/", 1)[1]: {
+                        "visits": s.visits,
+                        "seconds": round(s.seconds, 6),
+                    }
+                    for s in self.definitions(key)
+                },
+                "unused": self.unused(key),
+            }
+        return report
+
+    def write(self, path: Path) -> None:
+        """Write the coverage map as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, indent=2)
+            f.write("\n")
+
+    def print_summary(self, console: Console, limit: int = 5) -> None:
+        """Print coverage, hot definitions and unused sections per schema."""
+        table = Table(title="Schema Coverage")
+        table.add_column("Schema", style="cyan")
+        table.add_column("Docs", justify="right")
+        table.add_column("Covered", justify="right")
+        table.add_column("Hot definitions")
+        table.add_column("Unused")
+        for key, entry in self.to_json().items():
+            total = len(entry["locations"])
+            hot = [
+                f"{name} {stats['seconds'] * 1000:.1f}ms"
+                for name, stats in entry["definitions"].items()
+                if stats["visits"]
+            ][:limit]
+            unused = [_label(pointer) for pointer in entry["unused"][:limit]]
+            if len(entry["unused"]) > limit:
+                unused.append(f"(+{len(entry['unused']) - limit} more)")
+            table.add_row(
+                key,
+                str(entry["documents"]),
+                f"{entry['covered']}/{total} ({entry['covered'] / total:.0%})",
+                "\n".join(hot),
+                "\n".join(unused),
+            )
+        console.print(table)
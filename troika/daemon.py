@@ -0,0 +1,319 @@
+"""
+Validation daemon and client for editor integrations.
+
+The daemon keeps the schemas and compiled validators loaded, validates the
+objects/ tree once, and then watches systems/ and objects/ (inotify on
+Linux, polling elsewhere). A changed data file is revalidated on its own, a
+removed directory drops the results of the files under it, and a changed
+schema reloads the schemas and revalidates everything. Clients talk
+to it over a Unix socket with one JSON request per line:
+
+    {"cmd": "check", "paths": ["objects/items/lantern.json"]}
+    {"cmd": "status"}
+    {"cmd": "invalid"}
+    {"cmd": "shutdown"}
+
+A check answers from the cache when the file is unchanged since it was last
+validated (same mtime and size) and revalidates it otherwise, so a query
+made right after saving never sees a stale result.
+
+Start the daemon with `python main.py --daemon`. The client only needs the
+standard library, so it starts quickly:
+
+    python -m troika.daemon check objects/items/lantern.json
+    python -m troika.daemon status
+    python -m troika.daemon stop
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .watch import create_watcher
+
+DEFAULT_SOCKET = ".troika-daemon.sock"
+
+Stamp = Tuple[int, int]
+
+
+def _stamp(path: Path) -> Optional[Stamp]:
+    """Return (mtime_ns, size) of a file, or None if it is missing."""
+    try:
+        info = path.stat()
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+class ValidationDaemon:
+    """Keep validation results for a data tree up to date."""
+
+    def __init__(
+        self,
+        make_validator: Callable[[], Any],
+        objects_dir: Path = Path("objects"),
+        schema_dir: Path = Path("systems"),
+    ):
+        """
+        Load the validator and validate every file under objects_dir.
+
+        Args:
+            make_validator: Returns an object with validate_object(path),
+                e.g. a quiet main.TroikaValidator; called again on schema changes
+            objects_dir: Data tree to watch
+            schema_dir: Schema directory to watch
+        """
+        self.make_validator = make_validator
+        self.objects_dir = Path(objects_dir).resolve()
+        self.schema_dir = Path(schema_dir).resolve()
+        self.validator = make_validator()
+        self.cache: Dict[Path, Tuple[Optional[Stamp], Dict[str, Any]]] = {}
+        self.revalidations = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.revalidate_all()
+
+    def _validate(self, path: Path) -> Dict[str, Any]:
+        """Validate one file and cache the result (caller holds the lock)."""
+        stamp = _stamp(path)
+        result = self.validator.validate_object(path)
+        self.cache[path] = (stamp, result)
+        self.revalidations += 1
+        return result
+
+    def revalidate_all(self) -> None:
+        """Validate every JSON file under objects_dir from scratch."""
+        with self._lock:
+            self.cache.clear()
+            for path in sorted(self.objects_dir.rglob("*.json")):
+                self._validate(path)
+
+    def reload_schemas(self) -> None:
+        """Reload the schemas and revalidate everything."""
+        validator = self.make_validator()
+        with self._lock:
+            self.validator = validator
+        self.revalidate_all()
+
+    def apply_changes(self, paths) -> None:
+        """Revalidate changed files, or everything if a schema changed."""
+        paths = {Path(p).resolve() for p in paths}
+        if any(p == self.schema_dir or self.schema_dir in p.parents for p in paths):
+            self.reload_schemas()
+            return
+        if self.objects_dir in paths:
+            self.revalidate_all()
+            return
+        with self._lock:
+            for path in sorted(paths):
+                if path.exists():
+                    if path.suffix == ".json" and path.is_file():
+                        self._validate(path)
+                elif self.cache.pop(path, None) is None:
+                    # A removed directory takes its cached files with it
+                    for stale in [p for p in self.cache if path in p.parents]:
+                        del self.cache[stale]
+
+    def check(self, path: Path) -> Dict[str, Any]:
+        """Return the result for a file, revalidating it if it changed."""
+        path = Path(path).resolve()
+        with self._lock:
+            cached = self.cache.get(path)
+            if cached is not None and cached[0] == _stamp(path):
+                return cached[1]
+            if not path.exists():
+                self.cache.pop(path, None)
+                return {
+                    "file": str(path),
+                    "valid": False,
+                    "errors": [f"File not found: {path}"],
+                    "schema_used": None,
+                }
+            return self._validate(path)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one client request."""
+        cmd = request.get("cmd")
+        if cmd == "check":
+            return {"results": [self.check(Path(p)) for p in request.get("paths", [])]}
+        if cmd == "status":
+            with self._lock:
+                results = [result for _, result in self.cache.values()]
+                revalidations = self.revalidations
+            return {
+                "files": len(results),
+                "invalid": sum(1 for r in results if not r["valid"]),
+                "revalidations": revalidations,
+                "uptime": round(time.time() - self.started, 3),
+            }
+        if cmd == "invalid":
+            with self._lock:
+                results = [r for _, r in self.cache.values() if not r["valid"]]
+            return {"results": sorted(results, key=lambda r: r["file"])}
+        return {"error": f"Unknown command: {cmd}"}
+
+    def watch(self, watcher, stop: threading.Event) -> None:
+        """Apply changes reported by a watcher until stop is set."""
+        while not stop.is_set():
+            changed = watcher.wait(timeout=0.5)
+            if changed:
+                self.apply_changes(changed)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Read JSON requests line by line and write JSON responses."""
+
+    def handle(self):
+        """Serve requests until the client disconnects."""
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                response = {"error": f"Invalid request: {e}"}
+            else:
+                if request.get("cmd") == "shutdown":
+                    self._reply({"stopping": True})
+                    threading.Thread(target=self.server.shutdown).start()
+                    return
+                try:
+                    response = self.server.validation_daemon.handle(request)
+                except Exception as e:
+                    response = {"error": str(e)}
+            self._reply(response)
+
+    def _reply(self, response: Dict[str, Any]) -> None:
+        """Send one response line."""
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+        self.wfile.write(b"\n")
+        self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server in front of a ValidationDaemon."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, daemon: ValidationDaemon):
+        """Bind the socket, replacing a stale one left by a dead daemon."""
+        socket_path = Path(socket_path)
+        if socket_path.exists():
+            try:
+                query(socket_path, {"cmd": "status"}, timeout=1.0)
+            except OSError:
+                socket_path.unlink()
+            else:
+                raise RuntimeError(f"A daemon is already running on {socket_path}")
+        self.validation_daemon = daemon
+        self.socket_path = socket_path
+        super().__init__(str(socket_path), _RequestHandler)
+
+    def server_close(self) -> None:
+        """Close and remove the socket."""
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def serve(
+    make_validator: Callable[[], Any],
+    objects_dir: Path,
+    schema_dir: Path,
+    socket_path: Path = Path(DEFAULT_SOCKET),
+    poll: bool = False,
+) -> None:
+    """Run the daemon until a client sends shutdown or the process is interrupted."""
+    daemon = ValidationDaemon(make_validator, objects_dir, schema_dir)
+    watcher = create_watcher([daemon.objects_dir, daemon.schema_dir], poll=poll)
+    stop = threading.Event()
+    thread = threading.Thread(target=daemon.watch, args=(watcher, stop), daemon=True)
+    thread.start()
+    server = DaemonServer(socket_path, daemon)
+    print(
+        f"Validated {len(daemon.cache)} files; watching with "
+        f"{type(watcher).__name__}; listening on {socket_path}",
+        file=sys.stderr,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        thread.join()
+        watcher.close()
+
+
+def query(
+    socket_path: Path, request: Dict[str, Any], timeout: float = 10.0
+) -> Dict[str, Any]:
+    """Send one request to a running daemon and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(os.fspath(socket_path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("Daemon closed the connection")
+    return json.loads(line)
+
+
+def _print_results(results: List[Dict[str, Any]]) -> None:
+    """Print check results in a compact, editor-friendly form."""
+    for result in results:
+        if result["valid"]:
+            print(f"{result['file']}: valid ({result['schema_used']})")
+        for error in result["errors"]:
+            print(f"{result['file']}: {error}")
+
+
+def main():
+    """Command line client."""
+    parser = argparse.ArgumentParser(description="Query the validation daemon")
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET,
+        help=f"Socket path (default: {DEFAULT_SOCKET})",
+    )
+    parser.add_argument("--json", action="store_true", help="Print raw JSON responses")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    check_parser = subparsers.add_parser("check", help="Validate files")
+    check_parser.add_argument("paths", nargs="+", help="Files to check")
+    subparsers.add_parser("status", help="Show daemon status")
+    subparsers.add_parser("invalid", help="List every invalid file")
+    subparsers.add_parser("stop", help="Stop the daemon")
+    args = parser.parse_args()
+
+    if args.command == "check":
+        request = {"cmd": "check", "paths": [os.path.abspath(p) for p in args.paths]}
+    elif args.command == "stop":
+        request = {"cmd": "shutdown"}
+    else:
+        request = {"cmd": args.command}
+
+    try:
+        response = query(Path(args.socket), request)
+    except OSError as e:
+        print(f"Error: cannot reach daemon on {args.socket}: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json or "results" not in response:
+        print(json.dumps(response, indent=2, ensure_ascii=False))
+    else:
+        _print_results(response["results"])
+    if "error" in response or any(not r["valid"] for r in response.get("results", [])):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Loading helpers for the Troika! object files.
+
+Every game element lives in its own JSON file under objects/<category>/. These
+helpers load a category into a dict keyed by file stem (e.g. "alzabo" or
+"13-burglar") so the other modules share a single notion of entity identity.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+CATEGORIES = ("backgrounds", "enemies", "items", "skills", "spells", "tables")
+
+_SILVER_PATTERN = re.compile(r"^\s*(\d+)(?:[ _]silver(?:[ _]pence)?)?\s*$", re.I)
+
+
+def iter_entity_files(
+    objects_dir: Path, category: Optional[str] = None
+) -> Iterator[Tuple[str, Path]]:
+    """Yield (category, path) pairs for entity files, sorted by path."""
+    categories = (category,) if category else CATEGORIES
+    for name in categories:
+        for path in sorted((Path(objects_dir) / name).glob("*.json")):
+            yield name, path
+
+
+def load_entity(path: Path) -> Dict[str, Any]:
+    """Load a single entity file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_category(objects_dir: Path, category: str) -> Dict[str, Dict[str, Any]]:
+    """Load every entity of a category, keyed by file stem."""
+    return {
+        path.stem: load_entity(path)
+        for _, path in iter_entity_files(objects_dir, category)
+    }
+
+
+def load_all(objects_dir: Path = Path("objects")) -> Dict[str, Dict[str, Any]]:
+    """Load all categories as {category: {stem: entity}}."""
+    return {category: load_category(objects_dir, category) for category in CATEGORIES}
+
+
+def name_key(entity: Any) -> Optional[str]:
+    """Return the key of an entity in a name index: its casefolded name."""
+    name = entity.get("name") if isinstance(entity, Mapping) else None
+    return name.casefold() if isinstance(name, str) else None
+
+
+def name_index(entities: Mapping[str, Any]) -> Dict[str, str]:
+    """
+    Map the casefolded names of a category's entities to their stems.
+
+    When several entities share a name, the first stem in sorted order wins.
+    """
+    names: Dict[str, str] = {}
+    for stem in sorted(entities):
+        key = name_key(entities[stem])
+        if key is not None:
+            names.setdefault(key, stem)
+    return names
+
+
+def parse_silver(value: Any) -> Optional[int]:
+    """
+    Convert an item value to silver pence.
+
+    Accepts integers (the form produced by scripts/convert_silver_values.py) as
+    well as the legacy "25_silver" and "8 silver pence" strings. Returns None
+    for values that have no numeric price, such as "priceless".
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        match = _SILVER_PATTERN.match(value)
+        if match:
+            return int(match.group(1))
+    return None
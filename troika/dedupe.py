@@ -0,0 +1,291 @@
+"""
+Near-duplicate detection with MinHash and locality-sensitive hashing.
+
+The text of an entity is its name and description plus the names,
+descriptions and effects nested inside it (special abilities, table
+entries, ...). It is split into overlapping word 3-grams (shingles), and a
+128-value MinHash signature estimates the Jaccard similarity of two shingle
+sets. The signatures are cut into bands and each band is hashed into a
+bucket. Only entities that share a bucket are compared, so finding every
+similar pair is near-linear in the size of the corpus rather than
+quadratic. Candidate pairs are then confirmed with the exact Jaccard
+similarity of their shingles.
+
+Generic headings such as the many "Special Ability" blocks of enemies add
+only a few shingles, so they do not make unrelated entities look alike.
+
+Requires the `analytics` extra (numpy).
+
+Usage:
+    python -m troika.dedupe report [--threshold 0.5] [--category enemies]
+    python -m troika.dedupe check homebrew/enemies/new-beast.json ...
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .data import CATEGORIES, iter_entity_files, load_entity
+from .search import normalize_name
+
+SHINGLE_WORDS = 3
+NUM_PERM = 128
+DEFAULT_THRESHOLD = 0.5
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_TEXT_KEYS = ("name", "description", "effect", "text")
+
+
+def entity_text(entity: Any) -> str:
+    """Collect the names, descriptions and effects of an entity."""
+    parts: List[str] = []
+
+    def collect(value: Any) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in _TEXT_KEYS and isinstance(item, str):
+                    parts.append(item)
+                else:
+                    collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+
+    collect(entity)
+    return " ".join(parts)
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> Set[str]:
+    """Return the word n-grams of a normalized text."""
+    words = normalize_name(text).split()
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash_shingles(items: Iterable[str]) -> np.ndarray:
+    """Hash shingles to 32-bit integers."""
+    return np.array(
+        [
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "big")
+            for s in items
+        ],
+        dtype=np.uint64,
+    )
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Exact Jaccard similarity of two sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) whose S-curve midpoint is closest to threshold."""
+    options = [
+        (bands, num_perm // bands)
+        for bands in range(1, num_perm + 1)
+        if num_perm % bands == 0
+    ]
+    return min(options, key=lambda o: abs((1 / o[0]) ** (1 / o[1]) - threshold))
+
+
+@dataclass(frozen=True)
+class Duplicate:
+    """A pair of entities with similar text."""
+
+    first: str
+    second: str
+    similarity: float  # exact Jaccard similarity of the shingles
+    estimate: float  # MinHash estimate
+
+
+class DuplicateIndex:
+    """MinHash signatures of documents, bucketed by LSH band."""
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = NUM_PERM,
+        seed: int = 1,
+    ):
+        """
+        Create an empty index.
+
+        Args:
+            threshold: Jaccard similarity at which documents count as duplicates
+            num_perm: MinHash signature length
+            seed: Seed for the hash permutations
+        """
+        self.threshold = threshold
+        self.bands, self.rows = _lsh_params(threshold, num_perm)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.shingles: Dict[str, Set[str]] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[str]] = defaultdict(list)
+
+    def signature(self, items: Set[str]) -> np.ndarray:
+        """Return the MinHash signature of a shingle set."""
+        if not items:
+            return np.full(len(self._a), _MAX_HASH, dtype=np.uint64)
+        hashes = _hash_shingles(sorted(items))
+        # Universal hashing (a*x + b) mod p, truncated to 32 bits per permutation
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        """Return the bucket key of each band."""
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def add(self, key: str, text: str) -> None:
+        """Index a document under a unique key."""
+        if key in self.signatures:
+            raise ValueError(f"Duplicate key: {key}")
+        items = shingles(text)
+        if not items:
+            return
+        signature = self.signature(items)
+        self.signatures[key] = signature
+        self.shingles[key] = items
+        for bucket in self._band_keys(signature):
+            self._buckets[bucket].append(key)
+
+    def __len__(self) -> int:
+        """Number of indexed documents."""
+        return len(self.signatures)
+
+    def _confirm(
+        self, first: str, second: str, items: Set[str], signature
+    ) -> Optional[Duplicate]:
+        """Check a candidate pair against the threshold."""
+        similarity = jaccard(items, self.shingles[second])
+        if similarity < self.threshold:
+            return None
+        estimate = float(np.mean(signature == self.signatures[second]))
+        return Duplicate(first, second, round(similarity, 4), round(estimate, 4))
+
+    def query(self, text: str, exclude: Optional[str] = None) -> List[Duplicate]:
+        """Return indexed documents similar to a new text, most similar first."""
+        items = shingles(text)
+        if not items:
+            return []
+        signature = self.signature(items)
+        candidates = {
+            key
+            for bucket in self._band_keys(signature)
+            for key in self._buckets.get(bucket, ())
+            if key != exclude
+        }
+        found = [
+            duplicate
+            for key in sorted(candidates)
+            if (duplicate := self._confirm("", key, items, signature)) is not None
+        ]
+        return sorted(found, key=lambda d: -d.similarity)
+
+    def pairs(self) -> List[Duplicate]:
+        """Return every similar pair in the index, most similar first."""
+        candidates: Set[Tuple[str, str]] = set()
+        for keys in self._buckets.values():
+            for i, first in enumerate(keys):
+                for second in keys[i + 1 :]:
+                    candidates.add((min(first, second), max(first, second)))
+        found = []
+        for first, second in sorted(candidates):
+            duplicate = self._confirm(
+                first, second, self.shingles[first], self.signatures[first]
+            )
+            if duplicate is not None:
+                found.append(duplicate)
+        return sorted(found, key=lambda d: (-d.similarity, d.first, d.second))
+
+
+def build_index(
+    objects_dir: Path = Path("objects"),
+    categories: Iterable[str] = CATEGORIES,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> DuplicateIndex:
+    """Index every entity as "<category>/<stem>"."""
+    index = DuplicateIndex(threshold)
+    for category in categories:
+        for _, path in iter_entity_files(objects_dir, category):
+            index.add(f"{category}/{path.stem}", entity_text(load_entity(path)))
+    return index
+
+
+def check_files(
+    index: DuplicateIndex, paths: Iterable[Path]
+) -> Dict[str, List[Duplicate]]:
+    """
+    Compare new entity files with an index, without rebuilding it.
+
+    A file already in the index (same category and stem) is not matched
+    against itself.
+    """
+    results = {}
+    for path in paths:
+        path = Path(path)
+        key = f"{path.parent.name}/{path.stem}"
+        matches = index.query(entity_text(load_entity(path)), exclude=key)
+        results[str(path)] = [
+            Duplicate(key, d.second, d.similarity, d.estimate) for d in matches
+        ]
+    return results
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Find near-duplicate entities")
+    parser.add_argument("--objects", default="objects", help="Objects directory")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Jaccard similarity threshold (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--category",
+        action="append",
+        choices=CATEGORIES,
+        help="Category to index (repeatable; default: all)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("report", help="List similar pairs in the corpus")
+    check_parser = subparsers.add_parser("check", help="Check new files")
+    check_parser.add_argument("paths", nargs="+", help="Entity files to check")
+    args = parser.parse_args()
+
+    index = build_index(Path(args.objects), args.category or CATEGORIES, args.threshold)
+    if args.command == "report":
+        duplicates = index.pairs()
+    else:
+        results = check_files(index, [Path(p) for p in args.paths])
+        duplicates = [d for matches in results.values() for d in matches]
+
+    if args.json:
+        print(json.dumps([d.__dict__ for d in duplicates], indent=2))
+    else:
+        for d in duplicates:
+            print(f"{d.similarity:.2f}  {d.first}  ~  {d.second}")
+        print(f"{len(duplicates)} similar pairs among {len(index)} entities")
+    if args.command == "check" and duplicates:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Versioned delta feed for the objects/ tree.
+
+The dataset is treated as one JSON document keyed by relative file path
+("enemies/alzabo.json"), so changes between two versions are expressed as a
+single RFC 6902 JSON Patch. Files whose bytes hash the same are skipped
+without parsing; changed files are diffed structurally in a worker pool, and
+inside a file identical subtrees are pruned by comparing subtree hashes.
+
+A feed directory holds the version chain:
+
+    manifest.json            versions in order, each with its parent and patch
+    patches/<from>..<to>.json  JSON Patch from one version to the next
+    snapshot.json            the latest dataset, used as the base of the next diff
+
+Usage:
+    python -m troika.delta diff OLD_DIR NEW_DIR
+    python -m troika.delta publish OBJECTS_DIR --feed feed --version 2025-07-10
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .data import CATEGORIES
+
+Operation = Dict[str, Any]
+
+MANIFEST_FILE = "manifest.json"
+SNAPSHOT_FILE = "snapshot.json"
+
+
+def escape_pointer(token: str) -> str:
+    """Escape one JSON Pointer reference token (RFC 6901)."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def unescape_pointer(token: str) -> str:
+    """Unescape one JSON Pointer reference token (RFC 6901)."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _hash_tree(value: Any, memo: Dict[int, bytes]) -> bytes:
+    """Hash a JSON value, recording the hash of every container in memo."""
+    if isinstance(value, dict):
+        digest = hashlib.blake2b(b"{", digest_size=16)
+        for key in sorted(value):
+            digest.update(key.encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(_hash_tree(value[key], memo))
+        result = digest.digest()
+        memo[id(value)] = result
+        return result
+    if isinstance(value, list):
+        digest = hashlib.blake2b(b"[", digest_size=16)
+        for item in value:
+            digest.update(_hash_tree(item, memo))
+        result = digest.digest()
+        memo[id(value)] = result
+        return result
+    return hashlib.blake2b(json.dumps(value).encode("utf-8"), digest_size=16).digest()
+
+
+class _Differ:
+    """Structural differ that prunes identical subtrees by hash."""
+
+    def __init__(self, old: Any, new: Any):
+        self.memo: Dict[int, bytes] = {}
+        _hash_tree(old, self.memo)
+        _hash_tree(new, self.memo)
+        self.ops: List[Operation] = []
+
+    def same(self, a: Any, b: Any) -> bool:
+        """Compare two values, using subtree hashes for containers."""
+        if isinstance(a, (dict, list)) and type(a) is type(b):
+            return self.memo[id(a)] == self.memo[id(b)]
+        return type(a) is type(b) and a == b
+
+    def diff(self, old: Any, new: Any, path: str) -> None:
+        """Append the operations turning old into new at path."""
+        if self.same(old, new):
+            return
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key in old:
+                if key not in new:
+                    self.ops.append(
+                        {"op": "remove", "path": f"{path}/{escape_pointer(key)}"}
+                    )
+            for key, value in new.items():
+                child = f"{path}/{escape_pointer(key)}"
+                if key in old:
+                    self.diff(old[key], value, child)
+                else:
+                    self.ops.append({"op": "add", "path": child, "value": value})
+        elif isinstance(old, list) and isinstance(new, list):
+            self.diff_list(old, new, path)
+        else:
+            self.ops.append({"op": "replace", "path": path, "value": new})
+
+    def diff_list(self, old: List[Any], new: List[Any], path: str) -> None:
+        """Diff two arrays after trimming their common prefix and suffix."""
+        prefix = 0
+        limit = min(len(old), len(new))
+        while prefix < limit and self.same(old[prefix], new[prefix]):
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and self.same(
+            old[len(old) - 1 - suffix], new[len(new) - 1 - suffix]
+        ):
+            suffix += 1
+
+        old_middle = old[prefix : len(old) - suffix]
+        new_middle = new[prefix : len(new) - suffix]
+        common = min(len(old_middle), len(new_middle))
+        for offset in range(common):
+            self.diff(
+                old_middle[offset], new_middle[offset], f"{path}/{prefix + offset}"
+            )
+        for offset in range(common, len(new_middle)):
+            self.ops.append(
+                {
+                    "op": "add",
+                    "path": f"{path}/{prefix + offset}",
+                    "value": new_middle[offset],
+                }
+            )
+        for _ in range(common, len(old_middle)):
+            self.ops.append({"op": "remove", "path": f"{path}/{prefix + common}"})
+
+
+def diff_documents(old: Any, new: Any, path: str = "") -> List[Operation]:
+    """Return the JSON Patch operations turning old into new."""
+    differ = _Differ(old, new)
+    differ.diff(old, new, path)
+    return differ.ops
+
+
+def _resolve_parent(document: Any, path: str) -> Tuple[Any, str]:
+    """Walk a JSON Pointer to the parent container and return (parent, last token)."""
+    tokens = [unescape_pointer(t) for t in path.split("/")[1:]]
+    parent = document
+    for token in tokens[:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+    return parent, tokens[-1]
+
+
+def apply_patch(document: Any, ops: Iterable[Operation]) -> Any:
+    """
+    Apply add/remove/replace operations in place and return the document.
+
+    Only the operations emitted by diff_documents() are supported.
+    """
+    for op in ops:
+        if op["path"] == "":
+            if op["op"] == "remove":
+                raise ValueError("Cannot remove the document root")
+            document = op["value"]
+            continue
+        parent, token = _resolve_parent(document, op["path"])
+        if isinstance(parent, list):
+            index = len(parent) if token == "-" else int(token)
+            if op["op"] == "add":
+                parent.insert(index, op["value"])
+            elif op["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = op["value"]
+        else:
+            if op["op"] == "remove":
+                del parent[token]
+            else:
+                parent[token] = op["value"]
+    return document
+
+
+def file_hashes(objects_dir: Path) -> Dict[str, str]:
+    """Hash every entity file, keyed by path relative to objects_dir."""
+    hashes = {}
+    for category in CATEGORIES:
+        for path in sorted((objects_dir / category).glob("*.json")):
+            hashes[f"{category}/{path.name}"] = hashlib.sha256(
+                path.read_bytes()
+            ).hexdigest()
+    return hashes
+
+
+def dataset_hash(hashes: Dict[str, str]) -> str:
+    """Hash a whole dataset from its per-file hashes."""
+    digest = hashlib.sha256()
+    for name in sorted(hashes):
+        digest.update(f"{name}\0{hashes[name]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _diff_file(task: Tuple[str, Any, str]) -> List[Operation]:
+    """Worker: diff one changed file against its previous content."""
+    name, old, new_path = task
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    return diff_documents(old, new, f"/{escape_pointer(name)}")
+
+
+def _load(path: Path) -> Any:
+    """Load a JSON file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def diff_trees(
+    old: Dict[str, Any],
+    old_hashes: Dict[str, str],
+    new_dir: Path,
+    new_hashes: Dict[str, str],
+    workers: Optional[int] = None,
+) -> List[Operation]:
+    """
+    Diff a previous dataset against an objects directory.
+
+    Args:
+        old: Previous dataset as {relative path: document}
+        old_hashes: Previous file hashes (see file_hashes)
+        new_dir: Objects directory holding the new version
+        new_hashes: File hashes of new_dir
+        workers: Worker processes for changed files (default: CPU count)
+
+    Returns:
+        JSON Patch over the {relative path: document} dataset
+    """
+    ops: List[Operation] = []
+    for name in sorted(old_hashes.keys() - new_hashes.keys()):
+        ops.append({"op": "remove", "path": f"/{escape_pointer(name)}"})
+
+    changed = sorted(
+        name
+        for name in new_hashes.keys() & old_hashes.keys()
+        if new_hashes[name] != old_hashes[name]
+    )
+    tasks = [(name, old[name], str(new_dir / name)) for name in changed]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            for file_ops in pool.map(_diff_file, tasks, chunksize=chunksize):
+                ops.extend(file_ops)
+    else:
+        for task in tasks:
+            ops.extend(_diff_file(task))
+
+    for name in sorted(new_hashes.keys() - old_hashes.keys()):
+        ops.append(
+            {
+                "op": "add",
+                "path": f"/{escape_pointer(name)}",
+                "value": _load(new_dir / name),
+            }
+        )
+    return ops
+
+
+def load_dataset(objects_dir: Path) -> Dict[str, Any]:
+    """Load an objects directory as {relative path: document}."""
+    return {
+        f"{category}/{path.name}": _load(path)
+        for category in CATEGORIES
+        for path in sorted((objects_dir / category).glob("*.json"))
+    }
+
+
+def diff_directories(
+    old_dir: Path, new_dir: Path, workers: Optional[int] = None
+) -> List[Operation]:
+    """Diff two objects directories."""
+    old_hashes = file_hashes(old_dir)
+    new_hashes = file_hashes(new_dir)
+    changed = {
+        name
+        for name in old_hashes
+        if name in new_hashes and old_hashes[name] != new_hashes[name]
+    }
+    old = {name: _load(old_dir / name) for name in changed}
+    return diff_trees(old, old_hashes, new_dir, new_hashes, workers)
+
+
+def _write_json(path: Path, data: Any, indent: Optional[int] = None) -> None:
+    """Write JSON atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp, path)
+
+
+def publish(
+    objects_dir: Path, feed_dir: Path, version: str, workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Add a version to a feed, writing the patch from the previous version.
+
+    The first version only records a snapshot; clients bootstrap from a full
+    download and then follow the patch chain.
+
+    Returns:
+        The manifest entry of the new version
+    """
+    manifest_path = feed_dir / MANIFEST_FILE
+    manifest = _load(manifest_path) if manifest_path.exists() else {"versions": []}
+    if any(entry["version"] == version for entry in manifest["versions"]):
+        raise ValueError(f"Version already published: {version}")
+
+    new_hashes = file_hashes(objects_dir)
+    entry: Dict[str, Any] = {
+        "version": version,
+        "hash": dataset_hash(new_hashes),
+        "parent": None,
+    }
+    if manifest["versions"]:
+        previous = manifest["versions"][-1]
+        snapshot = _load(feed_dir / SNAPSHOT_FILE)
+        ops = diff_trees(
+            snapshot["documents"], snapshot["hashes"], objects_dir, new_hashes, workers
+        )
+        patch_name = f"patches/{previous['version']}..{version}.json"
+        _write_json(feed_dir / patch_name, ops)
+        entry.update(
+            {"parent": previous["version"], "patch": patch_name, "operations": len(ops)}
+        )
+
+    _write_json(
+        feed_dir / SNAPSHOT_FILE,
+        {
+            "version": version,
+            "hashes": new_hashes,
+            "documents": load_dataset(objects_dir),
+        },
+    )
+    manifest["versions"].append(entry)
+    _write_json(manifest_path, manifest, indent=2)
+    return entry
+
+
+def patches_since(feed_dir: Path, version: str) -> List[str]:
+    """List the patch files a client at `version` must apply, in order."""
+    versions = _load(feed_dir / MANIFEST_FILE)["versions"]
+    names = [entry["version"] for entry in versions]
+    if version not in names:
+        raise ValueError(f"Unknown version: {version}")
+    return [entry["patch"] for entry in versions[names.index(version) + 1 :]]
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Entity-level JSON Patch delta feed")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    diff_parser = subparsers.add_parser("diff", help="Diff two objects directories")
+    diff_parser.add_argument("old", help="Old objects directory")
+    diff_parser.add_argument("new", help="New objects directory")
+    diff_parser.add_argument("--workers", type=int, help="Worker processes")
+
+    publish_parser = subparsers.add_parser("publish", help="Add a version to a feed")
+    publish_parser.add_argument("objects", help="Objects directory to publish")
+    publish_parser.add_argument("--feed", default="dist/feed", help="Feed directory")
+    publish_parser.add_argument("--version", required=True, help="Version label")
+    publish_parser.add_argument("--workers", type=int, help="Worker processes")
+
+    args = parser.parse_args()
+    if args.command == "diff":
+        ops = diff_directories(Path(args.old), Path(args.new), args.workers)
+        json.dump(ops, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        entry = publish(Path(args.objects), Path(args.feed), args.version, args.workers)
+        print(json.dumps(entry, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Dice expression helpers.
+
+Troika! uses d6, 2d6 and d66 rolls throughout. Expressions are parsed once
+into (count, sides, modifier) tuples so hot loops only pay for the roll.
+"""
+
+import random
+import re
+from functools import lru_cache
+from typing import Any, Tuple
+
+_DICE_PATTERN = re.compile(r"^\s*(\d*)\s*d\s*(\d+)\s*(?:([+-])\s*(\d+))?\s*$", re.I)
+_CHANCE_IN_PATTERN = re.compile(
+    r"^\s*(\d+)\s*(?:-|\s)\s*in\s*(?:-|\s)\s*(\d+)\s*$", re.I
+)
+_CHANCE_SLASH_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+_CHANCE_PERCENT_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*%\s*$")
+
+Dice = Tuple[int, int, int]
+
+
+@lru_cache(maxsize=None)
+def parse_dice(expression: str) -> Dice:
+    """
+    Parse a dice expression such as "d6", "2d6+1" or "3" into a Dice tuple.
+
+    A plain number is returned as (0, 0, number). "d66" is kept as sides=66;
+    use roll() rather than summing dice yourself so it is read as tens/units.
+    """
+    text = expression.strip()
+    if text.isdigit():
+        return 0, 0, int(text)
+    match = _DICE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Invalid dice expression: {expression!r}")
+    count = int(match.group(1) or 1)
+    sides = int(match.group(2))
+    modifier = int(match.group(4) or 0)
+    if match.group(3) == "-":
+        modifier = -modifier
+    return count, sides, modifier
+
+
+def roll(rng: random.Random, dice: Dice) -> int:
+    """Roll a parsed dice expression."""
+    count, sides, modifier = dice
+    if sides == 66:
+        return (
+            sum(rng.randint(1, 6) * 10 + rng.randint(1, 6) for _ in range(count))
+            + modifier
+        )
+    return sum(rng.randint(1, sides) for _ in range(count)) + modifier
+
+
+def parse_chance(chance: Any) -> float:
+    """
+    Convert a loot chance to a probability.
+
+    Understands "1 in 6", "1-in-6", "2/6" and "50%". Missing or unrecognised
+    chances are treated as certain.
+    """
+    if chance is None:
+        return 1.0
+    if isinstance(chance, (int, float)) and not isinstance(chance, bool):
+        return float(chance) if chance <= 1 else float(chance) / 100.0
+    text = str(chance)
+    for pattern in (_CHANCE_IN_PATTERN, _CHANCE_SLASH_PATTERN):
+        match = pattern.match(text)
+        if match and int(match.group(2)):
+            return min(1.0, int(match.group(1)) / int(match.group(2)))
+    match = _CHANCE_PERCENT_PATTERN.match(text)
+    if match:
+        return min(1.0, float(match.group(1)) / 100.0)
+    return 1.0
@@ -0,0 +1,295 @@
+"""
+Random encounter generator.
+
+Enemies are grouped by habitat and tag once, and every enemy's mien table and
+loot entries are compiled into flat lookup tuples up front. Generating an
+encounter is then a handful of random draws against precomputed data, which
+keeps throughput in the thousands of encounters per second.
+"""
+
+import random
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from .data import load_category, parse_silver
+from .dice import Dice, parse_chance, parse_dice, roll
+
+# Habitats that place a creature in every pool.
+WILDCARD_HABITATS = frozenset({"any", "anywhere"})
+
+_ROLL_RANGE_PATTERN = re.compile(r"^\s*(\d+)\s*[-–]\s*(\d+)\s*$")
+_COIN_NAMES = frozenset({"silver", "silver pence", "sp", "coins"})
+
+
+@dataclass(frozen=True)
+class LootDrop:
+    """A single rolled loot entry."""
+
+    item: str
+    quantity: int
+    silver: int
+
+
+@dataclass(frozen=True)
+class Encounter:
+    """A generated encounter with rolled mien and loot."""
+
+    enemy: str
+    name: str
+    mood: str
+    behavior: str
+    loot: Tuple[LootDrop, ...]
+    silver: int
+
+
+# (item, probability, quantity dice, unit value in silver)
+_LootEntry = Tuple[str, float, Dice, int]
+# (stem, name, mien outcomes, loot entries)
+_CompiledEnemy = Tuple[str, str, Tuple[Tuple[str, str], ...], Tuple[_LootEntry, ...]]
+
+
+def normalize_label(label: str) -> str:
+    """Normalize a habitat or tag label ("Near_Settlements" -> "near settlements")."""
+    return " ".join(label.replace("_", " ").replace("-", " ").lower().split())
+
+
+def _roll_values(roll_value: Any) -> List[int]:
+    """Expand a mien entry roll (6, "6", "2-3") into the values it covers."""
+    if isinstance(roll_value, int):
+        return [roll_value]
+    text = str(roll_value)
+    if text.strip().isdigit():
+        return [int(text)]
+    match = _ROLL_RANGE_PATTERN.match(text)
+    if match:
+        low, high = int(match.group(1)), int(match.group(2))
+        return list(range(low, high + 1))
+    return []
+
+
+def compile_mien(mien: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Compile a mien table into equally likely outcomes.
+
+    A d6 table becomes 6 outcomes; 2d6 and d66 tables become the 36 dice
+    combinations mapped to their entries, so a roll is a single randrange().
+    """
+    entries = mien.get("entries", [])
+    if not entries:
+        return (("", ""),)
+
+    by_roll: Dict[int, Tuple[str, str]] = {}
+    for entry in entries:
+        outcome = (entry.get("mood", ""), entry.get("behavior", entry.get("mood", "")))
+        for value in _roll_values(entry.get("roll")):
+            by_roll[value] = outcome
+
+    dice_type = mien.get("diceType", "d6")
+    if dice_type == "2d6":
+        rolls = [a + b for a in range(1, 7) for b in range(1, 7)]
+    elif dice_type == "d66":
+        rolls = [a * 10 + b for a in range(1, 7) for b in range(1, 7)]
+    else:
+        rolls = list(range(1, 7))
+
+    fallback = [
+        (e.get("mood", ""), e.get("behavior", e.get("mood", ""))) for e in entries
+    ]
+    return tuple(
+        by_roll.get(value, fallback[i % len(fallback)]) for i, value in enumerate(rolls)
+    )
+
+
+class EncounterGenerator:
+    """Generate encounters filtered by habitat and tags with deterministic seeding."""
+
+    def __init__(
+        self,
+        enemies: Dict[str, Dict[str, Any]],
+        items: Optional[Dict[str, Dict[str, Any]]] = None,
+        seed: Optional[int] = None,
+    ):
+        """Precompute candidate indexes, mien tables and loot samplers."""
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._prices = self._build_price_list(items or {})
+        self._enemies: Tuple[_CompiledEnemy, ...] = tuple(
+            self._compile_enemy(stem, enemies[stem]) for stem in sorted(enemies)
+        )
+
+        wildcard = set()
+        habitat_sets: Dict[str, set] = {}
+        tag_sets: Dict[str, set] = {}
+        for index, stem in enumerate(sorted(enemies)):
+            enemy = enemies[stem]
+            for habitat in enemy.get("habitat") or []:
+                label = normalize_label(habitat)
+                if label in WILDCARD_HABITATS:
+                    wildcard.add(index)
+                else:
+                    habitat_sets.setdefault(label, set()).add(index)
+            for tag in enemy.get("tags") or []:
+                tag_sets.setdefault(normalize_label(tag), set()).add(index)
+        self._wildcard = frozenset(wildcard)
+        self._by_habitat: Dict[str, FrozenSet[int]] = {
+            k: frozenset(v | wildcard) for k, v in habitat_sets.items()
+        }
+        self._by_tag: Dict[str, FrozenSet[int]] = {
+            k: frozenset(v) for k, v in tag_sets.items()
+        }
+        self._all = frozenset(range(len(self._enemies)))
+        self._pools: Dict[Tuple[Optional[str], FrozenSet[str]], Tuple[int, ...]] = {}
+
+    @classmethod
+    def from_directory(
+        cls, objects_dir: Path = Path("objects"), seed: Optional[int] = None
+    ) -> "EncounterGenerator":
+        """Build a generator from the enemies and items in an objects directory."""
+        return cls(
+            load_category(objects_dir, "enemies"),
+            load_category(objects_dir, "items"),
+            seed=seed,
+        )
+
+    @staticmethod
+    def _build_price_list(items: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Map lower-cased item names and file stems to their value in silver."""
+        prices: Dict[str, int] = {}
+        for stem, item in items.items():
+            value = parse_silver(item.get("value"))
+            if value is None:
+                continue
+            prices[stem.lower()] = value
+            prices[item.get("name", stem).lower()] = value
+        return prices
+
+    def _unit_value(self, item: str) -> int:
+        """Look up the silver value of one unit of a loot item."""
+        key = item.strip().lower()
+        if key in _COIN_NAMES:
+            return 1
+        return self._prices.get(key, 0)
+
+    def _compile_loot(self, loot: Iterable[Dict[str, Any]]) -> Tuple[_LootEntry, ...]:
+        """Compile loot entries into (item, probability, dice, unit value) tuples."""
+        compiled = []
+        for entry in loot:
+            item = entry.get("item", "")
+            quantity = entry.get("quantity", 1)
+            if isinstance(quantity, int):
+                dice: Dice = (0, 0, quantity)
+            else:
+                try:
+                    dice = parse_dice(str(quantity))
+                except ValueError:
+                    dice = (0, 0, 1)
+            compiled.append(
+                (item, parse_chance(entry.get("chance")), dice, self._unit_value(item))
+            )
+        return tuple(compiled)
+
+    def _compile_enemy(self, stem: str, enemy: Dict[str, Any]) -> _CompiledEnemy:
+        """Compile an enemy into its name, mien outcomes and loot sampler."""
+        return (
+            stem,
+            enemy.get("name", stem),
+            compile_mien(enemy.get("mien", {})),
+            self._compile_loot(enemy.get("loot") or []),
+        )
+
+    def habitats(self) -> List[str]:
+        """List the known (normalized) habitats."""
+        return sorted(self._by_habitat)
+
+    def tags(self) -> List[str]:
+        """List the known (normalized) tags."""
+        return sorted(self._by_tag)
+
+    def _pool(self, habitat: Optional[str], tags: Iterable[str]) -> Tuple[int, ...]:
+        """Return the cached candidate pool for a habitat/tag filter."""
+        key = (
+            normalize_label(habitat) if habitat else None,
+            frozenset(normalize_label(t) for t in tags),
+        )
+        pool = self._pools.get(key)
+        if pool is None:
+            habitat_label, tag_labels = key
+            if habitat_label is None:
+                members = self._all
+            else:
+                members = self._by_habitat.get(habitat_label, self._wildcard)
+            for tag in tag_labels:
+                members = members & self._by_tag.get(tag, frozenset())
+            pool = tuple(sorted(members))
+            self._pools[key] = pool
+        return pool
+
+    def candidates(
+        self, habitat: Optional[str] = None, tags: Iterable[str] = ()
+    ) -> List[str]:
+        """List enemy stems matching a habitat/tag filter."""
+        return [self._enemies[i][0] for i in self._pool(habitat, tags)]
+
+    def _roll_loot(
+        self, rng: random.Random, loot: Tuple[_LootEntry, ...]
+    ) -> Tuple[Tuple[LootDrop, ...], int]:
+        """Roll an enemy's loot entries and total their value."""
+        drops = []
+        total = 0
+        for item, probability, dice, unit_value in loot:
+            if probability < 1.0 and rng.random() >= probability:
+                continue
+            quantity = roll(rng, dice) if dice[0] else dice[2]
+            if quantity <= 0:
+                continue
+            silver = quantity * unit_value
+            drops.append(LootDrop(item, quantity, silver))
+            total += silver
+        return tuple(drops), total
+
+    def generate(
+        self,
+        habitat: Optional[str] = None,
+        tags: Iterable[str] = (),
+        rng: Optional[random.Random] = None,
+    ) -> Optional[Encounter]:
+        """Generate a single encounter, or None if nothing matches the filter."""
+        return next(self.stream(habitat, tags, limit=1, rng=rng), None)
+
+    def stream(
+        self,
+        habitat: Optional[str] = None,
+        tags: Iterable[str] = (),
+        limit: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+    ) -> Iterator[Encounter]:
+        """
+        Lazily generate encounters matching a habitat/tag filter.
+
+        Args:
+            habitat: Habitat to draw from; creatures found "anywhere" always match
+            tags: Tags every candidate must carry
+            limit: Number of encounters to yield (unbounded if None)
+            rng: Random source; defaults to the generator's seeded source
+
+        Yields:
+            Encounter objects
+        """
+        pool = self._pool(habitat, tags)
+        if not pool:
+            return
+        rng = rng or self._rng
+        enemies = self._enemies
+        size = len(pool)
+        produced = 0
+        while limit is None or produced < limit:
+            stem, name, mien, loot = enemies[pool[rng.randrange(size)]]
+            mood, behavior = mien[rng.randrange(len(mien))]
+            if loot:
+                drops, silver = self._roll_loot(rng, loot)
+            else:
+                drops, silver = (), 0
+            yield Encounter(stem, name, mood, behavior, drops, silver)
+            produced += 1
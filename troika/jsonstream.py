@@ -0,0 +1,297 @@
+"""
+Streaming readers for JSON record streams.
+
+These read one record at a time from a text stream so memory stays flat no
+matter how long the stream is:
+
+    iter_lines            NDJSON: one document per line, parsed by the caller
+    iter_concatenated     documents back to back, separated by optional whitespace
+    iter_members          members of one large top-level object, with array
+                          members split into their elements
+
+bounded_map() fans records out to a process pool while keeping only a fixed
+number of batches in flight, and yields results in input order.
+"""
+
+import json
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"\s*")
+
+# Text at the end of the buffer that more input could still complete
+_NUMBER_TAIL = re.compile(r"[0-9eE.+-]*")
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+
+def _incomplete(error: json.JSONDecodeError) -> bool:
+    """Return True if a decode error may be fixed by reading more input."""
+    if error.msg.startswith("Unterminated string"):
+        return True
+    tail = error.doc[error.pos :]
+    if error.msg.startswith("Invalid \\uXXXX escape"):
+        return len(tail) < 6
+    return bool(_NUMBER_TAIL.fullmatch(tail)) or any(
+        literal.startswith(tail) for literal in _LITERALS
+    )
+
+
+@dataclass(frozen=True)
+class MalformedRecord:
+    """Stands in for a document that could not be parsed."""
+
+    message: str
+
+
+def iter_lines(stream: TextIO) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, text) for every non-blank line of an NDJSON stream."""
+    for line_no, line in enumerate(stream, start=1):
+        if line.strip():
+            yield line_no, line
+
+
+class _Reader:
+    """
+    Buffered reader that decodes one JSON value at a time from a text stream.
+
+    The buffer holds the unread part of the current value plus one read, and
+    grows geometrically while a value is incomplete so large values are not
+    re-parsed many times.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        """Wrap a text stream."""
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        # Stream position of buffer[0], its line, and the start of that line
+        self.offset = 0
+        self.lineno = 1
+        self.line_start = 0
+
+    def _fill(self) -> bool:
+        """Drop consumed text and read more; return False at end of stream."""
+        if self.eof:
+            return False
+        chunk = self.stream.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        newlines = self.buffer.count("\n", 0, self.pos)
+        if newlines:
+            self.lineno += newlines
+            self.line_start = self.offset + self.buffer.rindex("\n", 0, self.pos) + 1
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def error(self, msg: str, pos: int) -> json.JSONDecodeError:
+        """Build a decode error for buffer position pos, located in the stream."""
+        error = json.JSONDecodeError(msg, self.buffer, pos)
+        newlines = self.buffer.count("\n", 0, pos)
+        if newlines:
+            error.colno = pos - self.buffer.rindex("\n", 0, pos)
+        else:
+            error.colno = self.offset + pos - self.line_start + 1
+        error.lineno = self.lineno + newlines
+        error.pos = self.offset + pos
+        error.args = (
+            f"{msg}: line {error.lineno} column {error.colno} (char {error.pos})",
+        )
+        return error
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or "" at end of stream."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def take(self, expected: str) -> str:
+        """Consume the next non-whitespace character, which must be in expected."""
+        char = self.peek()
+        if not char or char not in expected:
+            raise self.error(f"Expecting one of {expected!r}", self.pos)
+        self.pos += 1
+        return char
+
+    def decode(self) -> Any:
+        """Decode the next complete value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number at the end of the buffer may continue in the next read.
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                # Stop as soon as more input cannot help, rather than at EOF
+                if self.eof or not _incomplete(e):
+                    raise self.error(e.msg, e.pos) from None
+            self._fill()
+
+    def skip_line(self, pos: int) -> None:
+        """Move past the end of the line containing stream position pos."""
+        self.pos = pos - self.offset
+        while True:
+            newline = self.buffer.find("\n", self.pos)
+            if newline != -1:
+                self.pos = newline + 1
+                return
+            self.pos = len(self.buffer)
+            if not self._fill():
+                return
+
+
+def iter_concatenated(
+    stream: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE, skip_malformed: bool = False
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (record number, value) for concatenated JSON documents.
+
+    NDJSON is a special case of this format. A malformed document is detected
+    as soon as the error cannot be fixed by more input, without buffering
+    the rest of the stream.
+
+    Args:
+        stream: Text stream
+        chunk_size: Characters read at a time
+        skip_malformed: Yield a MalformedRecord for a malformed document and
+            resume at the next line, instead of raising
+
+    Raises:
+        json.JSONDecodeError: If a document is malformed and skip_malformed is off
+    """
+    reader = _Reader(stream, chunk_size)
+    index = 0
+    while reader.peek():
+        index += 1
+        try:
+            value = reader.decode()
+        except json.JSONDecodeError as e:
+            if not skip_malformed:
+                raise
+            reader.skip_line(e.pos)
+            value = MalformedRecord(str(e))
+        yield index, value
+
+
+# Event kinds yielded by iter_members()
+MEMBER = "member"
+ARRAY = "array"
+ELEMENT = "element"
+
+
+def iter_members(
+    stream: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Parse a top-level JSON object incrementally.
+
+    Yields (kind, key, value) events:
+
+        (MEMBER, key, value)    a member whose value is not an array
+        (ARRAY, key, None)      the start of an array member
+        (ELEMENT, key, value)   each element of that array, in order
+
+    Only one member or array element is held in memory at a time.
+
+    Raises:
+        json.JSONDecodeError: If the stream is not a single JSON object
+    """
+    reader = _Reader(stream, chunk_size)
+    reader.take("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+    else:
+        while True:
+            key = reader.decode()
+            if not isinstance(key, str):
+                raise reader.error("Expecting property name", reader.pos)
+            reader.take(":")
+            if reader.peek() == "[":
+                reader.pos += 1
+                yield ARRAY, key, None
+                if reader.peek() == "]":
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield ELEMENT, key, reader.decode()
+                        if reader.take(",]") == "]":
+                            break
+            else:
+                yield MEMBER, key, reader.decode()
+            if reader.take(",}") == "}":
+                break
+    if reader.peek():
+        raise reader.error("Extra data", reader.pos)
+
+
+def _run_batch(func: Callable[[Any], Any], batch: List[Any]) -> List[Any]:
+    """Apply a function to every item of a batch (runs in a worker)."""
+    return [func(item) for item in batch]
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most `size` items."""
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bounded_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int = 1,
+    batch_size: int = 256,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[Any, ...] = (),
+) -> Iterator[Any]:
+    """
+    Map a function over a stream in worker processes, in order.
+
+    Unlike Executor.map, the input is consumed lazily: at most two batches
+    per worker are in flight, so memory does not grow with the stream.
+
+    Args:
+        func: Module-level function applied to each item
+        items: Input stream
+        workers: Worker processes; 1 runs everything in this process
+        batch_size: Items sent to a worker at a time
+        initializer: Called once per worker (or once here when workers is 1)
+        initargs: Arguments for initializer
+    """
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in items:
+            yield func(item)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) as pool:
+        pending: deque = deque()
+        for batch in _batches(items, batch_size):
+            pending.append(pool.submit(_run_batch, func, batch))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
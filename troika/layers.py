@@ -0,0 +1,378 @@
+"""
+Layered data: the core objects/ tree plus homebrew overlay packs.
+
+An overlay pack has the same layout as objects/ (backgrounds/, enemies/,
+spells/, ...). A file whose stem matches a core entity patches it with JSON
+Merge Patch semantics (RFC 7386): objects are merged key by key, any other
+value replaces the one below it, and null deletes a key. A file with a new
+stem adds an entity. Overlays apply in order, so the last layer wins.
+
+Entities are resolved lazily on first access and cached. Resolution is
+copy-on-write: only the objects along patched paths are copied, everything
+else is shared with the layer below, so resolved entities must be treated as
+read-only.
+
+    data = LayeredData(Path("objects"))
+    data.add_layer(Path("packs/more-spells"))
+    data.get("spells", "fireball")
+    data.providers("spells", "fireball")  # ["base", "more-spells"]
+    data.conflicts()
+
+An overlay is named after its directory unless given a name. When that is
+taken (packA/objects and packB/objects, or a directory called "base"), enough
+parent directories are added to make it unique: "packB/objects".
+
+The provenance and name indexes are updated incrementally: adding or removing
+a layer only touches the entities that layer provides.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .data import CATEGORIES, iter_entity_files, load_entity, name_key
+
+Key = Tuple[str, str]
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """
+    Apply a JSON Merge Patch without modifying either argument.
+
+    Unchanged values are shared with target rather than copied.
+    """
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def _leaves(patch: Any, path: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple, Any]]:
+    """Yield (path, value) for every value a merge patch sets or deletes."""
+    if isinstance(patch, dict) and (patch or not path):
+        for key, value in patch.items():
+            yield from _leaves(value, path + (key,))
+    else:
+        yield path, patch
+
+
+def _unique_name(root: Path, taken: Set[str]) -> str:
+    """Name a layer after the shortest unused trailing part of its path."""
+    parts = root.resolve().parts
+    for depth in range(1, len(parts)):
+        name = "/".join(parts[-depth:])
+        if name not in taken:
+            return name
+    return str(root.resolve())
+
+
+class Layer:
+    """One directory of entity files; entities are loaded on first use."""
+
+    def __init__(self, root: Path, name: Optional[str] = None):
+        """Index the entity files under root (nothing is parsed yet)."""
+        self.root = Path(root)
+        self.name = name or self.root.name
+        self.files: Dict[Key, Path] = {
+            (category, path.stem): path
+            for category, path in iter_entity_files(self.root)
+        }
+        self._loaded: Dict[Key, Dict[str, Any]] = {}
+
+    def __contains__(self, key: Key) -> bool:
+        """Check whether this layer provides an entity."""
+        return key in self.files
+
+    def load(self, key: Key) -> Dict[str, Any]:
+        """Return the parsed file for an entity."""
+        document = self._loaded.get(key)
+        if document is None:
+            document = load_entity(self.files[key])
+            self._loaded[key] = document
+        return document
+
+
+@dataclass(frozen=True)
+class Conflict:
+    """Two or more overlays set the same field of an entity differently."""
+
+    category: str
+    stem: str
+    path: str
+    values: Tuple[Tuple[str, Any], ...]  # (layer name, value) in layer order
+
+    @property
+    def winner(self) -> str:
+        """Name of the layer whose value is used."""
+        return self.values[-1][0]
+
+
+class LayeredData:
+    """A base layer plus ordered overlay layers, resolved lazily per entity."""
+
+    def __init__(self, base: Path = Path("objects"), overlays=()):
+        """
+        Create the layer stack.
+
+        Args:
+            base: Core objects directory
+            overlays: Overlay directories, lowest priority first
+        """
+        self.layers: List[Layer] = [Layer(base, "base")]
+        # Provenance index: entity -> layers that provide it, in order
+        self._providers: Dict[Key, List[Layer]] = {}
+        self._resolved: Dict[Key, Dict[str, Any]] = {}
+        # Name index, built on first lookup and then kept up to date
+        self._names: Optional[Dict[str, Dict[str, str]]] = None
+        self._name_of: Dict[Key, str] = {}
+        # (category, folded name) -> every stem with that name; the first wins
+        self._named: Dict[Tuple[str, str], Set[str]] = {}
+        self._index(self.layers[0])
+        for overlay in overlays:
+            self.add_layer(Path(overlay))
+
+    def _index(self, layer: Layer) -> None:
+        """Add a layer's entities to the provenance index."""
+        order = {id(other): i for i, other in enumerate(self.layers)}
+        for key in layer.files:
+            providers = self._providers.setdefault(key, [])
+            providers.append(layer)
+            providers.sort(key=lambda other: order[id(other)])
+
+    def _refresh(self, keys) -> None:
+        """Drop cached resolutions and update the name index for some entities."""
+        for key in keys:
+            self._resolved.pop(key, None)
+        if self._names is None:
+            return
+        affected = set()
+        for key in keys:
+            old = self._name_of.pop(key, None)
+            if old is not None:
+                self._named[(key[0], old)].discard(key[1])
+                affected.add((key[0], old))
+            affected.update(self._add_name(key))
+        for category, folded in affected:
+            self._index_name(category, folded)
+
+    def _add_name(self, key: Key) -> List[Tuple[str, str]]:
+        """Record the resolved name of an entity; return its (category, name)."""
+        folded = name_key(self.get(*key))
+        if folded is None:
+            return []
+        self._name_of[key] = folded
+        self._named.setdefault((key[0], folded), set()).add(key[1])
+        return [(key[0], folded)]
+
+    def _index_name(self, category: str, folded: str) -> None:
+        """Point a name at its first stem, as data.name_index does, or drop it."""
+        stems = self._named.get((category, folded))
+        names = self._names.setdefault(category, {})
+        if stems:
+            names[folded] = min(stems)
+        else:
+            names.pop(folded, None)
+            self._named.pop((category, folded), None)
+
+    def add_layer(
+        self, root: Path, name: Optional[str] = None, position: Optional[int] = None
+    ) -> Layer:
+        """
+        Add an overlay layer.
+
+        Args:
+            root: Overlay directory
+            name: Layer name for reports (default: the directory name, with
+                parent directories added if another layer already uses it)
+            position: Index in the stack (default: on top); 0 is the base
+
+        Raises:
+            ValueError: If the directory or name is already used, or position
+                is 0
+        """
+        if any(other.root.resolve() == Path(root).resolve() for other in self.layers):
+            raise ValueError(f"Layer already added: {root}")
+        taken = {other.name for other in self.layers}
+        if name is None:
+            name = _unique_name(Path(root), taken)
+        elif name in taken:
+            raise ValueError(f"Duplicate layer name: {name}")
+        layer = Layer(root, name)
+        if position is None:
+            self.layers.append(layer)
+        elif position < 1:
+            raise ValueError("Overlays cannot be placed below the base layer")
+        else:
+            self.layers.insert(position, layer)
+        self._index(layer)
+        self._refresh(layer.files)
+        return layer
+
+    def remove_layer(self, name: str) -> None:
+        """
+        Remove an overlay layer by name.
+
+        Raises:
+            KeyError: If there is no such overlay
+        """
+        for layer in self.layers[1:]:
+            if layer.name == name:
+                break
+        else:
+            raise KeyError(name)
+        self.layers.remove(layer)
+        for key in layer.files:
+            providers = self._providers[key]
+            providers.remove(layer)
+            if not providers:
+                del self._providers[key]
+        self._refresh(layer.files)
+
+    def get(self, category: str, stem: str) -> Optional[Dict[str, Any]]:
+        """Return the resolved entity, or None if no layer provides it."""
+        key = (category, stem)
+        entity = self._resolved.get(key)
+        if entity is None:
+            providers = self._providers.get(key)
+            if not providers:
+                return None
+            base = providers[0]
+            # The base entity is shared as-is; an added entity is a patch to {}
+            if base is self.layers[0]:
+                entity = base.load(key)
+            else:
+                entity = merge_patch({}, base.load(key))
+            for layer in providers[1:]:
+                entity = merge_patch(entity, layer.load(key))
+            self._resolved[key] = entity
+        return entity
+
+    def keys(self, category: str) -> List[str]:
+        """Return the stems of a category across all layers, sorted."""
+        return sorted(stem for cat, stem in self._providers if cat == category)
+
+    def items(self, category: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (stem, entity) for a category, resolving each lazily."""
+        for stem in self.keys(category):
+            yield stem, self.get(category, stem)
+
+    def category(self, category: str) -> Dict[str, Dict[str, Any]]:
+        """Resolve a whole category, like troika.data.load_category."""
+        return dict(self.items(category))
+
+    def providers(self, category: str, stem: str) -> List[str]:
+        """Return the names of the layers that provide an entity, in order."""
+        return [layer.name for layer in self._providers.get((category, stem), [])]
+
+    def find(self, category: str, name: str) -> Optional[str]:
+        """Return the stem of the entity with a given name (case-insensitive)."""
+        if self._names is None:
+            self._names = {}
+            for key in self._providers:
+                self._add_name(key)
+            for category, folded in list(self._named):
+                self._index_name(category, folded)
+        return self._names.get(category, {}).get(name.casefold())
+
+    def conflicts(self) -> List[Conflict]:
+        """
+        Report fields that two or more overlays set to different values.
+
+        Overriding the base layer is the point of an overlay and is not
+        reported. A field also conflicts with a change to one of its parents
+        (e.g. one pack replaces "stats" while another patches "stats.skill").
+        """
+        conflicts = []
+        for key in sorted(self._providers):
+            overlays = [
+                layer for layer in self._providers[key] if layer is not self.layers[0]
+            ]
+            if len(overlays) < 2:
+                continue
+            values: Dict[Tuple, List[Tuple[str, Any]]] = {}
+            for layer in overlays:
+                for path, value in _leaves(layer.load(key)):
+                    values.setdefault(path, []).append((layer.name, value))
+            for path, entries in sorted(values.items()):
+                layers = {name for name, _ in entries}
+                for depth in range(1, len(path)):
+                    for name, value in values.get(path[:depth], []):
+                        if name not in layers:
+                            entries = entries + [(name, value)]
+                            layers.add(name)
+                distinct = {json.dumps(value, sort_keys=True) for _, value in entries}
+                if len(layers) > 1 and len(distinct) > 1:
+                    order = {layer.name: i for i, layer in enumerate(overlays)}
+                    entries.sort(key=lambda entry: order[entry[0]])
+                    conflicts.append(
+                        Conflict(key[0], key[1], ".".join(path), tuple(entries))
+                    )
+        return conflicts
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Merge overlay packs over objects/")
+    parser.add_argument(
+        "overlays",
+        nargs="+",
+        help="Overlay directories, in order; NAME=DIR names a layer in reports",
+    )
+    parser.add_argument("--base", default="objects", help="Base objects directory")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    args = parser.parse_args()
+
+    data = LayeredData(Path(args.base))
+    for overlay in args.overlays:
+        name, named, root = overlay.partition("=")
+        try:
+            if named:
+                data.add_layer(Path(root), name)
+            else:
+                data.add_layer(Path(overlay))
+        except ValueError as e:
+            parser.error(str(e))
+    conflicts = data.conflicts()
+    if args.json:
+        report = [
+            {
+                "category": c.category,
+                "entity": c.stem,
+                "path": c.path,
+                "values": [{"layer": name, "value": value} for name, value in c.values],
+                "winner": c.winner,
+            }
+            for c in conflicts
+        ]
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for category in CATEGORIES:
+            added = [
+                stem
+                for stem in data.keys(category)
+                if "base" not in data.providers(category, stem)
+            ]
+            changed = [
+                stem
+                for stem in data.keys(category)
+                if len(data.providers(category, stem)) > 1
+            ]
+            if added or changed:
+                print(f"{category}: {len(added)} added, {len(changed)} overridden")
+        for c in conflicts:
+            shown = ", ".join(f"{name}={json.dumps(value)}" for name, value in c.values)
+            print(f"conflict {c.category}/{c.stem} {c.path}: {shown} -> {c.winner}")
+    if conflicts:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+Data migrations for JSON trees such as objects/.
+
+A migration is a rule registered with @migration. It is called for dict
+members with one of its keys and returns the value unchanged (the same
+object) or a replacement. All pending migrations run together in a single
+traversal per file. The traversal is copy-on-write: containers are only
+copied along the paths that actually change, and files with no changes are
+never rewritten. Changed files are written atomically (temporary file plus
+os.replace), and files are processed in a worker pool.
+
+Applied migrations are recorded in the `metadata.migrations` list of
+troika-system-data.json, so running the tool again only applies new ones.
+
+Usage:
+    python -m troika.migrations [--objects objects] [--dry-run] [--workers N]
+    python -m troika.migrations --list
+"""
+
+import argparse
+import difflib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from .delta import escape_pointer
+
+AGGREGATE_FILE = "troika-system-data.json"
+
+Transform = Callable[[str, Any], Any]
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A registered data migration."""
+
+    id: str
+    description: str
+    keys: FrozenSet[str]
+    transform: Transform
+
+
+@dataclass(frozen=True)
+class Change:
+    """One value rewritten by a migration."""
+
+    migration: str
+    path: str
+    old: Any
+    new: Any
+
+
+@dataclass
+class FileResult:
+    """Outcome of migrating one file."""
+
+    path: str
+    changes: List[Change] = field(default_factory=list)
+    diff: Optional[str] = None
+    error: Optional[str] = None
+
+
+MIGRATIONS: Dict[str, Migration] = {}
+
+
+def migration(migration_id: str, description: str, keys: Sequence[str]):
+    """
+    Register a migration.
+
+    Ids are applied in sorted order, so prefix them with a sequence number
+    (e.g. "0002-rename-armor"). The decorated function receives (key, value)
+    and must return `value` itself when nothing changes.
+
+    Migrations must be registered at import time so worker processes see them.
+    """
+
+    def decorator(transform: Transform) -> Transform:
+        if migration_id in MIGRATIONS:
+            raise ValueError(f"Duplicate migration id: {migration_id}")
+        MIGRATIONS[migration_id] = Migration(
+            migration_id, description, frozenset(keys), transform
+        )
+        return transform
+
+    return decorator
+
+
+_SILVER_VALUE = re.compile(r"^(\d+)_silver$")
+
+
+@migration(
+    "0001-silver-values",
+    'Convert "X_silver" item values to integers (was scripts/convert_silver_values.py)',
+    keys=["value"],
+)
+def silver_values(key: str, value: Any) -> Any:
+    """Convert "25_silver" to 25."""
+    if isinstance(value, str) and value.endswith("_silver"):
+        match = _SILVER_VALUE.match(value)
+        if match:
+            return int(match.group(1))
+    return value
+
+
+def _build_dispatch(
+    migrations: Sequence[Migration],
+) -> Dict[str, Tuple[Migration, ...]]:
+    """Index migrations by the dict keys they apply to."""
+    dispatch: Dict[str, Tuple[Migration, ...]] = {}
+    for rule in migrations:
+        for key in rule.keys:
+            dispatch[key] = dispatch.get(key, ()) + (rule,)
+    return dispatch
+
+
+def apply_migrations(
+    data: Any,
+    dispatch: Dict[str, Tuple[Migration, ...]],
+    changes: List[Change],
+    path: str = "",
+) -> Any:
+    """
+    Run every migration over a document in one traversal.
+
+    Returns the original object when nothing changed; otherwise a new
+    document sharing every unchanged subtree with the original.
+    """
+    if isinstance(data, dict):
+        result = data
+        for key, child in data.items():
+            child_path = f"{path}/{escape_pointer(key)}"
+            new_child = apply_migrations(child, dispatch, changes, child_path)
+            for rule in dispatch.get(key, ()):
+                migrated = rule.transform(key, new_child)
+                if migrated is not new_child:
+                    changes.append(Change(rule.id, child_path, new_child, migrated))
+                    new_child = migrated
+            if new_child is not child:
+                if result is data:
+                    result = dict(data)
+                result[key] = new_child
+        return result
+    if isinstance(data, list):
+        result = data
+        for index, child in enumerate(data):
+            new_child = apply_migrations(child, dispatch, changes, f"{path}/{index}")
+            if new_child is not child:
+                if result is data:
+                    result = list(data)
+                result[index] = new_child
+        return result
+    return data
+
+
+def _serialize(data: Any, trailing_newline: bool) -> str:
+    """Serialize a document the way the data files are formatted."""
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    return text + "\n" if trailing_newline else text
+
+
+def atomic_write(path: Path, text: str) -> None:
+    """Replace a file's contents atomically, keeping its permissions."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        # mkstemp creates the file as 0600; keep the mode of the file replaced
+        if path.exists():
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def migrate_file(path: str, migration_ids: Sequence[str], dry_run: bool) -> FileResult:
+    """Apply migrations to one file, writing it only if something changed."""
+    result = FileResult(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            original = f.read()
+        data = json.loads(original)
+    except (OSError, ValueError) as e:
+        result.error = str(e)
+        return result
+
+    dispatch = _build_dispatch([MIGRATIONS[i] for i in migration_ids])
+    migrated = apply_migrations(data, dispatch, result.changes)
+    if migrated is data:
+        return result
+
+    text = _serialize(migrated, original.endswith("\n"))
+    if dry_run:
+        result.diff = "".join(
+            difflib.unified_diff(
+                original.splitlines(keepends=True),
+                text.splitlines(keepends=True),
+                fromfile=path,
+                tofile=path,
+            )
+        )
+    else:
+        atomic_write(Path(path), text)
+    return result
+
+
+def _migrate_task(task: Tuple[str, Tuple[str, ...], bool]) -> FileResult:
+    """Worker entry point."""
+    return migrate_file(*task)
+
+
+def load_history(objects_dir: Path) -> List[Dict[str, Any]]:
+    """Return the migrations recorded in troika-system-data.json."""
+    aggregate = objects_dir / AGGREGATE_FILE
+    if not aggregate.exists():
+        return []
+    with open(aggregate, "r", encoding="utf-8") as f:
+        return json.load(f).get("metadata", {}).get("migrations", [])
+
+
+def pending_migrations(
+    objects_dir: Path, only: Optional[Sequence[str]] = None
+) -> List[Migration]:
+    """Registered migrations not yet recorded in the history, in id order."""
+    applied = {entry["id"] for entry in load_history(objects_dir)}
+    ids = sorted(MIGRATIONS) if only is None else sorted(only)
+    for migration_id in ids:
+        if migration_id not in MIGRATIONS:
+            raise ValueError(f"Unknown migration: {migration_id}")
+    return [MIGRATIONS[i] for i in ids if i not in applied]
+
+
+def record_history(
+    objects_dir: Path, migrations: Sequence[Migration], results: Sequence[FileResult]
+) -> None:
+    """Append applied migrations to metadata.migrations of the aggregate file."""
+    aggregate = objects_dir / AGGREGATE_FILE
+    with open(aggregate, "r", encoding="utf-8") as f:
+        original = f.read()
+    data = json.loads(original)
+    applied_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    history = data.setdefault("metadata", {}).setdefault("migrations", [])
+    for rule in migrations:
+        counts = [sum(1 for c in r.changes if c.migration == rule.id) for r in results]
+        history.append(
+            {
+                "id": rule.id,
+                "description": rule.description,
+                "appliedAt": applied_at.replace("+00:00", "Z"),
+                "files": sum(1 for count in counts if count),
+                "changes": sum(counts),
+            }
+        )
+    atomic_write(aggregate, _serialize(data, original.endswith("\n")))
+
+
+def migrate(
+    objects_dir: Path = Path("objects"),
+    only: Optional[Sequence[str]] = None,
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+) -> Tuple[List[Migration], List[FileResult]]:
+    """
+    Apply pending migrations to every JSON file under objects_dir.
+
+    Args:
+        objects_dir: Root of the data tree; must contain troika-system-data.json
+            unless dry_run is set
+        only: Restrict to these migration ids
+        dry_run: Compute diffs without writing anything
+        workers: Worker processes (default: CPU count)
+
+    Returns:
+        Tuple of (migrations run, results for files that changed or failed).
+        The history is only recorded when no file failed, so a failed run is
+        retried in full next time.
+    """
+    objects_dir = Path(objects_dir)
+    if not dry_run and not (objects_dir / AGGREGATE_FILE).exists():
+        raise FileNotFoundError(
+            f"{objects_dir / AGGREGATE_FILE} is needed to record migration history"
+        )
+    migrations = pending_migrations(objects_dir, only)
+    if not migrations:
+        return [], []
+
+    ids = tuple(rule.id for rule in migrations)
+    tasks = [(str(path), ids, dry_run) for path in sorted(objects_dir.rglob("*.json"))]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            results = list(pool.map(_migrate_task, tasks, chunksize=chunksize))
+    else:
+        results = [_migrate_task(task) for task in tasks]
+    results = [r for r in results if r.changes or r.error]
+
+    if not dry_run and not any(r.error for r in results):
+        record_history(objects_dir, migrations, results)
+    return migrations, results
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Apply data migrations to objects/")
+    parser.add_argument("--objects", default="objects", help="Objects directory")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print diffs without writing files"
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes")
+    parser.add_argument(
+        "--only", action="append", metavar="ID", help="Run only this migration"
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List migrations and whether they ran"
+    )
+    args = parser.parse_args(argv)
+
+    objects_dir = Path(args.objects)
+    if args.list:
+        applied = {entry["id"]: entry for entry in load_history(objects_dir)}
+        for migration_id, rule in sorted(MIGRATIONS.items()):
+            status = (
+                f"applied {applied[migration_id]['appliedAt']}"
+                if migration_id in applied
+                else "pending"
+            )
+            print(f"{migration_id}  {status}  {rule.description}")
+        return
+
+    migrations, results = migrate(objects_dir, args.only, args.dry_run, args.workers)
+    if not migrations:
+        print("No pending migrations.")
+        return
+
+    for result in results:
+        if result.error:
+            print(f"Error processing {result.path}: {result.error}")
+        elif args.dry_run:
+            print(result.diff, end="")
+        else:
+            print(f"Modified: {result.path}")
+            for change in result.changes:
+                print(
+                    f"   [{change.migration}] {change.path}: {change.old!r} -> {change.new!r}"
+                )
+
+    changed = [r for r in results if r.changes]
+    verb = "Would modify" if args.dry_run else "Modified"
+    print(
+        f"{verb} {len(changed)} files "
+        f"({sum(len(r.changes) for r in changed)} changes) "
+        f"with {', '.join(rule.id for rule in migrations)}"
+    )
+    failed = [r for r in results if r.error]
+    if failed:
+        print(f"{len(failed)} files failed; migration history not recorded")
+        sys.exit(1)
+    if not args.dry_run:
+        print(f"Recorded in {objects_dir / AGGREGATE_FILE} metadata.migrations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Numeric normalization of free-form duration, range and setup time fields.
+
+Spell `duration` and `range`, item `setupTime` and weapon `range` are
+free-form strings ("3 minutes", "3_minutes", "Until ended", "Touch/Close",
+"24 metres radius"). This module parses each one once into:
+
+    Duration(seconds, kind)   kind in DURATION_KINDS; seconds is the typical
+                              length (dice are averaged), math.inf for
+                              permanent effects, None when it depends on events
+    Reach(metres, band)       band in RANGE_BANDS, ordered from self to
+                              unlimited; metres only when the text gives one
+
+NormalizedData keeps the parsed values for every entity and builds sorted
+indexes, so a question like "spells lasting at least an hour" is a binary
+search rather than a parse of every string:
+
+    data = NormalizedData(Path("objects"))
+    data.query("spells", "duration.seconds", lo=3600)
+    data.query("spells", "range.band", hi=band_rank("close"))
+
+`python -m troika.normalize` writes the parsed fields, keyed by category
+and entity, to dist/normalized.json.
+"""
+
+import argparse
+import json
+import math
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .data import load_category
+
+DURATION_KINDS = (
+    "instant",
+    "timed",
+    "concentration",
+    "conditional",
+    "permanent",
+    "variable",
+)
+
+# Ordered from shortest to longest reach
+RANGE_BANDS = (
+    "self",
+    "touch",
+    "close",
+    "short",
+    "medium",
+    "long",
+    "sight",
+    "unlimited",
+)
+
+# Troika! does not fix the length of a combat round; this is a convention
+ROUND_SECONDS = 10
+
+_UNIT_SECONDS = {
+    "second": 1,
+    "round": ROUND_SECONDS,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+_AMOUNT = r"(?:(\d+)?d(\d+)|(\d+(?:\.\d+)?)|an?|one)"
+_DURATION = re.compile(
+    rf"\b{_AMOUNT}\s*(second|round|minute|hour|day|week|month|year)s?\b"
+)
+_METRES = re.compile(r"(\d+(?:\.\d+)?)\s*(?:m\b|metres?|meters?)")
+
+# Upper bounds (metres) of the numeric bands
+_BAND_LIMITS = (("close", 2), ("short", 10), ("medium", 30))
+
+_RANGE_WORDS = (
+    ("unlimited", "unlimited"),
+    ("sight", "sight"),
+    ("throwing", "medium"),
+    ("long", "long"),
+    ("medium", "medium"),
+    ("short", "short"),
+    ("speaking", "short"),
+    ("earshot", "short"),
+    ("close", "close"),
+    ("touch", "touch"),
+    ("self", "self"),
+)
+
+
+@dataclass(frozen=True)
+class Duration:
+    """A parsed duration or setup time."""
+
+    text: str
+    kind: str
+    seconds: Optional[float] = None
+
+    def to_json(self) -> Dict[str, Any]:
+        """JSON form; permanent effects have no finite seconds."""
+        seconds = (
+            None if self.seconds is None or math.isinf(self.seconds) else self.seconds
+        )
+        return {"kind": self.kind, "seconds": seconds}
+
+
+@dataclass(frozen=True)
+class Reach:
+    """A parsed spell or weapon range."""
+
+    text: str
+    band: Optional[str]
+    metres: Optional[float] = None
+
+    def to_json(self) -> Dict[str, Any]:
+        """JSON form."""
+        return {"band": self.band, "metres": self.metres}
+
+
+def band_rank(band: str) -> int:
+    """Return the position of a band in RANGE_BANDS."""
+    return RANGE_BANDS.index(band)
+
+
+def _words(text: str) -> str:
+    """Lowercase a value and turn snake_case into words."""
+    return text.replace("_", " ").strip().lower()
+
+
+def parse_duration(text: str) -> Duration:
+    """Parse a duration such as "3_minutes", "1d6 minutes" or "Until ended"."""
+    words = _words(text)
+    match = _DURATION.search(words)
+    if match:
+        count, sides, number, unit = match.groups()
+        if sides:
+            amount = int(count or 1) * (int(sides) + 1) / 2
+        elif number:
+            amount = float(number)
+        else:
+            amount = 1.0
+        return Duration(text, "timed", amount * _UNIT_SECONDS[unit])
+    if words.startswith("instant"):
+        return Duration(text, "instant", 0.0)
+    if words.startswith("permanent"):
+        return Duration(text, "permanent", math.inf)
+    if "concentrat" in words:
+        return Duration(text, "concentration")
+    if words.startswith(("until", "while", "one ")):
+        return Duration(text, "conditional")
+    return Duration(text, "variable")
+
+
+def parse_range(text: str) -> Reach:
+    """
+    Parse a range such as "Touch", "20_metres", "Touch/Close" or "Long".
+
+    A value listing alternatives ("Touch or line of sight") gets the
+    longest of them. Unrecognized values (e.g. "Between mirrors") have no band.
+    """
+    words = _words(text)
+    match = _METRES.search(words)
+    if match:
+        metres = float(match.group(1))
+        band = next((b for b, limit in _BAND_LIMITS if metres <= limit), "long")
+        return Reach(text, band, metres)
+    bands = [band for word, band in _RANGE_WORDS if re.search(rf"\b{word}", words)]
+    if not bands:
+        return Reach(text, None)
+    return Reach(text, max(bands, key=band_rank))
+
+
+def normalize_entity(category: str, entity: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the parsed fields of one entity, keyed by field name."""
+    fields: Dict[str, Any] = {}
+    if category == "spells":
+        if isinstance(entity.get("duration"), str):
+            fields["duration"] = parse_duration(entity["duration"])
+        if isinstance(entity.get("range"), str):
+            fields["range"] = parse_range(entity["range"])
+    elif category == "items":
+        tool = entity.get("tool") if isinstance(entity.get("tool"), dict) else {}
+        setup = entity.get("setupTime", tool.get("setupTime"))
+        if isinstance(setup, str):
+            fields["setupTime"] = parse_duration(setup)
+        weapon = entity.get("weapon") if isinstance(entity.get("weapon"), dict) else {}
+        reach = weapon.get("range", entity.get("range"))
+        if isinstance(reach, str):
+            fields["range"] = parse_range(reach)
+    return fields
+
+
+class SortedIndex:
+    """Entity stems sorted by a numeric key, for range queries by bisection."""
+
+    def __init__(self, pairs: Iterable[Tuple[float, str]]):
+        """Sort (key, stem) pairs."""
+        ordered = sorted(pairs)
+        self.keys = array("d", (key for key, _ in ordered))
+        self.stems = [stem for _, stem in ordered]
+
+    def __len__(self) -> int:
+        """Number of indexed entities."""
+        return len(self.stems)
+
+    def between(
+        self, lo: Optional[float] = None, hi: Optional[float] = None
+    ) -> List[str]:
+        """Return stems whose key is in [lo, hi], in key order."""
+        start = 0 if lo is None else bisect_left(self.keys, lo)
+        end = len(self.keys) if hi is None else bisect_right(self.keys, hi)
+        return self.stems[start:end]
+
+
+# Index name -> (field, numeric value of a parsed field or None)
+_INDEXES = {
+    "duration.seconds": ("duration", lambda d: d.seconds),
+    "setupTime.seconds": ("setupTime", lambda d: d.seconds),
+    "range.metres": ("range", lambda r: r.metres),
+    "range.band": ("range", lambda r: band_rank(r.band) if r.band else None),
+}
+
+
+class NormalizedData:
+    """Parsed numeric fields of spells and items, with sorted indexes."""
+
+    def __init__(self, objects_dir: Path = Path("objects")):
+        """Parse every spell and item once."""
+        self.fields: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.indexes: Dict[Tuple[str, str], SortedIndex] = {}
+        for category in ("spells", "items"):
+            parsed = {
+                stem: normalize_entity(category, entity)
+                for stem, entity in load_category(objects_dir, category).items()
+            }
+            self.fields[category] = {stem: f for stem, f in parsed.items() if f}
+            for name, (field, value_of) in _INDEXES.items():
+                pairs = []
+                for stem, values in self.fields[category].items():
+                    value = value_of(values[field]) if field in values else None
+                    if value is not None:
+                        pairs.append((float(value), stem))
+                if pairs:
+                    self.indexes[(category, name)] = SortedIndex(pairs)
+
+    def get(self, category: str, stem: str) -> Dict[str, Any]:
+        """Return the parsed fields of an entity."""
+        return self.fields.get(category, {}).get(stem, {})
+
+    def query(
+        self,
+        category: str,
+        index: str,
+        lo: Optional[float] = None,
+        hi: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Return stems whose indexed value lies in [lo, hi].
+
+        Args:
+            category: "spells" or "items"
+            index: One of "duration.seconds", "setupTime.seconds",
+                "range.metres" or "range.band" (values are band_rank numbers)
+            lo: Inclusive lower bound, or None
+            hi: Inclusive upper bound, or None
+        """
+        sorted_index = self.indexes.get((category, index))
+        return [] if sorted_index is None else sorted_index.between(lo, hi)
+
+    def with_kind(self, category: str, field: str, kind: str) -> List[str]:
+        """Return stems whose duration-like field has a given kind."""
+        return sorted(
+            stem
+            for stem, values in self.fields.get(category, {}).items()
+            if field in values and getattr(values[field], "kind", None) == kind
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return every parsed field as JSON-ready data."""
+        return {
+            category: {
+                stem: {field: value.to_json() for field, value in values.items()}
+                for stem, values in sorted(entities.items())
+            }
+            for category, entities in self.fields.items()
+        }
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Normalize durations and ranges")
+    parser.add_argument("--objects", default="objects", help="Objects directory")
+    parser.add_argument(
+        "--output", default="dist/normalized.json", help="Output JSON file"
+    )
+    args = parser.parse_args()
+
+    data = NormalizedData(Path(args.objects))
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(data.to_json(), f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    unparsed = [
+        f"{category}/{stem}.{field}: {value.text}"
+        for category, entities in data.fields.items()
+        for stem, values in sorted(entities.items())
+        for field, value in values.items()
+        if getattr(value, "band", "") is None
+        or getattr(value, "kind", "") == "variable"
+    ]
+    print(f"Wrote {output}; {len(unparsed)} values without a numeric form")
+    for line in unparsed:
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Exact probabilities for Troika! tests and damage rolls.
+
+Distributions are computed by convolution with Fraction arithmetic, then
+cached in lookup tables covering every realistic skill total so live odds in a
+UI are a single indexed read.
+
+Rules modelled:
+- Roll-under tests (skill and luck): succeed on 2d6 <= target, except that a
+  double 1 always succeeds and a double 6 always fails.
+- Roll-versus tests: both sides roll 2d6 + total, the higher result wins.
+- Damage: roll d6 + modifier - armour (minimum 1) and read the damage table,
+  where every roll of 7 or more uses the "7+" column.
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+Distribution = Dict[int, Fraction]
+
+# Totals covered by the precomputed tables. Character totals top out around
+# skill 6 + rank 12; enemies reach skill 20 and modifiers push a little further.
+MAX_TOTAL = 30
+DAMAGE_COLUMNS = ("1", "2", "3", "4", "5", "6", "7+")
+
+
+def uniform(sides: int) -> Distribution:
+    """Distribution of a single die."""
+    return {face: Fraction(1, sides) for face in range(1, sides + 1)}
+
+
+def convolve(first: Distribution, second: Distribution) -> Distribution:
+    """Distribution of the sum of two independent outcomes."""
+    result: Distribution = {}
+    for a, pa in first.items():
+        for b, pb in second.items():
+            result[a + b] = result.get(a + b, Fraction(0)) + pa * pb
+    return result
+
+
+def convolve_power(dist: Distribution, times: int) -> Distribution:
+    """Distribution of the sum of `times` independent draws from `dist`."""
+    result: Distribution = {0: Fraction(1)}
+    base = dist
+    while times:
+        if times & 1:
+            result = convolve(result, base)
+        times >>= 1
+        if times:
+            base = convolve(base, base)
+    return result
+
+
+def negate(dist: Distribution) -> Distribution:
+    """Distribution of the negated outcome."""
+    return {-value: p for value, p in dist.items()}
+
+
+D6 = uniform(6)
+TWO_D6 = convolve(D6, D6)
+# Distribution of one 2d6 roll minus another, used for roll-versus tests.
+TWO_D6_DIFFERENCE = convolve(TWO_D6, negate(TWO_D6))
+
+
+def _roll_under_exact(target: int) -> Fraction:
+    """Probability of passing a roll-under test against `target`."""
+    always = Fraction(1, 36)  # double 1
+    middle = sum(
+        (p for total, p in TWO_D6.items() if 3 <= total <= 11 and total <= target),
+        Fraction(0),
+    )
+    return always + middle
+
+
+def _roll_versus_exact(margin: int) -> Tuple[Fraction, Fraction, Fraction]:
+    """(win, tie, lose) for a roll-versus test where our total exceeds theirs by `margin`."""
+    win = tie = Fraction(0)
+    for difference, p in TWO_D6_DIFFERENCE.items():
+        result = difference + margin
+        if result > 0:
+            win += p
+        elif result == 0:
+            tie += p
+    return win, tie, 1 - win - tie
+
+
+ROLL_UNDER_TABLE: Tuple[Fraction, ...] = tuple(
+    _roll_under_exact(target) for target in range(MAX_TOTAL + 1)
+)
+ROLL_VERSUS_TABLE: Tuple[Tuple[Fraction, Fraction, Fraction], ...] = tuple(
+    _roll_versus_exact(margin) for margin in range(-MAX_TOTAL, MAX_TOTAL + 1)
+)
+_ROLL_UNDER_FLOATS = tuple(float(p) for p in ROLL_UNDER_TABLE)
+_ROLL_VERSUS_FLOATS = tuple(tuple(float(p) for p in row) for row in ROLL_VERSUS_TABLE)
+
+
+def roll_under(target: int) -> Fraction:
+    """Exact chance of passing a roll-under test (skill or luck) against `target`."""
+    return ROLL_UNDER_TABLE[min(max(target, 0), MAX_TOTAL)]
+
+
+def roll_versus(ours: int, theirs: int) -> Tuple[Fraction, Fraction, Fraction]:
+    """Exact (win, tie, lose) chances for 2d6 + ours against 2d6 + theirs."""
+    margin = min(max(ours - theirs, -MAX_TOTAL), MAX_TOTAL)
+    return ROLL_VERSUS_TABLE[margin + MAX_TOTAL]
+
+
+def roll_under_many(targets: Iterable[int]) -> List[float]:
+    """Batch roll-under odds as floats, suitable for display."""
+    table = _ROLL_UNDER_FLOATS
+    return [table[min(max(target, 0), MAX_TOTAL)] for target in targets]
+
+
+def roll_versus_many(
+    pairs: Iterable[Tuple[int, int]],
+) -> List[Tuple[float, float, float]]:
+    """Batch (win, tie, lose) odds as floats for (ours, theirs) total pairs."""
+    table = _ROLL_VERSUS_FLOATS
+    return [
+        table[min(max(ours - theirs, -MAX_TOTAL), MAX_TOTAL) + MAX_TOTAL]
+        for ours, theirs in pairs
+    ]
+
+
+def consecutive_luck_tests(luck: int, count: int) -> Fraction:
+    """Chance of passing `count` luck tests in a row, losing 1 Luck after each."""
+    result = Fraction(1)
+    for spent in range(count):
+        result *= roll_under(luck - spent)
+    return result
+
+
+def damage_row(mapping: Mapping[str, Any]) -> Tuple[int, ...]:
+    """Convert a {"1": .., "7+": ..} damage mapping into a 7-tuple."""
+    return tuple(int(mapping[column]) for column in DAMAGE_COLUMNS)
+
+
+def damage_row_from_table(table: Mapping[str, Any], weapon: str) -> Tuple[int, ...]:
+    """Read a weapon's row from a damage table document (objects/tables/*)."""
+    return damage_row(table["damageMatrix"]["matrix"][weapon])
+
+
+@lru_cache(maxsize=4096)
+def _damage_distribution(
+    row: Tuple[int, ...], modifier: int, armour: int
+) -> Tuple[Tuple[int, Fraction], ...]:
+    """Cached damage distribution for one hit, as immutable (damage, p) pairs."""
+    result: Distribution = {}
+    for face, p in D6.items():
+        column = min(max(face + modifier - armour, 1), 7) - 1
+        damage = row[column]
+        result[damage] = result.get(damage, Fraction(0)) + p
+    return tuple(sorted(result.items()))
+
+
+@lru_cache(maxsize=4096)
+def _damage_over_hits(
+    row: Tuple[int, ...], hits: int, modifier: int, armour: int
+) -> Tuple[Tuple[int, Fraction], ...]:
+    """Cached total damage over `hits` hits, as immutable (damage, p) pairs."""
+    one_hit = dict(_damage_distribution(row, modifier, armour))
+    return tuple(sorted(convolve_power(one_hit, hits).items()))
+
+
+def damage_distribution(
+    row: Tuple[int, ...], modifier: int = 0, armour: int = 0
+) -> Distribution:
+    """
+    Exact damage distribution for one hit.
+
+    Args:
+        row: Damage values for rolls 1-6 and 7+, see damage_row()
+        modifier: Bonus added to the d6 damage roll
+        armour: Armour value subtracted from the damage roll
+
+    Returns:
+        Mapping of damage dealt to probability; a new dict on every call, so
+        callers may modify it
+    """
+    return dict(_damage_distribution(row, modifier, armour))
+
+
+def damage_over_hits(
+    row: Tuple[int, ...], hits: int, modifier: int = 0, armour: int = 0
+) -> Distribution:
+    """Exact distribution of total damage over `hits` independent hits."""
+    return dict(_damage_over_hits(row, hits, modifier, armour))
+
+
+def expected_value(dist: Distribution) -> Fraction:
+    """Mean of a distribution."""
+    return sum((value * p for value, p in dist.items()), Fraction(0))
+
+
+def at_least(dist: Distribution, threshold: int) -> Fraction:
+    """Probability that an outcome is at least `threshold`."""
+    return sum((p for value, p in dist.items() if value >= threshold), Fraction(0))
+
+
+def hits_to_defeat(
+    row: Tuple[int, ...],
+    stamina: int,
+    max_hits: int,
+    modifier: int = 0,
+    armour: int = 0,
+) -> List[Fraction]:
+    """Chance that `stamina` is exhausted within 1..max_hits hits."""
+    return [
+        at_least(damage_over_hits(row, hits, modifier, armour), stamina)
+        for hits in range(1, max_hits + 1)
+    ]
+
+
+def damage_many(
+    rows: Sequence[Tuple[int, ...]], modifier: int = 0, armour: int = 0
+) -> List[float]:
+    """Batch expected damage per hit, as floats, for several damage rows."""
+    return [
+        float(expected_value(damage_distribution(row, modifier, armour)))
+        for row in rows
+    ]
@@ -0,0 +1,227 @@
+"""
+Hot-reloadable dataset for long-running processes.
+
+ReloadableDataset holds an immutable Snapshot of objects/: the entities of
+every category plus a name index. A background thread watches objects/
+(troika.watch) and, when files change, builds the next snapshot from the
+current one. It re-parses only the changed files and shares every other
+entity and category with the previous version. The new snapshot is then
+published with a single attribute assignment.
+
+Readers never lock. They take one snapshot and read from it, so a request
+sees one consistent version even if a reload finishes in the middle:
+
+    dataset = ReloadableDataset(Path("objects")).start()
+    snap = dataset.snapshot
+    enemy = snap.get("enemies", "alzabo")
+    stem = snap.find("spells", "Affix")
+
+A file that fails to parse (e.g. caught half-written) keeps its previous
+version and is listed in Snapshot.errors until it parses again.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .data import CATEGORIES, iter_entity_files, load_entity, name_index, name_key
+from .watch import create_watcher
+
+Key = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One immutable version of the dataset."""
+
+    version: int
+    entities: Mapping[str, Mapping[str, Dict[str, Any]]]
+    names: Mapping[str, Mapping[str, str]]
+    errors: Mapping[Key, str] = field(default_factory=lambda: MappingProxyType({}))
+
+    def get(self, category: str, stem: str) -> Optional[Dict[str, Any]]:
+        """Return an entity by file stem."""
+        return self.entities.get(category, {}).get(stem)
+
+    def find(self, category: str, name: str) -> Optional[str]:
+        """Return the stem of the entity with a given name (case-insensitive)."""
+        return self.names.get(category, {}).get(name.casefold())
+
+    def category(self, category: str) -> Mapping[str, Dict[str, Any]]:
+        """Return every entity of a category, keyed by file stem."""
+        return self.entities.get(category, MappingProxyType({}))
+
+
+class ReloadableDataset:
+    """Dataset handle that swaps in a new snapshot when objects/ changes."""
+
+    def __init__(
+        self,
+        objects_dir: Path = Path("objects"),
+        poll: bool = False,
+        on_reload: Optional[Callable[[Snapshot], None]] = None,
+    ):
+        """
+        Load the first snapshot.
+
+        Args:
+            objects_dir: Data directory to load and watch
+            poll: Use the polling watcher instead of inotify
+            on_reload: Called with each new snapshot after it is published
+        """
+        self.objects_dir = Path(objects_dir).resolve()
+        self.poll = poll
+        self.on_reload = on_reload
+        self.snapshot = self._build_full(0)
+        # Serializes writers only; readers never take it
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _key(self, path: Path) -> Optional[Key]:
+        """Map a file path to (category, stem), or None if it is not an entity."""
+        path = Path(path).resolve()
+        if path.suffix != ".json" or path.parent.parent != self.objects_dir:
+            return None
+        category = path.parent.name
+        return (category, path.stem) if category in CATEGORIES else None
+
+    def _build_full(self, version: int) -> Snapshot:
+        """Load every entity from scratch."""
+        entities: Dict[str, Dict[str, Dict[str, Any]]] = {c: {} for c in CATEGORIES}
+        errors: Dict[Key, str] = {}
+        for category, path in iter_entity_files(self.objects_dir):
+            try:
+                entities[category][path.stem] = load_entity(path)
+            except (OSError, ValueError) as e:
+                errors[(category, path.stem)] = str(e)
+        return Snapshot(
+            version=version,
+            entities=MappingProxyType(
+                {c: MappingProxyType(items) for c, items in entities.items()}
+            ),
+            names=MappingProxyType(
+                {
+                    c: MappingProxyType(name_index(items))
+                    for c, items in entities.items()
+                }
+            ),
+            errors=MappingProxyType(errors),
+        )
+
+    def _build_next(self, current: Snapshot, keys: Iterable[Key]) -> Snapshot:
+        """Build the next snapshot, re-reading only the given entities."""
+        entities = dict(current.entities)
+        names = dict(current.names)
+        errors = dict(current.errors)
+        by_category: Dict[str, List[str]] = {}
+        for category, stem in keys:
+            by_category.setdefault(category, []).append(stem)
+
+        for category, stems in by_category.items():
+            items = dict(current.category(category))
+            index = dict(current.names.get(category, {}))
+            rebuild_names = False
+            for stem in stems:
+                path = self.objects_dir / category / f"{stem}.json"
+                old = items.get(stem)
+                try:
+                    new = load_entity(path)
+                except FileNotFoundError:
+                    items.pop(stem, None)
+                    errors.pop((category, stem), None)
+                    new = None
+                except (OSError, ValueError) as e:
+                    errors[(category, stem)] = str(e)
+                    continue
+                else:
+                    items[stem] = new
+                    errors.pop((category, stem), None)
+                old_name, new_name = name_key(old), name_key(new)
+                if old_name == new_name:
+                    continue
+                if old_name is not None and index.get(old_name) == stem:
+                    # Another entity may share the name; rebuild to find it
+                    rebuild_names = True
+                if new_name is not None and stem <= index.get(new_name, stem):
+                    index[new_name] = stem
+            if rebuild_names:
+                index = name_index(items)
+            entities[category] = MappingProxyType(items)
+            names[category] = MappingProxyType(index)
+
+        return Snapshot(
+            version=current.version + 1,
+            entities=MappingProxyType(entities),
+            names=MappingProxyType(names),
+            errors=MappingProxyType(errors),
+        )
+
+    def _publish(self, snapshot: Snapshot) -> Snapshot:
+        """Make a snapshot current (a single atomic reference assignment)."""
+        self.snapshot = snapshot
+        if self.on_reload is not None:
+            self.on_reload(snapshot)
+        return snapshot
+
+    def apply_changes(self, paths: Iterable[Path]) -> Snapshot:
+        """Rebuild the entities behind changed paths and publish a new snapshot."""
+        paths = [Path(p).resolve() for p in paths]
+        with self._write_lock:
+            current = self.snapshot
+            if self.objects_dir in paths:
+                # Events were lost; rescan everything
+                return self._publish(self._build_full(current.version + 1))
+            keys = {key for key in map(self._key, paths) if key is not None}
+            for path in paths:
+                if path.parent == self.objects_dir and not path.exists():
+                    # A removed category directory removes all of its entities
+                    keys.update(
+                        (path.name, stem) for stem in current.category(path.name)
+                    )
+            if not keys:
+                return current
+            return self._publish(self._build_next(current, sorted(keys)))
+
+    def reload(self) -> Snapshot:
+        """Reload everything and publish a new snapshot."""
+        with self._write_lock:
+            return self._publish(self._build_full(self.snapshot.version + 1))
+
+    def _watch(self, watcher) -> None:
+        """Apply watcher events until stopped."""
+        try:
+            while not self._stop.is_set():
+                changed = watcher.wait(timeout=0.5)
+                if changed:
+                    self.apply_changes(changed)
+        finally:
+            watcher.close()
+
+    def start(self) -> "ReloadableDataset":
+        """Start watching objects/ in a background thread."""
+        if self._thread is None:
+            watcher = create_watcher([self.objects_dir], poll=self.poll)
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._watch, args=(watcher,), daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background watcher."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ReloadableDataset":
+        """Start watching."""
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        """Stop watching."""
+        self.stop()
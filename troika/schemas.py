@@ -0,0 +1,197 @@
+"""
+Pre-flattened schemas for faster validation.
+
+flatten() replaces every internal "#/..." $ref with the schema it points to,
+so validators do not resolve JSON pointers while evaluating documents. In
+draft-07 a $ref makes the validator ignore its sibling keywords, so the
+whole {"$ref": ...} node is replaced. References that are recursive,
+unresolvable or external (e.g. "troika-item") are left as they are, which
+keeps validation results identical to the source schema.
+
+Identical subschemas are then shared as a single object, which keeps
+schemas with repeated definitions (e.g. inventoryItem) small in memory.
+
+load_flattened() caches the flattened form in memory and, when given a cache
+directory (the command line uses DEFAULT_CACHE_DIR), on disk, keyed by a hash
+of the source file, so a schema is only flattened again when it changes.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import unquote
+
+# Bump when flatten() changes so stale cache files are ignored.
+FLATTEN_VERSION = 1
+DEFAULT_CACHE_DIR = Path(".troika-cache") / "schemas"
+
+# Keywords whose values are data, not subschemas.
+_DATA_KEYWORDS = frozenset(["const", "default", "enum", "examples"])
+
+_memory_cache: Dict[str, Any] = {}
+
+
+def resolve_pointer(schema: Any, ref: str) -> Any:
+    """
+    Resolve an internal reference such as "#/definitions/weapon".
+
+    Raises:
+        LookupError: If the pointer does not resolve
+    """
+    node = schema
+    pointer = unquote(ref[1:])
+    if not pointer:
+        return node
+    for token in pointer.lstrip("/").split("/"):
+        token = token.replace("~1", "/").replace("~0", "~")
+        if isinstance(node, list):
+            try:
+                node = node[int(token)]
+            except (ValueError, IndexError):
+                raise LookupError(ref) from None
+        elif isinstance(node, dict) and token in node:
+            node = node[token]
+        else:
+            raise LookupError(ref)
+    return node
+
+
+def _has_internal_refs(node: Any) -> bool:
+    """Check whether any internal $ref remains in a schema."""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith("#"):
+            return True
+        return any(
+            _has_internal_refs(v) for k, v in node.items() if k not in _DATA_KEYWORDS
+        )
+    if isinstance(node, list):
+        return any(_has_internal_refs(item) for item in node)
+    return False
+
+
+def dedupe(node: Any, table: Optional[Dict[Any, Any]] = None) -> Any:
+    """
+    Share identical subtrees of a JSON document as a single object.
+
+    Subtrees are keyed by their children's identities (after deduplication)
+    and key order, so the work is linear in the size of the document.
+    """
+    if table is None:
+        table = {}
+    if isinstance(node, dict):
+        children = {k: dedupe(v, table) for k, v in node.items()}
+        key = ("d",) + tuple((k, id(v)) for k, v in children.items())
+        return table.setdefault(key, children)
+    if isinstance(node, list):
+        children = [dedupe(item, table) for item in node]
+        key = ("l",) + tuple(id(v) for v in children)
+        return table.setdefault(key, children)
+    # bool, int and float compare equal to each other, so keep them apart
+    return table.setdefault((type(node).__name__, node), node)
+
+
+def flatten(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Inline the non-recursive internal references of a schema.
+
+    Returns a new schema; the source is not modified. "definitions" is kept
+    only while some internal $ref still needs it, and a $ref at the root is
+    not inlined.
+    """
+    resolved: Dict[str, Any] = {}
+
+    def visit(node: Any, active: frozenset, root: bool = False) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            # A root $ref stays, so recursive refs can still reach definitions
+            if isinstance(ref, str) and ref.startswith("#") and not root:
+                if ref in active:
+                    return dict(node)  # recursive reference
+                if ref not in resolved:
+                    try:
+                        target = resolve_pointer(schema, ref)
+                    except LookupError:
+                        return dict(node)
+                    resolved[ref] = visit(target, active | {ref})
+                return resolved[ref]
+            return {
+                k: v if k in _DATA_KEYWORDS else visit(v, active)
+                for k, v in node.items()
+            }
+        if isinstance(node, list):
+            return [visit(item, active) for item in node]
+        return node
+
+    flat = visit(schema, frozenset(), root=True)
+    if "definitions" in flat and not _has_internal_refs(
+        {k: v for k, v in flat.items() if k != "definitions"}
+    ):
+        del flat["definitions"]
+    return dedupe(flat)
+
+
+def source_hash(raw: bytes) -> str:
+    """Cache key of a schema source file."""
+    digest = hashlib.sha256(raw)
+    digest.update(f"\0flatten-v{FLATTEN_VERSION}".encode("ascii"))
+    return digest.hexdigest()
+
+
+def load_flattened(
+    schema_file: Path, cache_dir: Optional[Path] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Load a schema file and its flattened form.
+
+    Args:
+        schema_file: Source *.schema.json file
+        cache_dir: Directory for cached flattened schemas, or None (the
+            default) to keep them in memory only
+
+    Returns:
+        Tuple of (source schema, flattened schema)
+    """
+    raw_bytes = Path(schema_file).read_bytes()
+    schema = json.loads(raw_bytes)
+    key = source_hash(raw_bytes)
+    if key in _memory_cache:
+        return schema, _memory_cache[key]
+
+    flat = None
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = Path(cache_dir) / f"{Path(schema_file).name}.{key[:16]}.json"
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                flat = dedupe(json.load(f))
+        except (OSError, ValueError):
+            flat = None
+
+    if flat is None:
+        flat = flatten(schema)
+        if cache_file is not None:
+            _write_cache(cache_file, flat)
+
+    _memory_cache[key] = flat
+    return schema, flat
+
+
+def _write_cache(cache_file: Path, flat: Dict[str, Any]) -> None:
+    """Write a cache file atomically and drop older versions of it."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(flat, f, separators=(",", ":"))
+        os.replace(tmp, cache_file)
+        stem = cache_file.name.rsplit(".", 2)[0]
+        for old in cache_file.parent.glob(f"{stem}.*.json"):
+            if old != cache_file:
+                old.unlink(missing_ok=True)
+    except OSError:
+        # The cache is an optimization; a read-only checkout still works.
+        pass
@@ -0,0 +1,175 @@
+"""
+Fuzzy name lookup across the Troika! categories.
+
+Names are normalized before indexing and before each query:
+
+- Unicode folding: compatibility decomposition, accents dropped, casefolded
+- Dashes of every kind (-, –, —, ...) and other punctuation become spaces
+- Apostrophes are dropped, so "Knight's" and "Knights" match
+
+So "language - kurgan" finds "Language – Kurgan". Exact normalized matches
+come from a dict. Everything else goes through a trigram index: a query
+only scores the names that share at least one trigram with it, never the
+whole list, and candidates are ranked by trigram Jaccard similarity.
+Typos such as "Alzbo" still rank the right entity first.
+
+    index = build_index(Path("objects"))
+    index.search("alzbo")             # [Match("enemies", "alzabo", "Alzabo", 0.44), ...]
+    index.search("affix", "spells")
+"""
+
+import argparse
+import heapq
+import re
+import sys
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .data import load_category
+
+SEARCH_CATEGORIES = ("skills", "spells", "items", "enemies", "backgrounds")
+
+_APOSTROPHES = re.compile(r"['‘’ʼ`]")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize_name(name: str) -> str:
+    """Fold a name to lowercase ASCII-like words separated by single spaces."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    stripped = _APOSTROPHES.sub("", stripped.casefold())
+    return _SEPARATORS.sub(" ", stripped).strip()
+
+
+def trigrams(normalized: str) -> frozenset:
+    """Return the padded character trigrams of a normalized name."""
+    padded = f"  {normalized} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+@dataclass(frozen=True)
+class Match:
+    """One ranked search result."""
+
+    category: str
+    stem: str
+    name: str
+    score: float
+
+
+class NameIndex:
+    """Normalized-name and trigram index over entity names."""
+
+    def __init__(self, entries: Iterable[Tuple[str, str, str]] = ()):
+        """Index (category, stem, name) entries."""
+        self.entries: List[Tuple[str, str, str]] = []
+        self._grams: List[frozenset] = []
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for category, stem, name in entries:
+            self.add(category, stem, name)
+
+    def add(self, category: str, stem: str, name: str) -> None:
+        """Add one name to the index."""
+        entry_id = len(self.entries)
+        normalized = normalize_name(name)
+        grams = trigrams(normalized)
+        self.entries.append((category, stem, name))
+        self._grams.append(grams)
+        self._exact[normalized].append(entry_id)
+        for gram in grams:
+            self._postings[gram].append(entry_id)
+
+    def __len__(self) -> int:
+        """Number of indexed names."""
+        return len(self.entries)
+
+    def _match(self, entry_id: int, score: float) -> Match:
+        """Build a Match for an entry."""
+        category, stem, name = self.entries[entry_id]
+        return Match(category, stem, name, round(score, 4))
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        limit: int = 5,
+        min_score: float = 0.2,
+    ) -> List[Match]:
+        """
+        Return the best matches for a name, best first.
+
+        Args:
+            query: Name as typed by a user
+            category: Restrict results to one category
+            limit: Maximum number of results
+            min_score: Minimum trigram similarity (0-1) of fuzzy results
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        exact = [
+            entry_id
+            for entry_id in self._exact.get(normalized, [])
+            if category is None or self.entries[entry_id][0] == category
+        ]
+        if len(exact) >= limit:
+            return [self._match(entry_id, 1.0) for entry_id in exact[:limit]]
+
+        grams = trigrams(normalized)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for entry_id in self._postings.get(gram, ()):
+                shared[entry_id] += 1
+        scored = []
+        for entry_id, count in shared.items():
+            if entry_id in exact:
+                continue
+            if category is not None and self.entries[entry_id][0] != category:
+                continue
+            score = count / (len(grams) + len(self._grams[entry_id]) - count)
+            if score >= min_score:
+                # Ties go to the shorter name, then to index order
+                scored.append((score, -len(self._grams[entry_id]), -entry_id))
+        best = heapq.nlargest(limit - len(exact), scored)
+        return [self._match(entry_id, 1.0) for entry_id in exact] + [
+            self._match(-negated_id, score) for score, _, negated_id in best
+        ]
+
+
+def build_index(
+    objects_dir: Path = Path("objects"), categories: Iterable[str] = SEARCH_CATEGORIES
+) -> NameIndex:
+    """Index the names of every entity in the given categories."""
+    index = NameIndex()
+    for category in categories:
+        for stem, entity in sorted(load_category(objects_dir, category).items()):
+            name = entity.get("name")
+            if isinstance(name, str):
+                index.add(category, stem, name)
+    return index
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Fuzzy search entity names")
+    parser.add_argument("query", help="Name to look up")
+    parser.add_argument("--category", choices=SEARCH_CATEGORIES, help="Category")
+    parser.add_argument("--limit", type=int, default=5, help="Maximum results")
+    parser.add_argument("--objects", default="objects", help="Objects directory")
+    args = parser.parse_args()
+
+    matches = build_index(Path(args.objects)).search(
+        args.query, args.category, args.limit
+    )
+    for match in matches:
+        print(f"{match.score:.2f}  {match.category}/{match.stem}  {match.name}")
+    if not matches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
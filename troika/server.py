@@ -0,0 +1,280 @@
+"""
+Asyncio HTTP data API for the Troika! dataset.
+
+The whole dataset is loaded once and every response body is rendered, hashed
+and gzip-compressed at startup, so a request is a dictionary lookup plus a
+socket write. Conditional requests are answered with strong ETags derived
+from the body hash.
+
+Routes:
+    GET /api                              category index with entity counts
+    GET /api/all                          every category in one document
+    GET /api/<category>                   {stem: entity} for one category
+    GET /api/<category>/<stem>            one entity
+    GET /api/schemas/<schema-id>          one schema from systems/
+    GET /objects/<category>/<stem>.json   the raw file, as on the static site
+
+Usage:
+    python -m troika.server [--host 127.0.0.1] [--port 8080]
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .data import CATEGORIES, iter_entity_files
+
+MAX_HEADER_BYTES = 16 * 1024
+# Bodies smaller than this are not worth compressing.
+MIN_GZIP_BYTES = 256
+
+
+@dataclass(frozen=True)
+class Resource:
+    """A precomputed response body with its gzip variant and ETags."""
+
+    body: bytes
+    etag: str
+    gzip_body: Optional[bytes]
+    gzip_etag: Optional[str]
+    content_type: str = "application/json; charset=utf-8"
+
+    @classmethod
+    def from_bytes(cls, body: bytes) -> "Resource":
+        """Hash and precompress a body."""
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        gzip_body = None
+        gzip_etag = None
+        if len(body) >= MIN_GZIP_BYTES:
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                gzip_body = compressed
+                gzip_etag = f'"{digest}-gz"'
+        return cls(body, f'"{digest}"', gzip_body, gzip_etag)
+
+    @classmethod
+    def from_json(cls, data: Any) -> "Resource":
+        """Render a JSON document compactly and precompute its variants."""
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return cls.from_bytes(text.encode("utf-8"))
+
+
+def build_routes(
+    objects_dir: Path = Path("objects"), schema_dir: Path = Path("systems")
+) -> Dict[str, Resource]:
+    """Load the dataset and render every route."""
+    routes: Dict[str, Resource] = {}
+    dataset: Dict[str, Dict[str, Any]] = {category: {} for category in CATEGORIES}
+
+    for category, path in iter_entity_files(objects_dir):
+        raw = path.read_bytes()
+        entity = json.loads(raw)
+        stem = path.stem
+        dataset[category][stem] = entity
+        routes[f"/objects/{category}/{path.name}"] = Resource.from_bytes(raw)
+        routes[f"/api/{category}/{stem}"] = Resource.from_json(entity)
+
+    for category, entities in dataset.items():
+        routes[f"/api/{category}"] = Resource.from_json(entities)
+    routes["/api/all"] = Resource.from_json(dataset)
+    routes["/api"] = Resource.from_json(
+        {category: len(entities) for category, entities in dataset.items()}
+    )
+
+    for schema_file in sorted(Path(schema_dir).glob("*.schema.json")):
+        raw = schema_file.read_bytes()
+        schema_id = json.loads(raw).get("$id", schema_file.stem.replace(".schema", ""))
+        routes[f"/api/schemas/{schema_id}"] = Resource.from_bytes(raw)
+    return routes
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+
+def _accepts_gzip(header: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows gzip.
+
+    An explicit gzip entry takes precedence over "*".
+    """
+    qualities: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if coding in ("gzip", "*"):
+            quality = params.strip()
+            try:
+                value = float(quality[2:]) if quality.startswith("q=") else 1.0
+            except ValueError:
+                value = 0.0
+            qualities.setdefault(coding, value)
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def _status_line(status: int) -> bytes:
+    """Render the HTTP status line."""
+    reasons = {
+        200: "OK",
+        304: "Not Modified",
+        400: "Bad Request",
+        404: "Not Found",
+        405: "Method Not Allowed",
+    }
+    return f"HTTP/1.1 {status} {reasons[status]}\r\n".encode("ascii")
+
+
+class DataServer:
+    """Serve precomputed routes over HTTP/1.1 with keep-alive."""
+
+    def __init__(self, routes: Dict[str, Resource]):
+        """Initialize with prebuilt routes (see build_routes)."""
+        self.routes = routes
+        self._not_found = Resource.from_json({"error": "not found"})
+
+    def respond(
+        self, method: str, target: str, headers: Dict[str, str]
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Compute the status, headers and body for a parsed request."""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD", "Content-Length": "0"}, b""
+
+        path = target.split("?", 1)[0]
+        if len(path) > 1:
+            path = path.rstrip("/")
+        resource = self.routes.get(path)
+        if resource is None:
+            body = self._not_found.body
+            return (
+                404,
+                {
+                    "Content-Type": self._not_found.content_type,
+                    "Content-Length": str(len(body)),
+                },
+                body if method == "GET" else b"",
+            )
+
+        use_gzip = resource.gzip_body is not None and _accepts_gzip(
+            headers.get("accept-encoding", "")
+        )
+        etag = resource.gzip_etag if use_gzip else resource.etag
+        body = resource.gzip_body if use_gzip else resource.body
+        response_headers = {
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "no-cache",
+        }
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None and _etag_matches(if_none_match, etag):
+            return 304, response_headers, b""
+
+        response_headers["Content-Type"] = resource.content_type
+        response_headers["Content-Length"] = str(len(body))
+        if use_gzip:
+            response_headers["Content-Encoding"] = "gzip"
+        return 200, response_headers, body if method == "GET" else b""
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve requests on one connection until it closes."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(_status_line(400) + b"Content-Length: 0\r\n\r\n")
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                parts = lines[0].split(" ")
+                if len(parts) != 3:
+                    writer.write(_status_line(400) + b"Content-Length: 0\r\n\r\n")
+                    break
+                method, target, version = parts
+                headers: Dict[str, str] = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    writer.write(_status_line(400) + b"Content-Length: 0\r\n\r\n")
+                    break
+                if length:
+                    await reader.readexactly(length)
+
+                status, response_headers, body = self.respond(method, target, headers)
+                connection = headers.get("connection", "").lower()
+                keep_alive = (
+                    connection != "close"
+                    if version == "HTTP/1.1"
+                    else connection == "keep-alive"
+                )
+                response_headers["Connection"] = "keep-alive" if keep_alive else "close"
+                head_out = _status_line(status) + "".join(
+                    f"{name}: {value}\r\n" for name, value in response_headers.items()
+                ).encode("latin-1")
+                writer.write(head_out + b"\r\n" + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.Server:
+        """Start listening and return the asyncio server."""
+        return await asyncio.start_server(
+            self.handle, host, port, limit=MAX_HEADER_BYTES
+        )
+
+
+async def serve(host: str, port: int, objects_dir: Path, schema_dir: Path) -> None:
+    """Build the routes and serve until cancelled."""
+    server = await DataServer(build_routes(objects_dir, schema_dir)).start(host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving Troika! data on {addresses}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Serve Troika! data over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8080, help="Port (default: 8080)")
+    parser.add_argument("--objects", default="objects", help="Objects directory")
+    parser.add_argument("--schema-dir", default="systems", help="Schema directory")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(
+            serve(args.host, args.port, Path(args.objects), Path(args.schema_dir))
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
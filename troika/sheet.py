@@ -0,0 +1,438 @@
+"""
+Incremental derived-stat engine for character sheets.
+
+A character document (systems/character.schema.json) is loaded into a small
+dependency graph. Raw fields become input nodes, derived values (skill totals,
+slots used, armour, effective stamina) become computed nodes, and per-item
+contributions are folded into aggregate nodes that update by delta. An edit
+marks only its dependents dirty and they are recomputed lazily on the next
+read, so adding one inventory item does not walk the rest of the sheet.
+"""
+
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Inventory size before a character is over-encumbered (character.schema.json).
+INVENTORY_LIMIT = 18
+SEVERITY_ORDER = ("minor", "moderate", "severe", "critical")
+
+
+class Aggregate(ABC):
+    """Keyed contributions folded into a single value."""
+
+    def __init__(self):
+        """Initialize an empty aggregate."""
+        self._parts: Dict[Any, Any] = {}
+
+    @abstractmethod
+    def put(self, key: Any, value: Any) -> None:
+        """Set the contribution for a key."""
+
+    @abstractmethod
+    def discard(self, key: Any) -> None:
+        """Remove the contribution for a key."""
+
+    @property
+    @abstractmethod
+    def value(self) -> Any:
+        """The folded value."""
+
+
+class SumAggregate(Aggregate):
+    """Sum of contributions, maintained by delta."""
+
+    def __init__(self):
+        """Initialize an empty sum."""
+        super().__init__()
+        self._total = 0
+
+    def put(self, key: Any, value: Any) -> None:
+        """Set the contribution for a key."""
+        self._total += value - self._parts.get(key, 0)
+        self._parts[key] = value
+
+    def discard(self, key: Any) -> None:
+        """Remove the contribution for a key."""
+        self._total -= self._parts.pop(key, 0)
+
+    @property
+    def value(self) -> Any:
+        """The current sum."""
+        return self._total
+
+
+class MaxAggregate(Aggregate):
+    """Maximum of contributions, kept as a multiset so removals are cheap."""
+
+    def __init__(self, default: Any = 0):
+        """Initialize an empty maximum with a default for no contributions."""
+        super().__init__()
+        self._counts: Counter = Counter()
+        self._default = default
+
+    def put(self, key: Any, value: Any) -> None:
+        """Set the contribution for a key."""
+        self.discard(key)
+        self._parts[key] = value
+        self._counts[value] += 1
+
+    def discard(self, key: Any) -> None:
+        """Remove the contribution for a key."""
+        if key in self._parts:
+            old = self._parts.pop(key)
+            self._counts[old] -= 1
+            if not self._counts[old]:
+                del self._counts[old]
+
+    @property
+    def value(self) -> Any:
+        """The current maximum (distinct values are few, so max() is cheap)."""
+        return max(self._counts) if self._counts else self._default
+
+
+class _Node:
+    """A graph node holding a value and its dependency links."""
+
+    __slots__ = ("name", "compute", "deps", "dependents", "value", "dirty")
+
+    def __init__(
+        self,
+        name: str,
+        compute: Optional[Callable[..., Any]] = None,
+        deps: Tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.compute = compute
+        self.deps = deps
+        self.dependents: set = set()
+        self.value: Any = None
+        self.dirty = compute is not None
+
+
+class DependencyGraph:
+    """Lazily evaluated dependency graph with dirty propagation."""
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        self._nodes: Dict[str, _Node] = {}
+        self._aggregates: Dict[str, Aggregate] = {}
+        self.recomputations = 0
+
+    def __contains__(self, name: str) -> bool:
+        """Check whether a node exists."""
+        return name in self._nodes
+
+    def add_input(self, name: str, value: Any) -> None:
+        """Add an input node."""
+        node = _Node(name)
+        node.value = value
+        self._nodes[name] = node
+
+    def add_aggregate(self, name: str, aggregate: Aggregate) -> None:
+        """Add an aggregate node fed by keyed contributions."""
+        self._aggregates[name] = aggregate
+        self.add_input(name, aggregate.value)
+
+    def add_derived(
+        self, name: str, deps: Iterable[str], compute: Callable[..., Any]
+    ) -> None:
+        """Add a computed node; compute receives the dependency values in order."""
+        node = _Node(name, compute, tuple(deps))
+        for dep in node.deps:
+            self._nodes[dep].dependents.add(name)
+        self._nodes[name] = node
+
+    def remove(self, name: str) -> None:
+        """Remove a node and everything derived from it."""
+        node = self._nodes.pop(name, None)
+        if node is None:
+            return
+        self._aggregates.pop(name, None)
+        for dep in node.deps:
+            if dep in self._nodes:
+                self._nodes[dep].dependents.discard(name)
+        for dependent in list(node.dependents):
+            self.remove(dependent)
+
+    def _invalidate(self, node: _Node) -> None:
+        """Mark everything downstream of a node dirty."""
+        stack = list(node.dependents)
+        nodes = self._nodes
+        while stack:
+            child = nodes[stack.pop()]
+            if not child.dirty:
+                child.dirty = True
+                stack.extend(child.dependents)
+
+    def set(self, name: str, value: Any) -> None:
+        """Change an input value."""
+        node = self._nodes[name]
+        if node.value != value:
+            node.value = value
+            self._invalidate(node)
+
+    def put(self, name: str, key: Any, value: Any) -> None:
+        """Set one contribution to an aggregate node."""
+        aggregate = self._aggregates[name]
+        aggregate.put(key, value)
+        self.set(name, aggregate.value)
+
+    def discard(self, name: str, key: Any) -> None:
+        """Remove one contribution from an aggregate node."""
+        aggregate = self._aggregates[name]
+        aggregate.discard(key)
+        self.set(name, aggregate.value)
+
+    def get(self, name: str) -> Any:
+        """Read a node, recomputing it and its dirty dependencies if needed."""
+        node = self._nodes[name]
+        if node.dirty:
+            node.value = node.compute(*(self.get(dep) for dep in node.deps))
+            node.dirty = False
+            self.recomputations += 1
+        return node.value
+
+
+def item_slots(item: Dict[str, Any], catalog_item: Optional[Dict[str, Any]]) -> int:
+    """Slots taken by an inventory entry, falling back to the item catalog."""
+    slots = item.get("slots")
+    if not isinstance(slots, int) and catalog_item:
+        slots = catalog_item.get("slots", catalog_item.get("encumbrance"))
+    return slots if isinstance(slots, int) else 1
+
+
+def item_armour(catalog_item: Optional[Dict[str, Any]]) -> Tuple[int, bool]:
+    """Return (protection, is_shield) for a catalog item."""
+    if not catalog_item or catalog_item.get("type") != "armor":
+        return 0, False
+    if catalog_item.get("armorType") == "shield" or "shield" in catalog_item.get(
+        "tags", []
+    ):
+        return 1, True
+    protection = catalog_item.get("armorValue")
+    if protection is None:
+        protection = catalog_item.get("armor", {}).get("protection", 0)
+    return protection, False
+
+
+def _severity_rank(condition: Dict[str, Any]) -> int:
+    """Index of a condition's severity in SEVERITY_ORDER (-1 when unset)."""
+    severity = condition.get("severity")
+    return SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else -1
+
+
+class CharacterSheet:
+    """Character sheet whose derived values are recomputed incrementally."""
+
+    def __init__(
+        self,
+        character: Dict[str, Any],
+        catalog: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """
+        Build the dependency graph for a character document.
+
+        Args:
+            character: Character document (troika-character)
+            catalog: Item documents (objects/items) used for slots and armour
+        """
+        self.graph = DependencyGraph()
+        self._catalog = {
+            item.get("name", stem).lower(): item
+            for stem, item in (catalog or {}).items()
+        }
+        self._items: Dict[int, Dict[str, Any]] = {}
+        self._next_item = 0
+        self._skills: Dict[str, Dict[str, Any]] = {}
+        self._conditions: Dict[int, Dict[str, Any]] = {}
+        self._next_condition = 0
+
+        attributes = character.get("attributes", {})
+        stamina = attributes.get("stamina", {})
+        luck = attributes.get("luck", {})
+        graph = self.graph
+        graph.add_input("skill", attributes.get("skill", 0))
+        graph.add_input("stamina.current", stamina.get("current", 0))
+        graph.add_input("stamina.maximum", stamina.get("maximum", 0))
+        graph.add_input("stamina.temporary", stamina.get("temporary", 0))
+        graph.add_input("luck.current", luck.get("current", 0))
+        graph.add_input("luck.maximum", luck.get("maximum", 0))
+        graph.add_aggregate("slots", SumAggregate())
+        graph.add_aggregate("bodyArmour", MaxAggregate())
+        graph.add_aggregate("shields", MaxAggregate())
+        graph.add_aggregate("conditionCount", SumAggregate())
+        graph.add_aggregate("worstCondition", MaxAggregate(default=-1))
+
+        graph.add_derived(
+            "stamina", ("stamina.current", "stamina.temporary"), int.__add__
+        )
+        graph.add_derived(
+            "staminaMaximum", ("stamina.maximum", "stamina.temporary"), int.__add__
+        )
+        graph.add_derived("luck", ("luck.current",), lambda current: current)
+        graph.add_derived("armour", ("bodyArmour", "shields"), int.__add__)
+        graph.add_derived(
+            "overEncumbered", ("slots",), lambda slots: slots > INVENTORY_LIMIT
+        )
+        graph.add_derived(
+            "severity",
+            ("worstCondition",),
+            lambda rank: SEVERITY_ORDER[rank] if rank >= 0 else None,
+        )
+
+        for skill in character.get("advancedSkills", []):
+            self.set_skill(
+                skill["name"], skill.get("rank", 0), skill.get("type", "skill")
+            )
+        for item in character.get("inventory", []):
+            self.add_item(item)
+        for condition in character.get("conditions", []):
+            self.add_condition(condition)
+
+    # Edits
+
+    def set_attribute(self, name: str, value: int) -> None:
+        """Set a raw attribute ("skill", "stamina.current", "luck.current", ...)."""
+        self.graph.set(name, value)
+
+    def set_skill(self, name: str, rank: int, skill_type: str = "skill") -> None:
+        """Add an advanced skill or change its rank."""
+        rank_node = f"rank:{name}"
+        if rank_node in self.graph:
+            self.graph.set(rank_node, rank)
+        else:
+            self.graph.add_input(rank_node, rank)
+            self.graph.add_derived(f"total:{name}", ("skill", rank_node), int.__add__)
+        self._skills[name] = {"name": name, "rank": rank, "type": skill_type}
+
+    def remove_skill(self, name: str) -> None:
+        """Remove an advanced skill."""
+        self.graph.remove(f"rank:{name}")
+        self._skills.pop(name, None)
+
+    def add_item(self, item: Dict[str, Any]) -> int:
+        """Add an inventory entry and return its handle."""
+        handle = self._next_item
+        self._next_item += 1
+        self._items[handle] = item
+        self._apply_item(handle, item)
+        return handle
+
+    def update_item(self, handle: int, **changes: Any) -> None:
+        """Change fields of an inventory entry."""
+        item = {**self._items[handle], **changes}
+        self._items[handle] = item
+        self._apply_item(handle, item)
+
+    def remove_item(self, handle: int) -> None:
+        """Remove an inventory entry."""
+        del self._items[handle]
+        for name in ("slots", "bodyArmour", "shields"):
+            self.graph.discard(name, handle)
+
+    def _apply_item(self, handle: int, item: Dict[str, Any]) -> None:
+        """Feed an entry's contributions into the aggregates."""
+        catalog_item = self._catalog.get(item.get("name", "").lower())
+        self.graph.put("slots", handle, item_slots(item, catalog_item))
+        protection, is_shield = item_armour(catalog_item)
+        if is_shield:
+            self.graph.discard("bodyArmour", handle)
+            if item.get("readyForUse"):
+                self.graph.put("shields", handle, protection)
+            else:
+                self.graph.discard("shields", handle)
+        else:
+            self.graph.discard("shields", handle)
+            if protection:
+                self.graph.put("bodyArmour", handle, protection)
+            else:
+                self.graph.discard("bodyArmour", handle)
+
+    def add_condition(self, condition: Dict[str, Any]) -> int:
+        """Add a condition and return its handle."""
+        handle = self._next_condition
+        self._next_condition += 1
+        self._conditions[handle] = condition
+        self.graph.put("conditionCount", handle, 1)
+        self.graph.put("worstCondition", handle, _severity_rank(condition))
+        return handle
+
+    def remove_condition(self, handle: int) -> None:
+        """Remove a condition."""
+        del self._conditions[handle]
+        self.graph.discard("conditionCount", handle)
+        self.graph.discard("worstCondition", handle)
+
+    # Reads
+
+    def get(self, name: str) -> Any:
+        """Read a derived value by node name (e.g. "armour", "total:Sneak")."""
+        return self.graph.get(name)
+
+    def skill_total(self, name: str) -> int:
+        """Skill + rank total for an advanced skill."""
+        return self.graph.get(f"total:{name}")
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Current inventory entries."""
+        return list(self._items.values())
+
+    def derived(self) -> Dict[str, Any]:
+        """All derived values, in the same shape as derive()."""
+        get = self.graph.get
+        return {
+            "skillTotals": {name: get(f"total:{name}") for name in self._skills},
+            "slotsUsed": get("slots"),
+            "overEncumbered": get("overEncumbered"),
+            "armour": get("armour"),
+            "stamina": get("stamina"),
+            "staminaMaximum": get("staminaMaximum"),
+            "luck": get("luck"),
+            "conditionCount": get("conditionCount"),
+            "worstCondition": get("severity"),
+        }
+
+
+def derive(
+    character: Dict[str, Any], catalog: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Compute every derived value from scratch (the non-incremental reference)."""
+    by_name = {
+        item.get("name", stem).lower(): item for stem, item in (catalog or {}).items()
+    }
+    attributes = character.get("attributes", {})
+    stamina = attributes.get("stamina", {})
+    luck = attributes.get("luck", {})
+    skill = attributes.get("skill", 0)
+
+    slots = 0
+    body = 0
+    shield = 0
+    for item in character.get("inventory", []):
+        catalog_item = by_name.get(item.get("name", "").lower())
+        slots += item_slots(item, catalog_item)
+        protection, is_shield = item_armour(catalog_item)
+        if is_shield:
+            if item.get("readyForUse"):
+                shield = max(shield, protection)
+        else:
+            body = max(body, protection)
+
+    conditions = character.get("conditions", [])
+    worst = max((_severity_rank(c) for c in conditions), default=-1)
+    temporary = stamina.get("temporary", 0)
+    return {
+        "skillTotals": {
+            s["name"]: skill + s.get("rank", 0)
+            for s in character.get("advancedSkills", [])
+        },
+        "slotsUsed": slots,
+        "overEncumbered": slots > INVENTORY_LIMIT,
+        "armour": body + shield,
+        "stamina": stamina.get("current", 0) + temporary,
+        "staminaMaximum": stamina.get("maximum", 0) + temporary,
+        "luck": luck.get("current", 0),
+        "conditionCount": len(conditions),
+        "worstCondition": SEVERITY_ORDER[worst] if worst >= 0 else None,
+    }
@@ -0,0 +1,276 @@
+"""
+"Similar entities" recommendations from TF-IDF vectors.
+
+Each entity becomes a sparse TF-IDF vector over three kinds of terms:
+
+    words       description words (normalized, minus common stop words)
+    tag:<t>     each tag, habitat and requirement
+    <field>:<v> structured fields, bucketed where they vary continuously:
+                spell cost and test type, enemy skill/stamina/armour/damage,
+                item type, slots and weapon category
+
+Field and tag terms carry extra weight because they are few. Vectors are
+L2-normalized. Cosine similarity is computed through an inverted index, so
+each entity is scored only against entities it shares a term with.
+
+The build precomputes the top k neighbours of every entity, within its
+category, and stores them as flat `array` buffers: uint32 neighbour rows
+and float32 scores, k slots per entity. A lookup is then one slice of
+each array:
+
+    python -m troika.similarity build --out dist/similarity
+    index = SimilarityIndex.load(Path("dist/similarity"))
+    index.similar("spells", "affix")    # [("animate", 0.2636), ...]
+"""
+
+import argparse
+import heapq
+import json
+import math
+import sys
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .data import load_category
+from .search import normalize_name
+
+FORMAT_VERSION = 1
+DEFAULT_K = 10
+SIMILARITY_CATEGORIES = ("spells", "enemies", "items", "skills", "backgrounds")
+
+# Marks an unused neighbour slot
+NO_NEIGHBOUR = 0xFFFFFFFF
+
+# Weight of a field or tag term relative to one description word
+FIELD_WEIGHT = 3.0
+
+_STOP_WORDS = frozenset(
+    (
+        "a an and are as at be by can for from has have in into is it its of on "
+        "or that the their them they this to was were which while who will with "
+        "you your if not no any all but so than then there these those when "
+        "where"
+    ).split()
+)
+
+
+def _band(value: Any, width: int) -> str:
+    """Bucket a number, e.g. stamina 21 -> "20-29" for width 10."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return str(value)
+    low = int(value // width * width)
+    return f"{low}-{low + width - 1}"
+
+
+def entity_terms(category: str, entity: Dict[str, Any]) -> Counter:
+    """Return the weighted term counts of one entity."""
+    terms: Counter = Counter()
+    description = entity.get("description")
+    if isinstance(description, str):
+        for word in normalize_name(description).split():
+            if word not in _STOP_WORDS and len(word) > 2:
+                terms[word] += 1
+    for key in ("tags", "habitat", "requirements"):
+        for tag in entity.get(key, []) or []:
+            if isinstance(tag, str):
+                terms[f"tag:{normalize_name(tag)}"] += FIELD_WEIGHT
+
+    fields: Dict[str, Any] = {}
+    if category == "spells":
+        fields = {"cost": entity.get("cost"), "test": entity.get("testType")}
+    elif category == "enemies":
+        stats = entity.get("stats") if isinstance(entity.get("stats"), dict) else {}
+        fields = {
+            "skill": _band(stats.get("skill"), 2),
+            "stamina": _band(stats.get("stamina"), 10),
+            "armour": stats.get("armor"),
+            "damage": stats.get("damage"),
+        }
+    elif category == "items":
+        weapon = entity.get("weapon") if isinstance(entity.get("weapon"), dict) else {}
+        fields = {
+            "type": entity.get("type"),
+            "slots": entity.get("slots"),
+            "weapon": weapon.get("category"),
+        }
+    for field, value in fields.items():
+        if value is not None and value != "None":
+            terms[f"{field}:{normalize_name(str(value))}"] += FIELD_WEIGHT
+    return terms
+
+
+def tfidf_vectors(documents: List[Counter]) -> List[Dict[str, float]]:
+    """Turn term counts into L2-normalized TF-IDF vectors."""
+    frequency: Counter = Counter()
+    for terms in documents:
+        frequency.update(terms.keys())
+    total = len(documents)
+    vectors = []
+    for terms in documents:
+        vector = {
+            term: (1 + math.log(count)) * math.log((1 + total) / (1 + frequency[term]))
+            for term, count in terms.items()
+        }
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        vectors.append({t: w / norm for t, w in vector.items() if w} if norm else {})
+    return vectors
+
+
+def top_neighbours(
+    vectors: List[Dict[str, float]], k: int
+) -> List[List[Tuple[int, float]]]:
+    """Return the k most similar rows of every vector (cosine, best first)."""
+    postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+    for row, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            postings[term].append((row, weight))
+    neighbours = []
+    for row, vector in enumerate(vectors):
+        scores: Dict[int, float] = defaultdict(float)
+        for term, weight in vector.items():
+            for other, other_weight in postings[term]:
+                if other != row:
+                    scores[other] += weight * other_weight
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        neighbours.append([(other, score) for other, score in best if score > 0])
+    return neighbours
+
+
+class SimilarityIndex:
+    """Precomputed top-k neighbours per category in flat arrays."""
+
+    def __init__(self, k: int = DEFAULT_K):
+        """Create an empty index with k neighbour slots per entity."""
+        self.k = k
+        self.stems: Dict[str, List[str]] = {}
+        self.rows: Dict[str, Dict[str, int]] = {}
+        self.neighbours: Dict[str, array] = {}
+        self.scores: Dict[str, array] = {}
+
+    @classmethod
+    def build(
+        cls,
+        objects_dir: Path = Path("objects"),
+        categories: Iterable[str] = SIMILARITY_CATEGORIES,
+        k: int = DEFAULT_K,
+    ) -> "SimilarityIndex":
+        """Vectorize every entity and precompute its neighbours."""
+        index = cls(k)
+        for category in categories:
+            entities = sorted(load_category(objects_dir, category).items())
+            vectors = tfidf_vectors(
+                [entity_terms(category, entity) for _, entity in entities]
+            )
+            rows = array("I", [NO_NEIGHBOUR]) * (len(entities) * k)
+            scores = array("f", [0.0]) * (len(entities) * k)
+            for row, found in enumerate(top_neighbours(vectors, k)):
+                for slot, (other, score) in enumerate(found):
+                    rows[row * k + slot] = other
+                    scores[row * k + slot] = score
+            index._add(category, [stem for stem, _ in entities], rows, scores)
+        return index
+
+    def _add(self, category: str, stems: List[str], rows: array, scores: array):
+        """Register the arrays of one category."""
+        self.stems[category] = stems
+        self.rows[category] = {stem: row for row, stem in enumerate(stems)}
+        self.neighbours[category] = rows
+        self.scores[category] = scores
+
+    def similar(
+        self, category: str, stem: str, limit: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Return (stem, cosine similarity) of the nearest entities."""
+        row = self.rows.get(category, {}).get(stem)
+        if row is None:
+            return []
+        start = row * self.k
+        end = start + min(self.k, self.k if limit is None else limit)
+        stems = self.stems[category]
+        return [
+            (stems[other], round(score, 4))
+            for other, score in zip(
+                self.neighbours[category][start:end], self.scores[category][start:end]
+            )
+            if other != NO_NEIGHBOUR
+        ]
+
+    def save(self, out_dir: Path) -> None:
+        """Write <category>.neighbours/.scores buffers and manifest.json."""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for category in self.stems:
+            with open(out_dir / f"{category}.neighbours", "wb") as f:
+                self.neighbours[category].tofile(f)
+            with open(out_dir / f"{category}.scores", "wb") as f:
+                self.scores[category].tofile(f)
+        manifest = {
+            "format": FORMAT_VERSION,
+            "k": self.k,
+            "byteorder": sys.byteorder,
+            "stems": self.stems,
+        }
+        with open(out_dir / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, out_dir: Path) -> "SimilarityIndex":
+        """
+        Read an index written by save().
+
+        Raises:
+            ValueError: If the format version is not supported
+        """
+        out_dir = Path(out_dir)
+        with open(out_dir / "manifest.json", "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported similarity format: {manifest.get('format')}")
+        index = cls(manifest["k"])
+        for category, stems in manifest["stems"].items():
+            buffers = []
+            for suffix, typecode in (("neighbours", "I"), ("scores", "f")):
+                values = array(typecode)
+                with open(out_dir / f"{category}.{suffix}", "rb") as f:
+                    values.fromfile(f, len(stems) * index.k)
+                if manifest["byteorder"] != sys.byteorder:
+                    values.byteswap()
+                buffers.append(values)
+            index._add(category, stems, *buffers)
+        return index
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Similar entity recommendations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Precompute neighbours")
+    build_parser.add_argument("--objects", default="objects", help="Objects directory")
+    build_parser.add_argument("--out", default="dist/similarity", help="Output dir")
+    build_parser.add_argument("--k", type=int, default=DEFAULT_K, help="Neighbours")
+    show_parser = subparsers.add_parser("show", help="Show neighbours of an entity")
+    show_parser.add_argument("category", choices=SIMILARITY_CATEGORIES)
+    show_parser.add_argument("stem", help="Entity file stem")
+    show_parser.add_argument("--index", default="dist/similarity", help="Index dir")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = SimilarityIndex.build(Path(args.objects), k=args.k)
+        index.save(Path(args.out))
+        total = sum(len(stems) for stems in index.stems.values())
+        print(f"Wrote neighbours of {total} entities to {args.out}")
+    else:
+        index = SimilarityIndex.load(Path(args.index))
+        neighbours = index.similar(args.category, args.stem)
+        if not neighbours:
+            print(f"No neighbours for {args.category}/{args.stem}", file=sys.stderr)
+            sys.exit(1)
+        for stem, score in neighbours:
+            print(f"{score:.3f}  {stem}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Thread-safe read path over the objects/ data.
+
+DataStore loads each category on first use and then never changes it.
+Entities are deeply frozen: objects become read-only mappings and arrays
+become tuples. Once a category is published, any number of threads can
+read it without locks. The design does not depend on the GIL, so it also
+holds on the free-threaded (3.13t and later) builds of CPython.
+
+Loading is guarded per category with double-checked locking. The fast path
+is a single dict lookup. On a miss, the category's own lock is taken and
+the lookup is repeated, so concurrent first requests load a category
+exactly once. Threads loading different categories do not wait for each
+other.
+
+    store = DataStore(Path("objects"))
+    store.get("enemies", "alzabo")["stats"]["skill"]
+    store.find("spells", "affix")
+"""
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from .data import CATEGORIES, iter_entity_files, load_entity, name_index
+
+
+def freeze(value: Any) -> Any:
+    """Return a deeply immutable copy of a JSON value."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a plain, mutable (and JSON-serializable) copy of a frozen value."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class Category:
+    """The frozen entities of one category and their name index."""
+
+    name: str
+    entities: Mapping[str, Mapping[str, Any]]
+    names: Mapping[str, str]
+
+    @classmethod
+    def load(cls, objects_dir: Path, name: str) -> "Category":
+        """Load and freeze every entity of a category."""
+        entities = {
+            path.stem: freeze(load_entity(path))
+            for _, path in iter_entity_files(objects_dir, name)
+        }
+        return cls(
+            name, MappingProxyType(entities), MappingProxyType(name_index(entities))
+        )
+
+
+class DataStore:
+    """Lazily loaded, immutable, lock-free-on-read view of objects/."""
+
+    def __init__(self, objects_dir: Path = Path("objects")):
+        """Prepare the store; nothing is loaded until first use."""
+        self.objects_dir = Path(objects_dir)
+        self._categories: Dict[str, Category] = {}
+        self._locks = {name: threading.Lock() for name in CATEGORIES}
+        # Number of category loads, for tests and diagnostics
+        self.loads = 0
+        self._loads_lock = threading.Lock()
+
+    def category(self, name: str) -> Category:
+        """
+        Return a category, loading it on first use.
+
+        Raises:
+            KeyError: If the category name is unknown
+        """
+        category = self._categories.get(name)
+        if category is None:
+            with self._locks[name]:
+                category = self._categories.get(name)
+                if category is None:
+                    category = Category.load(self.objects_dir, name)
+                    # Categories load in parallel, so the shared count needs a lock
+                    with self._loads_lock:
+                        self.loads += 1
+                    # Publish only the fully built, frozen category
+                    self._categories[name] = category
+        return category
+
+    def get(self, category: str, stem: str) -> Optional[Mapping[str, Any]]:
+        """Return an entity by file stem."""
+        return self.category(category).entities.get(stem)
+
+    def find(self, category: str, name: str) -> Optional[Mapping[str, Any]]:
+        """Return an entity by name (case-insensitive)."""
+        loaded = self.category(category)
+        stem = loaded.names.get(name.casefold())
+        return None if stem is None else loaded.entities[stem]
+
+    def preload(self) -> "DataStore":
+        """Load every category now, e.g. before starting worker threads."""
+        for name in CATEGORIES:
+            self.category(name)
+        return self
@@ -0,0 +1,530 @@
+"""
+Schema-driven synthetic data for load tests.
+
+SchemaGenerator walks a schema from systems/ and builds a document that
+follows it: types, enums and consts, required and optional properties,
+minimum/maximum, minItems/maxItems, string patterns, oneOf/anyOf/allOf
+branches, `not` and `$ref` definitions (recursion stops at MAX_DEPTH).
+Values are drawn from a Vocabulary collected from the real objects/ data,
+keyed by property name, so names, tags, costs and stats look like the
+real thing; free text is stitched together from description words. Every
+document is checked against its schema and regenerated in the rare case it
+does not validate.
+
+Documents are generated in worker processes with jsonstream.bounded_map,
+and each one is seeded from (seed, kind, index), so the output is the same
+whatever the number of workers:
+
+    python -m troika.synth spell enemy --count 100000 --workers 4 > load.ndjson
+    python -m troika.synth character --count 1000 --files synthetic/
+
+--files writes one file per document under <dir>/<category>/, a layout
+that main.py can validate directly.
+"""
+
+import argparse
+import json
+import random
+import re
+import string
+import sys
+from collections import defaultdict
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from jsonschema import Draft7Validator
+
+from .data import CATEGORIES, load_category
+from .jsonstream import bounded_map
+from .schemas import resolve_pointer
+
+# Schema kind -> objects/ category, in the layout main.py validates
+KINDS = {
+    "background": "backgrounds",
+    "character": "characters",
+    "enemy": "enemies",
+    "item": "items",
+    "skill": "skills",
+    "spell": "spells",
+    "table": "tables",
+}
+
+MAX_DEPTH = 6
+OPTIONAL_RATE = 0.3
+MAX_ATTEMPTS = 50
+
+# Properties whose values are names from another category
+_NAME_KEYS = {
+    "background": "backgrounds",
+    "skill": "skills",
+    "spell": "spells",
+    "item": "items",
+}
+
+# Strings longer than this are free text rather than vocabulary
+_SHORT_STRING = 60
+
+_PATTERN_TOKEN = re.compile(r"\\(.)|\[(\^?)((?:\\.|[^\]])+)\]|(.)")
+_PATTERN_QUANTIFIER = re.compile(r"\{(\d+)(?:,(\d*))?\}|[?*+]")
+_ESCAPE_CLASSES = {
+    "d": string.digits,
+    "w": string.ascii_letters + string.digits + "_",
+    "s": " ",
+}
+
+
+def _pattern_string(pattern: str, rng: random.Random) -> str:
+    """
+    Build a string matching a simple regular expression.
+
+    Handles literals, escapes (\\d, \\w, \\s), character classes and the
+    quantifiers ?, *, +, {n} and {n,m}; anchors are dropped.
+
+    Raises:
+        ValueError: If the pattern uses groups, alternation or negated classes
+    """
+    body = pattern.lstrip("^").rstrip("$")
+    if any(c in body.replace("\\(", "").replace("\\|", "") for c in "(|"):
+        raise ValueError(f"Unsupported pattern: {pattern}")
+    out = []
+    pos = 0
+    while pos < len(body):
+        token = _PATTERN_TOKEN.match(body, pos)
+        escape, negated, chars, literal = token.groups()
+        pos = token.end()
+        if negated:
+            raise ValueError(f"Unsupported pattern: {pattern}")
+        if chars is not None:
+            choices = _class_chars(chars)
+        elif escape is not None:
+            choices = _ESCAPE_CLASSES.get(escape, escape)
+        elif literal == ".":
+            choices = string.ascii_lowercase
+        else:
+            choices = literal
+        low = high = 1
+        quantifier = _PATTERN_QUANTIFIER.match(body, pos)
+        if quantifier:
+            pos = quantifier.end()
+            text = quantifier.group(0)
+            if text == "?":
+                low, high = 0, 1
+            elif text == "*":
+                low, high = 0, 3
+            elif text == "+":
+                low, high = 1, 3
+            else:
+                low = int(quantifier.group(1))
+                upper = quantifier.group(2)
+                high = low if upper is None else int(upper or low + 3)
+        out.extend(rng.choice(choices) for _ in range(rng.randint(low, high)))
+    return "".join(out)
+
+
+def _class_chars(chars: str) -> str:
+    """Expand the inside of a character class such as "a-z0-9_"."""
+    out = []
+    i = 0
+    while i < len(chars):
+        if chars[i] == "\\" and i + 1 < len(chars):
+            out.append(_ESCAPE_CLASSES.get(chars[i + 1], chars[i + 1]))
+            i += 2
+        elif i + 2 < len(chars) and chars[i + 1] == "-":
+            out.append(
+                "".join(chr(c) for c in range(ord(chars[i]), ord(chars[i + 2]) + 1))
+            )
+            i += 3
+        else:
+            out.append(chars[i])
+            i += 1
+    return "".join(out)
+
+
+class Vocabulary:
+    """
+    Real values from objects/, keyed by the property that holds them.
+
+    Each value is recorded under its property name ("cost") and under the
+    category and property name ("spells.cost"); lookups prefer the latter.
+    """
+
+    def __init__(self):
+        """Create an empty vocabulary."""
+        self.strings: Dict[str, List[str]] = defaultdict(list)
+        self.numbers: Dict[str, List[int]] = defaultdict(list)
+        self.words: List[str] = []
+
+    @classmethod
+    def from_objects(cls, objects_dir: Path = Path("objects")) -> "Vocabulary":
+        """Collect the values of every entity in every category."""
+        vocabulary = cls()
+        for category in CATEGORIES:
+            for _, entity in sorted(load_category(objects_dir, category).items()):
+                vocabulary.add(entity, category=category)
+                if isinstance(entity.get("name"), str):
+                    vocabulary.strings[category].append(entity["name"])
+        for key, category in _NAME_KEYS.items():
+            vocabulary.strings[key].extend(vocabulary.strings[category])
+        for values in (*vocabulary.strings.values(), *vocabulary.numbers.values()):
+            values[:] = sorted(set(values), key=str)
+        return vocabulary
+
+    def add(
+        self, value: Any, key: Optional[str] = None, category: Optional[str] = None
+    ) -> None:
+        """Record the strings, numbers and words inside a value."""
+        if isinstance(value, dict):
+            for child_key, child in value.items():
+                self.add(child, child_key, category)
+        elif isinstance(value, list):
+            for child in value:
+                self.add(child, key, category)
+        elif isinstance(value, bool) or key is None:
+            return
+        elif isinstance(value, (int, str)):
+            if isinstance(value, str) and len(value) > _SHORT_STRING:
+                self.words.extend(value.split())
+                return
+            pool = self.numbers if isinstance(value, int) else self.strings
+            pool[key].append(value)
+            if category is not None:
+                pool[f"{category}.{key}"].append(value)
+
+    def lookup(
+        self, pool: Dict[str, List[Any]], category: Optional[str], key: Optional[str]
+    ) -> Sequence[Any]:
+        """Return the values of a key, preferring those seen in the category."""
+        return pool.get(f"{category}.{key}") or pool.get(key) or ()
+
+    def text(self, rng: random.Random, low: int = 6, high: int = 30) -> str:
+        """Return free text made of real description words."""
+        if not self.words:
+            return " ".join(rng.choice(("lorem", "ipsum", "dolor")) for _ in range(low))
+        count = rng.randint(low, high)
+        start = rng.randrange(max(1, len(self.words) - count))
+        return " ".join(self.words[start : start + count])
+
+
+def _merge(base: Dict[str, Any], extra: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine two object schemas, as when an entity satisfies both."""
+    merged = {**base, **extra}
+    if "properties" in base and "properties" in extra:
+        merged["properties"] = dict(base["properties"])
+        for key, node in extra["properties"].items():
+            merged["properties"][key] = _merge(base["properties"].get(key, {}), node)
+    if "required" in base or "required" in extra:
+        merged["required"] = list(
+            dict.fromkeys(base.get("required", []) + extra.get("required", []))
+        )
+    return merged
+
+
+class SchemaGenerator:
+    """Builds documents that validate against one schema."""
+
+    def __init__(
+        self,
+        schema: Dict[str, Any],
+        vocabulary: Optional[Vocabulary] = None,
+        optional_rate: float = OPTIONAL_RATE,
+        max_depth: int = MAX_DEPTH,
+        category: Optional[str] = None,
+    ):
+        """
+        Prepare a generator.
+
+        Args:
+            schema: Root schema (its definitions resolve "$ref"s)
+            vocabulary: Real values to draw from (default: none)
+            optional_rate: Chance that each optional property is present
+            max_depth: Nesting below which only required properties are filled
+            category: objects/ category whose values are preferred
+        """
+        self.schema = schema
+        self.category = category
+        self.vocabulary = vocabulary or Vocabulary()
+        self.optional_rate = optional_rate
+        self.max_depth = max_depth
+        self.validator = Draft7Validator(schema)
+        self.retries = 0
+
+    def generate(self, rng: random.Random) -> Any:
+        """
+        Return a document that validates against the schema.
+
+        Raises:
+            RuntimeError: If no valid document was found in MAX_ATTEMPTS tries
+        """
+        for _ in range(MAX_ATTEMPTS):
+            document = self.value(self.schema, rng)
+            if self.validator.is_valid(document):
+                return document
+            self.retries += 1
+        raise RuntimeError(f"No valid document for {self.schema.get('$id')}")
+
+    def value(
+        self, node: Any, rng: random.Random, key: Optional[str] = None, depth: int = 0
+    ) -> Any:
+        """Return a value for one schema node."""
+        if not isinstance(node, dict):
+            return None
+        if "$ref" in node:
+            target = resolve_pointer(self.schema, node["$ref"])
+            rest = {k: v for k, v in node.items() if k != "$ref"}
+            return self.value(_merge(target, rest), rng, key, depth + 1)
+        if "allOf" in node:
+            rest = {k: v for k, v in node.items() if k != "allOf"}
+            for branch in node["allOf"]:
+                rest = _merge(rest, branch)
+            return self.value(rest, rng, key, depth)
+        for keyword in ("oneOf", "anyOf"):
+            if keyword in node:
+                rest = {k: v for k, v in node.items() if k != keyword}
+                branch = rng.choice(node[keyword])
+                return self.value(_merge(rest, branch), rng, key, depth)
+        if "not" in node:
+            rest = {k: v for k, v in node.items() if k != "not"}
+            excluded = Draft7Validator(node["not"])
+            for _ in range(MAX_ATTEMPTS):
+                candidate = self.value(rest, rng, key, depth)
+                if not excluded.is_valid(candidate):
+                    return candidate
+            return candidate
+        if "const" in node:
+            return node["const"]
+        if "enum" in node:
+            return rng.choice(node["enum"])
+
+        kind = node.get("type")
+        if isinstance(kind, list):
+            kind = rng.choice(kind)
+        if kind is None:
+            kind = "object" if "properties" in node else "string"
+        if kind == "object":
+            return self._object(node, rng, depth)
+        if kind == "array":
+            return self._array(node, rng, key, depth)
+        if kind in ("integer", "number"):
+            return self._number(node, rng, key, kind)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        if kind == "null":
+            return None
+        return self._string(node, rng, key)
+
+    def _object(self, node: Dict[str, Any], rng: random.Random, depth: int) -> Dict:
+        """
+        Fill the required properties and some of the optional ones.
+
+        An optional property whose "$ref" does not resolve is left out, as no
+        value could validate against it.
+        """
+        required = set(node.get("required", []))
+        result = {}
+        for key, child in node.get("properties", {}).items():
+            if key in required:
+                result[key] = self.value(child, rng, key, depth + 1)
+            elif depth < self.max_depth and rng.random() < self.optional_rate:
+                try:
+                    result[key] = self.value(child, rng, key, depth + 1)
+                except LookupError:
+                    continue
+        return result
+
+    def _array(
+        self, node: Dict[str, Any], rng: random.Random, key: Optional[str], depth: int
+    ) -> List:
+        """Return between minItems and maxItems elements."""
+        low = node.get("minItems", 0)
+        high = min(node.get("maxItems", low + 3), low + 3)
+        if depth >= self.max_depth:
+            high = low
+        items = node.get("items", {})
+        result: List[Any] = []
+        for position in range(rng.randint(low, high)):
+            child = items[position] if isinstance(items, list) else items
+            try:
+                element = self.value(child, rng, key, depth + 1)
+            except LookupError:
+                # Unresolvable item schema: only a short enough array is valid
+                if len(result) < low:
+                    raise
+                break
+            if node.get("uniqueItems") and element in result:
+                continue
+            result.append(element)
+        return result
+
+    def _number(
+        self, node: Dict[str, Any], rng: random.Random, key: Optional[str], kind: str
+    ) -> Any:
+        """Return a real value for the key when one fits, else a random one."""
+        low = node.get("minimum", node.get("exclusiveMinimum", -1) + 1)
+        high = node.get("maximum", node.get("exclusiveMaximum", low + 21) - 1)
+        if low > high:
+            low, high = high, low
+        numbers = self.vocabulary.lookup(self.vocabulary.numbers, self.category, key)
+        real = [n for n in numbers if low <= n <= high]
+        if real and rng.random() < 0.8:
+            return rng.choice(real)
+        if kind == "number":
+            return round(rng.uniform(low, high), 2)
+        return rng.randint(int(low), int(high))
+
+    def _string(
+        self, node: Dict[str, Any], rng: random.Random, key: Optional[str]
+    ) -> str:
+        """Return a real value for the key, or text that fits the node."""
+        pattern = node.get("pattern")
+        low = node.get("minLength", 0)
+        high = node.get("maxLength", sys.maxsize)
+        real = [
+            s
+            for s in self.vocabulary.lookup(self.vocabulary.strings, self.category, key)
+            if low <= len(s) <= high and (pattern is None or re.search(pattern, s))
+        ]
+        if real:
+            return rng.choice(real)
+        if pattern is not None:
+            try:
+                return _pattern_string(pattern, rng)
+            except ValueError:
+                pass
+        if node.get("format") == "date":
+            return (date(2000, 1, 1) + timedelta(days=rng.randrange(10000))).isoformat()
+        if node.get("format") == "date-time":
+            moment = datetime(2000, 1, 1, tzinfo=timezone.utc)
+            moment += timedelta(seconds=rng.randrange(10**9))
+            return moment.isoformat().replace("+00:00", "Z")
+        text = self.vocabulary.text(rng, 1, 4) if key == "name" else None
+        text = text or self.vocabulary.text(rng)
+        if len(text) < low:
+            text = text.ljust(low, "a")
+        return text[:high]
+
+
+def load_schema(kind: str, schema_dir: Path = Path("systems")) -> Dict[str, Any]:
+    """Load the schema of a kind such as "spell" (systems/spell.schema.json)."""
+    with open(schema_dir / f"{kind}.schema.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Per-process generators, built once by _init_worker
+_generators: Dict[str, SchemaGenerator] = {}
+
+
+def _init_worker(
+    kinds: Sequence[str], schema_dir: Path, objects_dir: Path, optional_rate: float
+) -> None:
+    """Load the schemas and vocabulary once per worker process."""
+    vocabulary = Vocabulary.from_objects(objects_dir)
+    _generators.clear()
+    for kind in kinds:
+        _generators[kind] = SchemaGenerator(
+            load_schema(kind, schema_dir),
+            vocabulary,
+            optional_rate,
+            category=KINDS[kind],
+        )
+
+
+def _generate_one(task: Tuple[str, int, int]) -> Tuple[str, int, str]:
+    """Generate and serialize one document (runs in a worker)."""
+    kind, index, seed = task
+    document = _generators[kind].generate(random.Random(f"{seed}:{kind}:{index}"))
+    return kind, index, json.dumps(document, ensure_ascii=False)
+
+
+def generate(
+    kinds: Iterable[str],
+    count: int,
+    seed: int = 0,
+    workers: int = 1,
+    schema_dir: Path = Path("systems"),
+    objects_dir: Path = Path("objects"),
+    optional_rate: float = OPTIONAL_RATE,
+    batch_size: int = 256,
+) -> Iterator[Tuple[str, int, str]]:
+    """
+    Stream (kind, index, JSON text) for `count` documents of each kind.
+
+    Args:
+        kinds: Schema kinds, keys of KINDS
+        count: Documents per kind
+        seed: Base seed; a document depends only on (seed, kind, index)
+        workers: Worker processes (1 generates in this process)
+        schema_dir: Directory of *.schema.json files
+        objects_dir: Real data to draw vocabulary from
+        optional_rate: Chance that each optional property is present
+        batch_size: Documents sent to a worker at a time
+
+    Raises:
+        ValueError: If a kind is unknown
+    """
+    kinds = list(kinds)
+    unknown = [kind for kind in kinds if kind not in KINDS]
+    if unknown:
+        raise ValueError(f"Unknown kinds: {', '.join(unknown)}")
+    tasks = ((kind, index, seed) for kind in kinds for index in range(count))
+    return bounded_map(
+        _generate_one,
+        tasks,
+        workers=workers,
+        batch_size=batch_size,
+        initializer=_init_worker,
+        initargs=(kinds, schema_dir, objects_dir, optional_rate),
+    )
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Generate synthetic Troika! data")
+    parser.add_argument("kinds", nargs="+", choices=sorted(KINDS), help="Kinds")
+    parser.add_argument("--count", type=int, default=100, help="Documents per kind")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument(
+        "--optional-rate",
+        type=float,
+        default=OPTIONAL_RATE,
+        help=f"Chance of each optional property (default: {OPTIONAL_RATE})",
+    )
+    parser.add_argument("--schemas", default="systems", help="Schema directory")
+    parser.add_argument("--objects", default="objects", help="Vocabulary source")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--output", help="NDJSON file (default: stdout)")
+    output.add_argument("--files", help="Write one file per document under DIR")
+    args = parser.parse_args()
+
+    documents = generate(
+        args.kinds,
+        args.count,
+        args.seed,
+        args.workers,
+        Path(args.schemas),
+        Path(args.objects),
+        args.optional_rate,
+    )
+    if args.files:
+        root = Path(args.files)
+        for kind in args.kinds:
+            (root / KINDS[kind]).mkdir(parents=True, exist_ok=True)
+        for kind, index, text in documents:
+            path = root / KINDS[kind] / f"synthetic-{kind}-{index:07d}.json"
+            path.write_text(text + "\n", encoding="utf-8")
+        print(f"Wrote {args.count * len(args.kinds)} files to {root}", file=sys.stderr)
+        return
+
+    with (
+        open(args.output, "w", encoding="utf-8")
+        if args.output
+        else nullcontext(sys.stdout)
+    ) as stream:
+        for _, _, text in documents:
+            stream.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+File change watching for long-running processes.
+
+create_watcher() returns an inotify watcher on Linux (through ctypes, no extra
+dependency) and falls back to polling modification times elsewhere. Both
+watch directory trees recursively and share one method:
+
+    watcher.wait(timeout) -> set of changed paths
+
+A changed path is a file that was written, created, moved or deleted, or a
+directory that was moved away or deleted, meaning "everything under it is
+gone". When events were lost (inotify queue overflow) the watched root
+directories are returned instead, meaning "rescan everything under these".
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import stat
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# inotify event masks (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+# Time to keep collecting events after the first one, so a save that
+# touches several files (or writes then renames) is reported once.
+SETTLE_SECONDS = 0.02
+
+
+class PollingWatcher:
+    """Detect changes by comparing file modification times and sizes."""
+
+    def __init__(self, roots: Iterable[Path], interval: float = 0.5):
+        """Watch directory trees, checking every `interval` seconds."""
+        self.roots = [Path(root) for root in roots]
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        """Record (mtime_ns, size) for every file under the roots."""
+        snapshot = {}
+        for root in self.roots:
+            for path in root.rglob("*"):
+                try:
+                    info = path.stat()
+                except OSError:
+                    continue
+                if stat.S_ISREG(info.st_mode):
+                    snapshot[path] = (info.st_mtime_ns, info.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until something changes or the timeout passes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class InotifyWatcher:
+    """Linux inotify watcher over directory trees, via ctypes."""
+
+    def __init__(self, roots: Iterable[Path]):
+        """
+        Watch directory trees recursively.
+
+        Raises:
+            OSError: If inotify is unavailable
+        """
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.roots = [Path(root) for root in roots]
+        self._dirs: Dict[int, Path] = {}
+        for root in self.roots:
+            self._add_tree(root)
+
+    def _add_watch(self, directory: Path) -> None:
+        """Watch one directory."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self._dirs[wd] = directory
+
+    def _add_tree(self, root: Path) -> List[Path]:
+        """Watch a directory and its subdirectories; return the files found."""
+        files = []
+        for directory, subdirs, names in os.walk(root):
+            self._add_watch(Path(directory))
+            files.extend(Path(directory) / name for name in names)
+        return files
+
+    def _remove_tree(self, root: Path) -> None:
+        """Stop watching a directory that moved away and its subdirectories."""
+        for wd, directory in list(self._dirs.items()):
+            if directory == root or root in directory.parents:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._dirs[wd]
+
+    def _read_events(self) -> Tuple[Set[Path], bool]:
+        """Drain pending events; return (changed paths, overflowed)."""
+        changed: Set[Path] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                if mask & IN_DELETE_SELF:
+                    continue
+                path = directory / os.fsdecode(name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and path.is_dir():
+                        # Files may land in a new directory before it is watched.
+                        changed.update(self._add_tree(path))
+                    elif mask & (IN_DELETE | IN_MOVED_FROM):
+                        # Report the directory so its files are dropped too
+                        self._remove_tree(path)
+                        changed.add(path)
+                    continue
+                if mask & IN_CREATE:
+                    # Wait for IN_CLOSE_WRITE so half-written files are skipped.
+                    continue
+                changed.add(path)
+        return changed, overflow
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until something changes or the timeout passes."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed, overflow = self._read_events()
+        time.sleep(SETTLE_SECONDS)
+        more, more_overflow = self._read_events()
+        changed |= more
+        if overflow or more_overflow:
+            return set(self.roots)
+        return changed
+
+    def close(self) -> None:
+        """Release the inotify file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(roots: Iterable[Path], poll: bool = False, interval: float = 0.5):
+    """Return an inotify watcher on Linux, or a polling watcher otherwise."""
+    roots = list(roots)
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots, interval)